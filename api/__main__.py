@@ -0,0 +1,37 @@
+"""
+Runs the headless resume API, by default in one worker process. With --workers N the OpenAI rate limits are split
+evenly, each worker pacing itself to 1/N of the configured quota.
+
+    python -m api --workers 4 --port 8000
+    python -m api --fake-llm --fake-latency 0.5
+"""
+import argparse
+import os
+import sys
+from typing import List
+import uvicorn
+from dotenv import load_dotenv, find_dotenv
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve the resume parse, generate and render endpoints.")
+    parser.add_argument("--host", default=os.getenv("RESUME_API_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("RESUME_API_PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("RESUME_API_WORKERS", 1)), help="Worker processes")
+    parser.add_argument("--fake-llm", action="store_true", help="Use the offline fake chat model instead of OpenAI")
+    parser.add_argument("--fake-latency", type=float, default=0.0, help="Simulated seconds per fake LLM call")
+    args = parser.parse_args(argv)
+
+    load_dotenv(find_dotenv())
+    # Workers are separate processes that import the app themselves, so options are passed through the environment
+    os.environ["RESUME_API_WORKERS"] = str(max(1, args.workers))
+    if args.fake_llm:
+        os.environ["RESUME_FAKE_LLM"] = "1"
+        os.environ["RESUME_FAKE_LATENCY"] = str(args.fake_latency)
+
+    uvicorn.run("api.server:app", host=args.host, port=args.port, workers=max(1, args.workers))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import os
+import re
+import unicodedata
+from contextlib import asynccontextmanager
+from typing import List, Literal
+from urllib.parse import quote
+from fastapi import FastAPI, File, HTTPException, Query, UploadFile
+from fastapi.responses import PlainTextResponse, Response
+from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
+from schemas import JobTarget, ResumeInput, ResumeSchema, TargetedResumes
+from utils.ai import ainvoke_resume_chain
+from utils.llm_registry import chain_registry
+from utils.metrics import metrics
+from utils.multi_target import MAX_TARGETS, agenerate_targeted_resumes
+from utils.pdf_extract import MAX_UPLOAD_BYTES, PDFLimitError
+from utils.pdf_templates import DEFAULT_TEMPLATE, list_templates, save_resume_to_pdf
+from utils.resume_reader import parse_resume_pdf
+from utils.section_chains import agenerate_resume_by_section
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs once in every worker process
+    if os.getenv("RESUME_FAKE_LLM") == "1":
+        from utils.fake_llm import fake_llm_factory
+        chain_registry.set_llm_factory(fake_llm_factory(latency=float(os.getenv("RESUME_FAKE_LATENCY", 0))))
+    chain_registry.warm_up()
+    yield
+    chain_registry.clear()
+
+
+app = FastAPI(title="Resume Builder API", lifespan=lifespan)
+
+
+@app.get("/healthz")
+async def healthz():
+    return {"status": "ok", "pid": os.getpid()}
+
+
+@app.get("/templates")
+async def templates():
+    return {"templates": list_templates(), "default": DEFAULT_TEMPLATE}
+
+
+@app.post("/parse", response_model=ResumeInput, response_model_exclude_none=True)
+async def parse(file: UploadFile = File(...)):
+    """
+    Extracts a ResumeInput from an uploaded PDF resume.
+    """
+    file_bytes = await file.read(MAX_UPLOAD_BYTES + 1)
+    try:
+        # PDF parsing and the reader chain block, so they run off the event loop
+        return await run_in_threadpool(parse_resume_pdf, file_bytes)
+    except PDFLimitError as e:
+        raise HTTPException(status_code=413 if len(file_bytes) > MAX_UPLOAD_BYTES else 422, detail=str(e))
+
+
+@app.post("/generate", response_model=ResumeSchema)
+async def generate(resume_input: ResumeInput, mode: Literal["single", "sections"] = "single"):
+    """
+    Generates a ResumeSchema, either with one LLM call or with concurrent per-section calls.
+    """
+    if mode == "sections":
+        return await agenerate_resume_by_section(resume_input)
+    return await ainvoke_resume_chain(resume_input)
+
+
+class MultiTargetRequest(BaseModel):
+    resume_input: ResumeInput
+    targets: List[JobTarget] = Field(min_length=1, max_length=MAX_TARGETS)
+    warm_prefix: bool = True
+
+
+@app.post("/generate/targets", response_model=TargetedResumes)
+async def generate_targets(request: MultiTargetRequest):
+    """
+    Generates one tailored ResumeSchema per target job concurrently, reporting each target's latency and cached tokens.
+    """
+    return await agenerate_targeted_resumes(request.resume_input, request.targets, request.warm_prefix)
+
+
+def content_disposition(file_name: str) -> str:
+    """
+    Attachment header that survives any file name: headers are encoded as Latin-1, so non-ASCII names go in the RFC 5987
+    filename* parameter, with an ASCII approximation in filename for clients that ignore it.
+    """
+    ascii_name = unicodedata.normalize("NFKD", file_name).encode("ascii", "ignore").decode("ascii")
+    ascii_name = re.sub(r'[^\w.\- ]', "_", ascii_name).strip()
+    if not re.search(r"[A-Za-z0-9]", ascii_name.rpartition(".")[0]):
+        ascii_name = "resume.pdf"
+    return f"attachment; filename=\"{ascii_name}\"; filename*=UTF-8''{quote(file_name, safe='')}"
+
+
+@app.post("/render")
+async def render(resume_data: ResumeSchema, template: str = Query(DEFAULT_TEMPLATE)):
+    """
+    Renders a ResumeSchema to PDF with the given template.
+    """
+    if template not in list_templates():
+        raise HTTPException(status_code=404, detail=f"Unknown template '{template}'.")
+    pdf_bytes, file_name = await run_in_threadpool(save_resume_to_pdf, resume_data, template)
+    return Response(
+        content=pdf_bytes.getvalue(),
+        media_type="application/pdf",
+        headers={"Content-Disposition": content_disposition(file_name)}
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    # Per worker process; scrape each worker or aggregate downstream
+    return metrics.render_prometheus()
@@ -0,0 +1,173 @@
+"""
+Headless batch resume generation.
+
+Reads ResumeInput records from a JSONL or CSV file, generates a ResumeSchema for each with bounded async concurrency and
+writes <record_id>.json and <record_id>.pdf to the output directory. Completed records are tracked in manifest.jsonl so
+an interrupted run picks up where it left off.
+
+    python batch_generate.py cohort.jsonl out/ --concurrency 8
+    python batch_generate.py cohort.csv out/ --fake-llm --fake-latency 0.5
+"""
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Dict, Iterator, List, Set, Tuple
+from dotenv import load_dotenv, find_dotenv
+from schemas import ResumeInput
+
+
+MANIFEST_NAME = "manifest.jsonl"
+SUMMARY_NAME = "summary.json"
+
+
+def read_records(path: str) -> Iterator[Tuple[str, dict]]:
+    """
+    Yields (record_id, fields) from a JSONL or CSV file. The record id is taken from an "id" field when present,
+    otherwise it is derived from the record's contents so reruns map to the same outputs.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".csv"):
+            rows = (row for row in csv.DictReader(f))
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+
+        for row in rows:
+            fields = {key: value for key, value in row.items() if value not in (None, "")}
+            record_id = str(fields.pop("id", "")) or hashlib.sha256(
+                json.dumps(fields, sort_keys=True).encode("utf-8")
+            ).hexdigest()[:16]
+            yield record_id, fields
+
+
+def load_completed(out_dir: str) -> Set[str]:
+    completed = set()
+    manifest = os.path.join(out_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest):
+        return completed
+    with open(manifest, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry.get("status") == "ok":
+                completed.add(entry["id"])
+    return completed
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+async def generate_record(record_id: str, fields: dict, out_dir: str, sectioned: bool = False) -> Dict[str, object]:
+    from utils.ai import ainvoke_resume_chain
+    from utils.section_chains import agenerate_resume_by_section
+    from utils.pdf_templates import save_resume_to_pdf
+
+    start = time.perf_counter()
+    try:
+        resume_input = ResumeInput(**fields)
+        if sectioned:
+            resume_data = await agenerate_resume_by_section(resume_input)
+        else:
+            resume_data = await ainvoke_resume_chain(resume_input)
+        generated = time.perf_counter()
+
+        pdf_bytes, _ = await asyncio.to_thread(save_resume_to_pdf, resume_data)
+        _write_atomic(os.path.join(out_dir, f"{record_id}.json"), resume_data.model_dump_json(indent=2).encode("utf-8"))
+        _write_atomic(os.path.join(out_dir, f"{record_id}.pdf"), pdf_bytes.getvalue())
+        end = time.perf_counter()
+        return {
+            "id": record_id,
+            "status": "ok",
+            "latency": round(end - start, 4),
+            "generate_latency": round(generated - start, 4),
+            "render_latency": round(end - generated, 4)
+        }
+    except Exception as e:
+        return {
+            "id": record_id,
+            "status": "error",
+            "latency": round(time.perf_counter() - start, 4),
+            "error": f"{type(e).__name__}: {e}"
+        }
+
+
+async def run_batch(input_path: str, out_dir: str, concurrency: int, sectioned: bool = False) -> Dict[str, object]:
+    os.makedirs(out_dir, exist_ok=True)
+    completed = load_completed(out_dir)
+    pending = [(record_id, fields) for record_id, fields in read_records(input_path) if record_id not in completed]
+    print(f"{len(completed)} record(s) already done, {len(pending)} to generate with concurrency {concurrency}.")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    manifest = open(os.path.join(out_dir, MANIFEST_NAME), "a", encoding="utf-8")
+    results: List[Dict[str, object]] = []
+
+    async def worker(record_id: str, fields: dict) -> None:
+        async with semaphore:
+            result = await generate_record(record_id, fields, out_dir, sectioned)
+        # Append as each record finishes so a crash loses at most the in-flight records
+        manifest.write(json.dumps(result) + "\n")
+        manifest.flush()
+        results.append(result)
+        print(f"[{len(results)}/{len(pending)}] {record_id}: {result['status']} in {result['latency']:.2f}s")
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker(record_id, fields) for record_id, fields in pending))
+    finally:
+        manifest.close()
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(r["latency"] for r in results if r["status"] == "ok")
+    summary = {
+        "input": input_path,
+        "concurrency": concurrency,
+        "skipped": len(completed),
+        "succeeded": len(latencies),
+        "failed": len(results) - len(latencies),
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_per_minute": round(len(latencies) / elapsed * 60, 2) if elapsed > 0 else 0.0,
+        "latency_mean": round(statistics.mean(latencies), 4) if latencies else None,
+        "latency_p50": latencies[len(latencies) // 2] if latencies else None,
+        "latency_p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None,
+        "latency_max": latencies[-1] if latencies else None
+    }
+    with open(os.path.join(out_dir, SUMMARY_NAME), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate resumes for a batch of ResumeInput records.")
+    parser.add_argument("input", help="JSONL or CSV file of ResumeInput records (optional 'id' column)")
+    parser.add_argument("out_dir", help="Directory for generated JSON, PDFs, manifest and summary")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum number of records in flight")
+    parser.add_argument("--sectioned", action="store_true", help="Generate each resume section with its own concurrent sub-chain")
+    parser.add_argument("--fake-llm", action="store_true", help="Use the offline fake chat model instead of OpenAI")
+    parser.add_argument("--fake-latency", type=float, default=0.0, help="Simulated seconds per fake LLM call")
+    args = parser.parse_args(argv)
+
+    load_dotenv(find_dotenv())
+    if args.fake_llm:
+        # Fake results stay out of the shared on-disk cache
+        os.environ["LLM_CACHE_PATH"] = ""
+        from utils.fake_llm import fake_llm_factory
+        from utils.llm_registry import chain_registry
+        chain_registry.set_llm_factory(fake_llm_factory(latency=args.fake_latency))
+
+    summary = asyncio.run(run_batch(args.input, args.out_dir, max(1, args.concurrency), args.sectioned))
+    print(json.dumps(summary, indent=2))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""
+Offline micro-benchmarks for the resume pipeline.
+
+Every case runs against synthetic resumes of increasing size (utils.synthetic_resume) and the deterministic fake chat
+model, so runs need no network or API key and are comparable across machines running the same code. Result caches are
+disabled and cleared between iterations so each iteration does the full work. Results are written as JSON; pass a
+previous results file as --baseline to see per-case changes and flag regressions.
+
+    python benchmark.py --output bench/main.json
+    python benchmark.py --scales small,large --repeat 50 --baseline bench/main.json --fail-on-regression
+"""
+import argparse
+import base64
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+
+DEFAULT_THRESHOLD = 0.10
+
+
+def _calibrate(fn: Callable[[], Any], min_sample_seconds: float) -> int:
+    # Like timeit, batch very fast calls so each sample is long enough for the timer to resolve
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    if elapsed >= min_sample_seconds:
+        return 1
+    return min(1000, max(1, int(min_sample_seconds / max(elapsed, 1e-7))))
+
+
+def measure(fn: Callable[[], Any], repeat: int, warmup: int = 1, min_sample_seconds: float = 0.005) -> Dict[str, float]:
+    """
+    Calls fn warmup times, then takes repeat timed samples and summarizes the per-call time in milliseconds. Calls
+    faster than min_sample_seconds are batched within each sample.
+    """
+    for _ in range(warmup):
+        fn()
+    number = _calibrate(fn, min_sample_seconds)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) * 1000 / number)
+    samples.sort()
+    return {
+        "runs": repeat,
+        "calls_per_run": number,
+        "min_ms": round(samples[0], 4),
+        "median_ms": round(statistics.median(samples), 4),
+        "mean_ms": round(statistics.mean(samples), 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "stdev_ms": round(statistics.stdev(samples), 4) if len(samples) > 1 else 0.0
+    }
+
+
+def _clear_caches() -> None:
+    from utils.html_templates import clear_html_cache
+    from utils.pdf_templates import clear_pdf_cache
+    from utils.result_cache import reader_cache, resume_cache
+    from utils.section_chains import section_cache
+    from utils.similarity_cache import resume_similarity_cache
+
+    reader_cache.clear()
+    resume_cache.clear()
+    section_cache.clear()
+    resume_similarity_cache.clear()
+    clear_pdf_cache()
+    clear_html_cache()
+
+
+def _preview_html(pdf_bytes: bytes) -> str:
+    # Mirrors view.preview_screen.display_pdf without the Streamlit call
+    base64_pdf = base64.b64encode(pdf_bytes).decode("utf-8")
+    return f'<iframe src="data:application/pdf;base64,{base64_pdf}#toolbar=0" width="100%" height="800"></iframe>'
+
+
+def build_cases(scale) -> Dict[str, Callable[[], Any]]:
+    """
+    Returns the benchmark cases for one resume scale, keyed by case name.
+    """
+    from langchain.output_parsers import PydanticOutputParser
+    from schemas import ResumeInput, ResumeSchema
+    from utils.ai import invoke_resume_chain
+    from utils.html_templates import render_resume_html
+    from utils.pdf_extract import extract_pdf_links, iter_pdf_pages, open_pdf
+    from utils.pdf_templates import DEFAULT_TEMPLATE, get_template, save_resume_to_pdf
+    from utils.resume_reader import analyze_resume_content
+    from utils.synthetic_resume import synthetic_resume, synthetic_resume_fields
+
+    resume = synthetic_resume(scale)
+    fields = synthetic_resume_fields(scale)
+    resume_json = resume.model_dump_json()
+    parser = PydanticOutputParser(pydantic_object = ResumeSchema)
+    template = get_template(DEFAULT_TEMPLATE)
+    pdf_bytes = template.render(resume)
+
+    def save_pdf():
+        _clear_caches()
+        return save_resume_to_pdf(resume)
+
+    def ingest_to_pdf():
+        _clear_caches()
+        reader = open_pdf(pdf_bytes)
+        resume_input = analyze_resume_content(iter_pdf_pages(reader), extract_pdf_links(reader))
+        resume_data = invoke_resume_chain(resume_input)
+        pdf, _ = save_resume_to_pdf(resume_data)
+        return _preview_html(pdf.getvalue())
+
+    def html_preview():
+        _clear_caches()
+        return render_resume_html(resume)
+
+    return {
+        "resume_input_validation": lambda: ResumeInput(**fields),
+        "output_parsing": lambda: parser.parse(resume_json),
+        "flatten": resume.flatten,
+        "save_resume_to_pdf": save_pdf,
+        "base64_preview": lambda: _preview_html(pdf_bytes),
+        "html_preview": html_preview,
+        "ingest_to_pdf": ingest_to_pdf
+    }
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run_benchmarks(scale_names: List[str], repeat: int, case_names: List[str] = None) -> Dict[str, Any]:
+    from utils.fake_llm import fake_llm_factory
+    from utils.llm_registry import chain_registry
+    from utils.synthetic_resume import SCALES
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for scale_name in scale_names:
+        scale = SCALES[scale_name]
+        # Fake responses carry as many list items as the synthetic resume has experiences
+        chain_registry.set_llm_factory(fake_llm_factory(list_size=scale.experiences))
+        for case, fn in build_cases(scale).items():
+            if case_names and case not in case_names:
+                continue
+            stats = measure(fn, repeat)
+            results.setdefault(case, {})[scale_name] = stats
+            print(f"{case:<26} {scale_name:<7} median {stats['median_ms']:>9.3f} ms  p95 {stats['p95_ms']:>9.3f} ms")
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "scales": scale_names
+        },
+        "results": results
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Compares median timings case by case. A change larger than threshold (a fraction of the baseline) is reported as a
+    regression or an improvement.
+    """
+    rows = []
+    for case, scales in current["results"].items():
+        for scale_name, stats in scales.items():
+            base = baseline.get("results", {}).get(case, {}).get(scale_name)
+            if not base or not base["median_ms"]:
+                continue
+            change = (stats["median_ms"] - base["median_ms"]) / base["median_ms"]
+            if change > threshold:
+                status = "regression"
+            elif change < -threshold:
+                status = "improvement"
+            else:
+                status = "unchanged"
+            rows.append({
+                "case": case,
+                "scale": scale_name,
+                "baseline_ms": base["median_ms"],
+                "current_ms": stats["median_ms"],
+                "change": round(change, 4),
+                "status": status
+            })
+    return rows
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the offline resume pipeline benchmarks.")
+    parser.add_argument("--scales", default="small,medium,large", help="Comma-separated synthetic resume sizes")
+    parser.add_argument("--cases", default="", help="Comma-separated case names to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed iterations per case and scale")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the JSON results")
+    parser.add_argument("--baseline", help="Previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Relative median change treated as significant")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 if any case regressed")
+    args = parser.parse_args(argv)
+
+    # Benchmarks measure the work itself, so never read or write the on-disk result cache
+    os.environ["LLM_CACHE_PATH"] = ""
+    scale_names = [name.strip() for name in args.scales.split(",") if name.strip()]
+    case_names = [name.strip() for name in args.cases.split(",") if name.strip()]
+
+    report = run_benchmarks(scale_names, max(1, args.repeat), case_names)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["comparison"] = {
+            "baseline": args.baseline,
+            "baseline_revision": baseline.get("meta", {}).get("git_revision", ""),
+            "threshold": args.threshold,
+            "rows": compare(report, baseline, args.threshold)
+        }
+        for row in report["comparison"]["rows"]:
+            print(f"{row['case']:<26} {row['scale']:<7} {row['baseline_ms']:>9.3f} -> {row['current_ms']:>9.3f} ms  {row['change']:+.1%}  {row['status']}")
+
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote results to {args.output}.")
+
+    regressions = [row for row in report.get("comparison", {}).get("rows", []) if row["status"] == "regression"]
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
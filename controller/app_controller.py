@@ -1,22 +1,64 @@
 import os
+import threading
+import time
 import streamlit as st
-from view import *
-from utils.airtable import initialize_airtable_client
+from utils.metrics import metrics, start_metrics_server
+from utils.startup_profile import startup_profiler
 
 
 class AppController:
+    """
+    Built once per process (see main.get_app_controller) and shared by every session, so it only holds process-wide
+    resources. Screens are imported on first use so the ingest screen never loads the preview's dependencies.
+    """
     def __init__(self, app_env: str):
         self.current_screen = "ingest"
         self.app_env = app_env
         self.title = f"Resume Builder - {self.app_env.capitalize()}" if self.app_env == "dev" else "Resume Builder"
-        st.title(self.title)
         
         # On Start, Depdency inject to relevant services
         self.api_key = os.getenv('AIRTABLE_API_KEY')
-        self.airtable_client = initialize_airtable_client(self.api_key)
+        self._airtable_client = None
+        self._airtable_lock = threading.Lock()
+
+        # Expose /metrics for scraping when a port is configured
+        if os.getenv("METRICS_PORT"):
+            start_metrics_server(int(os.getenv("METRICS_PORT")))
+
+    @property
+    def airtable_client(self):
+        # Created on the first preview rather than at startup; pyairtable is only imported then
+        with self._airtable_lock:
+            if self._airtable_client is None:
+                from utils.airtable import initialize_airtable_client
+                self._airtable_client = initialize_airtable_client(self.api_key)
+            return self._airtable_client
+
+    def render_title(self):
+        st.title(self.title)
+
+    def _render(self, screen: str, render, *args):
+        start = time.perf_counter()
+        render(*args)
+        elapsed = time.perf_counter() - start
+        metrics.observe(f"render:{screen}", elapsed)
+        if startup_profiler.record_render(screen, elapsed) and startup_profiler.enabled:
+            startup_profiler.print_report()
     
     def handle_ingest_screen(self):
-        ingest_screen(self.app_env)
+        from view.ingest_screen import ingest_screen
+        self._render("ingest", ingest_screen, self.app_env)
+        self.handle_metrics_panel()
     
     def handle_preview_screen(self):
-        preview_screen(self.app_env, self.airtable_client)
\ No newline at end of file
+        from view.preview_screen import preview_screen
+        self._render("preview", preview_screen, self.app_env, self.airtable_client)
+        self.handle_metrics_panel()
+
+    def handle_metrics_panel(self):
+        if self.app_env == "dev":
+            from view.metrics_panel import metrics_panel
+            metrics_panel()
+        if startup_profiler.enabled:
+            with st.sidebar.expander("Startup profile", expanded=False):
+                st.json(startup_profiler.report())
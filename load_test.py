@@ -0,0 +1,326 @@
+"""
+Concurrent-session load test for the Streamlit app.
+
+Drives the real main.py through Streamlit's AppTest, one simulated session per thread, all in this process as they
+would be in one app instance. Each session loads the ingest screen, fills the form with its own synthetic candidate,
+generates a resume, reruns the preview, switches template and opens the PDF view. The chat model is the offline fake
+with a configurable latency and Airtable writes go to a local stub (utils.airtable_stub), so runs need no network or
+keys. Concurrency ramps through --levels; each level reports p50/p95/p99 latency per stage, throughput, error rate and
+process memory growth.
+
+AppTest skips the browser websocket, so the numbers cover script execution and everything behind it, not delta
+serialization to clients.
+
+    python load_test.py --levels 1,2,4,8 --sessions 2 --llm-latency 1.0
+    python load_test.py --levels 4,16 --output load/main.json
+"""
+import argparse
+import gc
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+STAGES = ("load", "generate", "rerun", "switch_template", "pdf_view", "session")
+
+# Form labels (up to the first " (") mapped to ResumeInput fields
+FORM_FIELDS = {
+    "Name": "name",
+    "Email": "email",
+    "Phone Number": "phone_number",
+    "LinkedIn Profile": "linkedin_profile",
+    "GitHub Profile": "github_profile",
+    "Experience": "experience",
+    "Projects": "projects",
+    "Education": "education",
+    "Skills": "skills",
+    "Certifications": "certifications",
+    "Involvement": "involvement",
+    "Summary": "summary",
+    "Job Title": "target_job_title",
+    "Job Description": "target_job_description"
+}
+
+_session = threading.local()
+
+
+def _allow_concurrent_apptests() -> None:
+    """
+    AppTest is built for one test at a time; two adjustments let several run side by side like sessions of one server.
+    """
+    from streamlit.runtime import Runtime
+    from streamlit.testing.v1 import app_test
+    from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+    # Every script runner gets the same session id, and the app's session store is keyed by it; each simulated
+    # session needs its own or they would read each other's resumes
+    class SessionScopedRunner(LocalScriptRunner):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._session_id = getattr(_session, "id", self._session_id)
+
+    app_test.LocalScriptRunner = SessionScopedRunner
+
+    # Each run installs a stand-in Runtime and clears it when done, which would pull it out from under the runs still
+    # in flight; fall back to the last one installed, as all sessions of a real server share one Runtime
+    latest = []
+    instance = Runtime.instance.__func__
+
+    def shared_instance(cls):
+        if cls._instance is not None:
+            latest[:] = [cls._instance]
+            return cls._instance
+        return latest[0] if latest else instance(cls)
+
+    Runtime.instance = classmethod(shared_instance)
+
+
+def rss_bytes() -> int:
+    """
+    Current resident set size of this process; falls back to the peak RSS where /proc is unavailable.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 4)
+
+
+def _configure_environment(args: argparse.Namespace) -> Dict[str, Any]:
+    from utils.airtable_stub import start_airtable_stub
+    from utils.fake_llm import fake_llm_factory
+    from utils.llm_registry import chain_registry
+
+    airtable = start_airtable_stub(latency=args.airtable_latency, failure_rate=args.airtable_failure_rate)
+    os.environ.update({
+        "APP_ENV": "loadtest",
+        "AIRTABLE_API_KEY": "stub",
+        "AIRTABLE_ENDPOINT_URL": f"http://127.0.0.1:{airtable.server_address[1]}",
+        "AIRTABLE_BASE_ID": "appLoadTest",
+        "AIRTABLE_RESUME_TABLE_ID": "tblResumes",
+        "AIRTABLE_FEEDBACK_TABLE_ID": "tblFeedback",
+        "AIRTABLE_SPOOL_PATH": ""
+    })
+    chain_registry.set_llm_factory(fake_llm_factory(latency=args.llm_latency))
+    _allow_concurrent_apptests()
+    return {"airtable": airtable}
+
+
+class SessionResult:
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.timings: Dict[str, float] = {}
+        self.error: Optional[str] = None
+        self.failed_stage: Optional[str] = None
+
+
+def _step(result: SessionResult, stage: str, fn: Callable[[], Any]) -> Any:
+    start = time.perf_counter()
+    at = fn()
+    result.timings[stage] = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return at
+
+
+def _fill_form(at, fields: Dict[str, str]) -> None:
+    for widget in [*at.text_input, *at.text_area]:
+        field = FORM_FIELDS.get(widget.label.split(" (")[0])
+        if field and fields.get(field):
+            widget.input(fields[field])
+
+
+def run_session(session_id: str, fields: Dict[str, str], timeout: float) -> SessionResult:
+    """
+    Runs one simulated user through the ingest and preview screens, timing each step.
+    """
+    from streamlit.testing.v1 import AppTest
+    from utils.pdf_templates import list_templates
+
+    _session.id = session_id
+    result = SessionResult(session_id)
+    stage = "load"
+    start = time.perf_counter()
+    try:
+        at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        _step(result, stage, at.run)
+
+        stage = "generate"
+        _fill_form(at, fields)
+        _step(result, stage, lambda: at.get("form_submit_button")[0].click().run())
+        if not at.toggle:
+            raise RuntimeError("Preview screen did not render.")
+
+        stage = "rerun"
+        _step(result, stage, at.run)
+
+        stage = "switch_template"
+        templates = list_templates()
+        other = templates[(templates.index(at.selectbox(key="template_name").value) + 1) % len(templates)]
+        _step(result, stage, lambda: at.selectbox(key="template_name").set_value(other).run())
+
+        stage = "pdf_view"
+        _step(result, stage, lambda: at.toggle(key="pdf_view").set_value(True).run())
+        result.timings["session"] = time.perf_counter() - start
+    except Exception as e:
+        result.failed_stage = stage
+        result.error = f"{type(e).__name__}: {e}"
+    finally:
+        _session.id = None
+    return result
+
+
+def run_level(concurrency: int, sessions_per_worker: int, scale_name: str, timeout: float, offset: int) -> Dict[str, Any]:
+    """
+    Runs concurrency * sessions_per_worker sessions with at most concurrency in flight, and summarizes them.
+    """
+    from utils.session_store import session_store
+    from utils.synthetic_resume import SCALES, synthetic_resume_fields
+
+    total = concurrency * sessions_per_worker
+    # Distinct candidates, so sessions do not share generation jobs or cached results
+    inputs = [synthetic_resume_fields(SCALES[scale_name], seed=offset + i) for i in range(total)]
+    for i, fields in enumerate(inputs):
+        fields["name"] = f"Load Test {offset + i}"
+
+    gc.collect()
+    rss_before = rss_bytes()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="load-session") as executor:
+        results = list(executor.map(
+            lambda i: run_session(f"load-{offset + i}", inputs[i], timeout),
+            range(total)
+        ))
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    rss_after = rss_bytes()
+
+    completed = [result for result in results if result.error is None]
+    stages = {}
+    for stage in STAGES:
+        values = [result.timings[stage] for result in results if stage in result.timings]
+        stages[stage] = {
+            "count": len(values),
+            "p50_s": percentile(values, 0.5),
+            "p95_s": percentile(values, 0.95),
+            "p99_s": percentile(values, 0.99),
+            "max_s": round(max(values), 4) if values else None
+        }
+    errors = [
+        {"session": result.session_id, "stage": result.failed_stage, "error": result.error}
+        for result in results if result.error is not None
+    ]
+    return {
+        "concurrency": concurrency,
+        "sessions": total,
+        "completed": len(completed),
+        "error_rate": round(len(errors) / total, 4) if total else 0.0,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_minute": round(len(completed) / elapsed * 60, 2) if elapsed > 0 else 0.0,
+        "stages": stages,
+        "rss_before_bytes": rss_before,
+        "rss_after_bytes": rss_after,
+        "rss_growth_bytes": rss_after - rss_before,
+        "session_store_bytes": session_store.footprint()["memory_bytes"],
+        "errors": errors[:10]
+    }
+
+
+def print_level(level: Dict[str, Any]) -> None:
+    print(
+        f"concurrency {level['concurrency']:>3}: {level['completed']}/{level['sessions']} sessions in "
+        f"{level['elapsed_s']:.1f}s ({level['throughput_per_minute']:.1f}/min), error rate {level['error_rate']:.1%}, "
+        f"RSS {level['rss_growth_bytes'] / 2**20:+.1f} MiB"
+    )
+    for stage, row in level["stages"].items():
+        if row["count"]:
+            print(f"    {stage:<16} p50 {row['p50_s']:8.3f}s  p95 {row['p95_s']:8.3f}s  p99 {row['p99_s']:8.3f}s")
+    for error in level["errors"][:3]:
+        print(f"    {error['session']} failed in {error['stage']}: {error['error']}")
+
+
+def run_load_test(args: argparse.Namespace) -> Dict[str, Any]:
+    environment = _configure_environment(args)
+    from utils.airtable import _write_queues
+    from utils.metrics import metrics
+
+    levels = []
+    offset = 0
+    rss_start = rss_bytes()
+    for concurrency in args.levels:
+        metrics.reset()
+        level = run_level(concurrency, args.sessions, args.scale, args.timeout, offset)
+        # In-app stage timings (LLM calls, rendering, Airtable writes) for the same sessions
+        level["app_stages"] = metrics.summary()
+        offset += level["sessions"]
+        print_level(level)
+        levels.append(level)
+
+    for write_queue in list(_write_queues.values()):
+        write_queue.flush(timeout=30)
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "levels": args.levels,
+            "sessions_per_worker": args.sessions,
+            "scale": args.scale,
+            "llm_latency_s": args.llm_latency,
+            "airtable_latency_s": args.airtable_latency,
+            "airtable_failure_rate": args.airtable_failure_rate
+        },
+        "levels": levels,
+        "rss_start_bytes": rss_start,
+        "rss_end_bytes": rss_bytes(),
+        "airtable": {
+            "stub": environment["airtable"].store.stats(),
+            "queues": [write_queue.stats() for write_queue in _write_queues.values()]
+        }
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the Streamlit app with concurrent simulated sessions.")
+    parser.add_argument("--levels", default="1,2,4,8", help="Comma-separated concurrency levels to ramp through")
+    parser.add_argument("--sessions", type=int, default=2, help="Sessions per concurrent worker at each level")
+    parser.add_argument("--scale", default="medium", help="Synthetic candidate size: small, medium or large")
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="Simulated seconds per fake LLM call")
+    parser.add_argument("--airtable-latency", type=float, default=0.05, help="Simulated seconds per Airtable request")
+    parser.add_argument("--airtable-failure-rate", type=float, default=0.0, help="Share of Airtable requests that fail with a 503")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds one script run may take before the session fails")
+    parser.add_argument("--output", default="load_test_results.json", help="Where to write the JSON results")
+    args = parser.parse_args(argv)
+    args.levels = [int(level) for level in args.levels.split(",") if level.strip()]
+
+    # Keep runs independent: no persistent LLM cache or session spill files
+    os.environ["LLM_CACHE_PATH"] = ""
+    os.environ["SESSION_SPILL_DIR"] = ""
+    sys.path.insert(0, os.path.dirname(APP_PATH))
+
+    results = run_load_test(args)
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote results to {args.output}.")
+    return 1 if any(level["error_rate"] for level in results["levels"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,36 @@
 import os
 import streamlit as st
-from streamlit import session_state as ss
+from utils.startup_profile import startup_profiler
+# Installed before the app's own imports so STARTUP_PROFILE=1 can time them
+startup_profiler.install_if_enabled()
 from controller.app_controller import AppController
+from utils.session_store import has_state
 from dotenv import load_dotenv, find_dotenv
 
 
+@st.cache_resource(show_spinner=False)
+def load_environment() -> bool:
+    return load_dotenv(find_dotenv())
+
+
+@st.cache_resource(show_spinner=False)
+def get_app_controller(app_env: str) -> AppController:
+    """
+    Streamlit reruns this script on every interaction; the controller and the clients it holds are created once per
+    process instead.
+    """
+    return AppController(app_env = app_env)
+
+
 def main():
-    load_dotenv(find_dotenv())
+    load_environment()
     st.set_page_config(page_title="AI Resume Builder", page_icon=":robot:", layout="wide")
-    app_controller = AppController(app_env = os.getenv("APP_ENV"))
-    if "resume_input" not in ss:
+    app_controller = get_app_controller(os.getenv("APP_ENV"))
+    app_controller.render_title()
+    if not has_state("resume_input"):
         app_controller.handle_ingest_screen()
     else:
         app_controller.handle_preview_screen()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -45,6 +45,22 @@ class ResumeInput(BaseModel):
         return data
 
 
+class ResumeSections(BaseModel):
+    """
+    The free-text subset of ResumeInput that the resume reader asks the LLM for. Contact fields are found locally and
+    only added to the output schema when the local pass could not resolve them.
+    """
+    name: str = ""
+    experience: str = ""
+    projects: str = ""
+    education: str = ""
+    skills: str = ""
+    coursework: str = ""
+    certifications: str = ""
+    involvement: str = ""
+    summary: str = ""
+
+
 class ContactInfo(BaseModel):
     location: str
     phone_number: str
@@ -79,6 +95,35 @@ class Skills(BaseModel):
     all_skills: List[str]
 
 
+class SummarySection(BaseModel):
+    summary: str
+    location: str
+class ExperienceSection(BaseModel):
+    experience: List[Experience]
+class ProjectsSection(BaseModel):
+    projects: List[Project]
+class EducationSection(BaseModel):
+    education: List[Education]
+class CertificatesSection(BaseModel):
+    certificates: List[Certificate]
+class InvolvementSection(BaseModel):
+    involvement: List[Involvement]
+class SkillsSection(BaseModel):
+    skills: Skills
+
+
+class JobTarget(BaseModel):
+    """
+    One job posting to tailor a resume for in multi-target generation.
+    """
+    title: str
+    description: str = ""
+
+
+class JobTargets(BaseModel):
+    targets: List[JobTarget]
+
+
 class ResumeSchema(BaseModel):
     name: str
     contact_info: ContactInfo
@@ -123,4 +168,21 @@ class ResumeSchema(BaseModel):
                 flattened["target job description"] = self.target_job_description
 
 
-        return flattened
\ No newline at end of file
+        return flattened
+
+
+class TargetedResume(BaseModel):
+    """
+    A resume tailored to one target, with the latency and token usage of generating it.
+    """
+    target: JobTarget
+    resume: ResumeSchema
+    latency_s: float = 0.0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+    from_cache: bool = False
+
+
+class TargetedResumes(BaseModel):
+    resumes: List[TargetedResume]
@@ -0,0 +1,77 @@
+import os
+import pytest
+from utils.airtable import AirtableWriteQueue, initialize_airtable_client
+from utils.airtable_stub import start_airtable_stub
+
+
+@pytest.fixture
+def stub():
+    server = start_airtable_stub(invalid_field="Bad")
+    yield server
+    server.shutdown()
+
+
+def make_queue(server, spool_path, **kwargs):
+    client = initialize_airtable_client("stub", f"http://127.0.0.1:{server.server_address[1]}")
+    options = {"flush_interval": 0.2, "max_retries": 1, "backoff_base": 0.01, "spool_path": str(spool_path)}
+    return AirtableWriteQueue(client, **{**options, **kwargs})
+
+
+def test_records_are_coalesced_into_batches_of_ten(stub, tmp_path):
+    write_queue = make_queue(stub, tmp_path / "spool.jsonl")
+    for i in range(25):
+        write_queue.enqueue("tblResumes", {"Name": f"Candidate {i}"}, "appTest")
+    assert write_queue.flush(timeout=10)
+    write_queue.close()
+
+    assert write_queue.stats()["written"] == 25
+    assert stub.store.counters["requests"] == 3
+    assert len(stub.store.tables["appTest/tblResumes"]) == 25
+
+
+def test_a_bad_record_only_drops_itself(stub, tmp_path):
+    write_queue = make_queue(stub, tmp_path / "spool.jsonl")
+    for i in range(10):
+        write_queue.enqueue("tblResumes", {"Name": f"Candidate {i}", **({"Bad": "x"} if i == 4 else {})}, "appTest")
+    assert write_queue.flush(timeout=10)
+    write_queue.close()
+
+    stats = write_queue.stats()
+    assert (stats["written"], stats["dropped"], stats["split_batches"]) == (9, 1, 1)
+    assert len(stub.store.tables["appTest/tblResumes"]) == 9
+
+
+def test_unwritten_records_are_spooled_and_replayed(stub, tmp_path):
+    spool_path = tmp_path / "spool.jsonl"
+    stub.handler.failure_rate = 1.0
+    write_queue = make_queue(stub, spool_path)
+    for i in range(5):
+        write_queue.enqueue("tblResumes", {"Name": f"Candidate {i}"}, "appTest")
+    assert write_queue.flush(timeout=10)
+    write_queue.close()
+    assert write_queue.stats()["spooled"] == 5
+    assert len(spool_path.read_text().splitlines()) == 5
+
+    stub.handler.failure_rate = 0.0
+    replayed = make_queue(stub, spool_path)
+    assert replayed.stats()["enqueued"] == 5
+    assert replayed.flush(timeout=10)
+    replayed.close()
+    assert replayed.stats()["written"] == 5
+    assert not os.path.exists(spool_path)
+
+
+def test_spool_errors_do_not_stop_the_writer(stub, tmp_path):
+    # The spool's parent is a file, so every spool write fails
+    (tmp_path / "not_a_dir").write_text("")
+    stub.handler.failure_rate = 1.0
+    write_queue = make_queue(stub, tmp_path / "not_a_dir" / "spool.jsonl")
+    write_queue.enqueue("tblResumes", {"Name": "Lost"}, "appTest")
+    assert write_queue.flush(timeout=10)
+    assert write_queue.stats()["dropped"] == 1
+
+    stub.handler.failure_rate = 0.0
+    write_queue.enqueue("tblResumes", {"Name": "Kept"}, "appTest")
+    assert write_queue.flush(timeout=10)
+    write_queue.close()
+    assert write_queue.stats()["written"] == 1
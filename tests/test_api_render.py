@@ -0,0 +1,46 @@
+import pytest
+from api.server import content_disposition
+from utils.api_client import attachment_file_name
+
+
+@pytest.mark.parametrize("file_name", [
+    "Ann Lee_Resume_2026-10-18.pdf",
+    "李雷_Resume_2026-10-18.pdf",
+    'José "Pepe" Núñez_Resume_2026-10-18.pdf',
+    "O'Brien; Resume.pdf"
+])
+def test_file_name_round_trips_through_header(file_name):
+    header = content_disposition(file_name)
+    header.encode("latin-1")
+    assert attachment_file_name(header) == file_name
+
+
+def test_plain_filename_fallback():
+    assert attachment_file_name('attachment; filename="Ann_Resume.pdf"') == "Ann_Resume.pdf"
+    assert attachment_file_name("") == "Resume.pdf"
+
+
+def test_client_reads_server_file_name():
+    from fastapi.testclient import TestClient
+    from api.server import app
+    from schemas import ResumeSchema
+    from utils.api_client import ResumeAPIClient
+
+    resume = ResumeSchema(
+        name = "李雷",
+        contact_info = {"location": "Shanghai", "phone_number": "5550100", "email": "li.lei@example.com", "linkedin_profile": "", "github_profile": ""},
+        experience = [],
+        projects = [],
+        education = [],
+        certificates = [],
+        involvement = [],
+        skills = {"all_skills": ["Python"]},
+        summary = "Backend engineer.",
+        target_job_title = "Platform Engineer",
+        target_job_description = "Own the deploy platform."
+    )
+    client = ResumeAPIClient("http://testserver")
+    client._client = TestClient(app)
+    pdf_bytes, file_name = client.render(resume)
+    assert pdf_bytes.startswith(b"%PDF")
+    assert file_name.startswith("李雷_Resume_") and file_name.endswith(".pdf")
@@ -0,0 +1,69 @@
+import pytest
+from schemas import ResumeInput
+from utils import ai, section_chains
+from utils.fake_llm import fake_llm_factory
+from utils.llm_cassette import RECORD, REPLAY, Cassette
+from utils.llm_registry import chain_registry
+from utils.result_cache import ResultCache
+from utils.similarity_cache import SimilarityCache
+
+
+RESUME_INPUT = ResumeInput(
+    name = "Ada Park",
+    email = "ada.park@example.com",
+    phone_number = "5550100",
+    experience = "Backend Engineer at Example Corp - Built billing services in Python.",
+    projects = "Rate limiter - Token bucket library with async support.",
+    education = "BS Computer Science, Example University, 2021.",
+    skills = "Python, SQL, Kubernetes.",
+    target_job_title = "Platform Engineer",
+    target_job_description = "Own the internal platform for deploying Python services."
+)
+
+
+def use_caches(monkeypatch, db_path):
+    # A disk-backed result cache at db_path stands in for the project cache; a new path is a fresh checkout
+    monkeypatch.setattr(ai, "resume_cache", ResultCache("resume_builder", db_path=str(db_path)))
+    monkeypatch.setattr(ai, "resume_similarity_cache", SimilarityCache())
+    monkeypatch.setattr(section_chains, "section_cache", ResultCache("resume_section", db_path=str(db_path)))
+
+
+def generate():
+    return ai.invoke_resume_chain(RESUME_INPUT), section_chains.generate_resume_by_section(RESUME_INPUT)
+
+
+@pytest.fixture(autouse=True)
+def restore_registry():
+    yield
+    chain_registry.set_cassette(None)
+    chain_registry.set_llm_factory(None)
+
+
+def test_record_on_warm_cache_replays_without_cache(tmp_path, monkeypatch):
+    cassette_path = tmp_path / "cassette.jsonl"
+    use_caches(monkeypatch, tmp_path / "warm.sqlite3")
+    chain_registry.set_llm_factory(fake_llm_factory())
+    warm = generate()
+    assert ai.resume_cache.stats()["writes"] > 0
+
+    chain_registry.set_cassette(Cassette(str(cassette_path), RECORD))
+    recorded = generate()
+    assert chain_registry.cassette.stats()["recorded"] > 0
+    assert recorded == warm
+
+    use_caches(monkeypatch, tmp_path / "fresh.sqlite3")
+    chain_registry.set_llm_factory(None)
+    chain_registry.set_cassette(Cassette(str(cassette_path), REPLAY))
+    replayed = generate()
+    assert replayed == recorded
+    assert chain_registry.cassette.stats()["misses"] == 0
+
+
+def test_cassette_leaves_result_caches_alone(tmp_path, monkeypatch):
+    use_caches(monkeypatch, tmp_path / "cache.sqlite3")
+    chain_registry.set_llm_factory(fake_llm_factory())
+    chain_registry.set_cassette(Cassette(str(tmp_path / "cassette.jsonl"), RECORD))
+    generate()
+    assert ai.resume_cache.stats()["writes"] == 0
+    assert section_chains.section_cache.stats()["writes"] == 0
+    assert ai.resume_similarity_cache.stats()["entries"] == 0
@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from utils.rate_limiter import ModelLimiter, ModelQuota, RateLimiter, TokenBucket, rate_limited
+
+
+@pytest.fixture(autouse=True)
+def no_quota_overrides(monkeypatch):
+    monkeypatch.delenv("RATE_LIMIT_RPM", raising=False)
+    monkeypatch.delenv("RATE_LIMIT_TPM", raising=False)
+
+
+def test_token_bucket_refills_at_rate_up_to_capacity():
+    bucket = TokenBucket(rate=10, capacity=20)
+    start = bucket.updated
+    assert bucket.wait_time(20, start) == 0
+    bucket.take(20)
+    assert bucket.wait_time(5, start) == pytest.approx(0.5)
+    assert bucket.wait_time(5, start + 0.5) == 0
+    bucket._refill(start + 100)
+    assert bucket.level == 20
+
+
+def test_token_bucket_debt_delays_the_next_call():
+    bucket = TokenBucket(rate=10, capacity=20)
+    now = bucket.updated
+    bucket.take(30)
+    assert bucket.wait_time(1, now) == pytest.approx(1.1)
+
+
+def test_aimd_halves_on_429_and_grows_additively():
+    limiter = ModelLimiter("gpt-4o-mini", ModelQuota(initial_concurrency=8, max_concurrency=32))
+    limiter.acquire(100)
+    limiter.release(100, rate_limited=True, retry_after=2.0)
+    assert limiter.limit == 4
+    assert limiter.counters["rate_limited"] == 1
+    assert limiter.blocked_until > 0
+
+    limiter.blocked_until = 0
+    for _ in range(4):
+        limiter.acquire(100)
+        limiter.release(100, actual_tokens=100, latency=0.1)
+    # One slot per window of successes: four at a limit of about 4 add about one
+    assert 4.9 < limiter.limit < 5
+
+
+def test_latency_spike_shrinks_the_limit():
+    limiter = ModelLimiter("gpt-4o-mini", ModelQuota(initial_concurrency=8))
+    limiter.acquire(100)
+    limiter.release(100, latency=0.1)
+    before = limiter.limit
+    limiter.acquire(100)
+    limiter.release(100, latency=1.0)
+    assert limiter.limit == pytest.approx(before * 0.75)
+
+
+def test_backoff_honours_retry_after():
+    limiter = RateLimiter(backoff_base=0.01, backoff_max=0.05)
+    assert limiter.backoff(10) <= 0.05
+    assert limiter.backoff(0, retry_after=3.0) == 3.0
+
+
+def test_quota_is_split_across_processes(monkeypatch):
+    quotas = {"gpt-4o-mini": ModelQuota(rpm=500, tpm=200_000)}
+    assert RateLimiter(quotas).quota_for("gpt-4o-mini").rpm == 500
+    split = RateLimiter(quotas, processes=4).quota_for("gpt-4o-mini")
+    assert (split.rpm, split.tpm) == (125, 50_000)
+
+    monkeypatch.setenv("RATE_LIMIT_RPM", "60")
+    assert RateLimiter(quotas, processes=4).quota_for("gpt-4o-mini").rpm == 15
+
+
+def test_rate_limited_model_retries_429s_from_the_stub():
+    from langchain_openai import ChatOpenAI
+    from utils.openai_stub import start_openai_stub
+
+    server = start_openai_stub(rpm=3, tpm=10 ** 9, window_seconds=1)
+    try:
+        llm = ChatOpenAI(
+            model_name = "gpt-4o-mini",
+            api_key = "stub",
+            base_url = f"http://127.0.0.1:{server.server_address[1]}/v1",
+            max_retries = 0
+        )
+        limiter = RateLimiter({"gpt-4o-mini": ModelQuota(rpm=6000, tpm=10 ** 9)}, backoff_base=0.05)
+        model = rate_limited(llm, "gpt-4o-mini", limiter)
+        with ThreadPoolExecutor(6) as executor:
+            replies = list(executor.map(lambda i: model.invoke(f"Say hello {i}"), range(6)))
+    finally:
+        server.shutdown()
+
+    assert len(replies) == 6
+    stats = limiter.stats()["gpt-4o-mini"]
+    assert server.window.counters["rejected"] > 0
+    assert stats["rate_limited"] == server.window.counters["rejected"]
+    assert stats["failures"] == 0
+    assert stats["concurrency_limit"] < 8
@@ -0,0 +1,44 @@
+from utils.similarity_cache import SimilarityCache
+
+
+PAYLOAD = {
+    "name": "Ada Park",
+    "email": "ada.park@example.com",
+    "phone_number": "5550100",
+    "experience": "Backend Engineer at Example Corp, 2019-2023 - Cut billing latency by 40%.",
+    "skills": "Python, SQL, Kubernetes.",
+    "target_job_title": "Platform Engineer",
+    "target_job_description": "Own the internal platform for deploying Python services to Kubernetes."
+}
+
+
+def test_reworded_posting_hits():
+    cache = SimilarityCache()
+    cache.set(PAYLOAD, "resume")
+    match = cache.get({**PAYLOAD, "target_job_description": "Own the internal platform that deploys Python services to Kubernetes."})
+    assert match is not None and match.value == "resume"
+
+
+def test_edited_candidate_field_misses():
+    cache = SimilarityCache()
+    cache.set(PAYLOAD, "resume")
+    edits = {
+        "experience": "Backend Engineer at Example Corp, 2019-2024 - Cut billing latency by 40%.",
+        "phone_number": "5550101",
+        "skills": "Python, SQL, Kubernetes, Go."
+    }
+    for field, value in edits.items():
+        assert cache.get({**PAYLOAD, field: value}) is None, field
+    assert cache.stats()["hits"] == 0
+
+
+def test_whitespace_only_change_hits():
+    cache = SimilarityCache()
+    cache.set(PAYLOAD, "resume")
+    assert cache.get({**PAYLOAD, "skills": "  Python,  SQL, Kubernetes. "}) is not None
+
+
+def test_scope_separates_models():
+    cache = SimilarityCache()
+    cache.set(PAYLOAD, "fake resume", scope="gpt-4o-mini@fake")
+    assert cache.get(PAYLOAD, scope="gpt-4o-mini@openai") is None
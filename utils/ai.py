@@ -1,36 +1,236 @@
-from langchain_openai import ChatOpenAI
-from langchain_core.runnables import RunnableSerializable
-from langchain.prompts import PromptTemplate
+from typing import Any, Iterator, Optional, Tuple
+from langchain_core.prompt_values import StringPromptValue
+from langchain_core.runnables import RunnableLambda, RunnableSerializable
+from langchain_core.output_parsers import JsonOutputParser
 from langchain.output_parsers import PydanticOutputParser
-from utils.constants import BASE_PROMPT
+from utils.llm_registry import ChainRegistry, chain_registry
+from utils.metrics import track
+from utils.output_repair import OutputRepairer, with_output_repair
+from utils.prompt_builder import build_resume_prompt, resume_prompt_fingerprint
+from utils.result_cache import make_cache_key, resume_cache
+from utils.similarity_cache import resume_similarity_cache
+from utils.token_accounting import TokenUsageRecorder
 from schemas import ResumeInput, ResumeSchema
 
 
-def initialize_resume_chain() -> RunnableSerializable:
+RESUME_CHAIN = "resume_builder"
+RESUME_STREAM_CHAIN = "resume_builder_stream"
+DEFAULT_MODEL = "gpt-4o-mini"
+
+# Event name yielded by stream_resume_chain once the full resume has been validated
+RESUME_COMPLETE = "resume"
+
+
+def _build_resume_prompt(response_schema: PydanticOutputParser, model_name: str) -> RunnableLambda:
+    """
+    Prompt step for the resume chains: compacts the ResumeInput dump into a token-budgeted prompt.
+    """
+    format_instructions = response_schema.get_format_instructions()
+
+    def build(resume_input: dict) -> StringPromptValue:
+        return StringPromptValue(text = build_resume_prompt(resume_input, format_instructions, model_name = model_name).text)
+
+    return RunnableLambda(build, name = "ResumePrompt")
+
+
+def resume_output_defaults(resume_input: dict) -> dict:
+    """
+    Values known from the input that stand in for top-level fields the LLM leaves out or garbles.
+    """
+    return {
+        "name": resume_input.get("name") or "",
+        "contact_info": {
+            "location": "",
+            "phone_number": resume_input.get("phone_number") or "",
+            "email": resume_input.get("email") or "",
+            "linkedin_profile": resume_input.get("linkedin_profile") or "",
+            "github_profile": resume_input.get("github_profile") or ""
+        },
+        "target_job_title": resume_input.get("target_job_title") or "",
+        "target_job_description": resume_input.get("target_job_description") or ""
+    }
+
+
+def similar_cached_resume(payload: dict) -> Optional[ResumeSchema]:
+    """
+    Reuses a resume generated for a near-identical input (same candidate, reworded posting), with the name, contact and
+    target job fields taken from this input. None when nothing cached is close enough.
+    """
+    match = resume_similarity_cache.get(payload, chain_registry.cache_scope(DEFAULT_MODEL))
+    if match is None:
+        return None
+    resume_data = ResumeSchema.model_validate_json(match.value)
+    defaults = resume_output_defaults(payload)
+    contact = {key: value for key, value in defaults.pop("contact_info").items() if value}
+    return resume_data.model_copy(update = {
+        **{key: value for key, value in defaults.items() if value},
+        "contact_info": resume_data.contact_info.model_copy(update = contact)
+    })
+
+
+def _resume_cache_key(payload: dict) -> str:
+    return make_cache_key(payload, resume_prompt_fingerprint(), chain_registry.cache_scope(DEFAULT_MODEL))
+
+
+def _cached_resume(cache_key: str, payload: dict) -> Optional[ResumeSchema]:
+    if not chain_registry.caches_results:
+        return None
+    cached = resume_cache.get(cache_key)
+    if cached is not None:
+        return ResumeSchema.model_validate_json(cached)
+    return similar_cached_resume(payload)
+
+
+def _remember_resume(cache_key: str, payload: dict, resume_data: ResumeSchema) -> None:
+    if not chain_registry.caches_results:
+        return
+    value = resume_data.model_dump_json()
+    resume_cache.set(cache_key, value)
+    resume_similarity_cache.set(payload, value, chain_registry.cache_scope(DEFAULT_MODEL))
+
+
+def _build_resume_chain(
+    registry: ChainRegistry,
+    model_name: str = DEFAULT_MODEL,
+    temperature: float = 0
+) -> RunnableSerializable:
     response_schema = PydanticOutputParser(pydantic_object = ResumeSchema)
-    prompt = PromptTemplate(
-        template = BASE_PROMPT,
-        input_variables = [ResumeInput.required_fields],
-        partial_variables={"format_instrutions": response_schema.get_format_instructions()}
+    prompt = _build_resume_prompt(response_schema, model_name)
+    llm = registry.get_llm(
+        model_name,
+        temperature,
+        response_format = {"type": "json_object"}
     )
-    llm = ChatOpenAI(
-        model_name = "gpt-4o-mini",
-        temperature = 0,
-        model_kwargs={
-            "response_format": {"type": "json_object"}
-        }
+
+    chain = with_output_repair(
+        prompt,
+        llm,
+        ResumeSchema,
+        RESUME_CHAIN,
+        resume_output_defaults
+    ).with_config({"run_name": "Resume Builder", "callbacks": [TokenUsageRecorder(RESUME_CHAIN)]})
+    return chain
+
+
+def _build_resume_stream_chain(
+    registry: ChainRegistry,
+    model_name: str = DEFAULT_MODEL,
+    temperature: float = 0
+) -> RunnableSerializable:
+    """
+    Same prompt and model as the resume chain, but parses partial JSON so callers can consume it while tokens arrive.
+    """
+    prompt = _build_resume_prompt(PydanticOutputParser(pydantic_object = ResumeSchema), model_name)
+    llm = registry.get_llm(
+        model_name,
+        temperature,
+        response_format = {"type": "json_object"}
     )
-    
+
     chain = (
-        prompt 
-        | llm 
-        | response_schema
-    ).with_config({"run_name": "Resume Builder"})
+        prompt
+        | llm
+        | JsonOutputParser()
+    ).with_config({"run_name": "Resume Builder (Streaming)", "callbacks": [TokenUsageRecorder(RESUME_CHAIN)]})
     return chain
 
 
+chain_registry.register(RESUME_CHAIN, _build_resume_chain)
+chain_registry.register(RESUME_STREAM_CHAIN, _build_resume_stream_chain)
+
+
+def initialize_resume_chain(
+    model_name: str = DEFAULT_MODEL,
+    temperature: float = 0
+) -> RunnableSerializable:
+    """
+    Returns the shared resume chain for the given model, building it once per process.
+    """
+    return chain_registry.get_chain(RESUME_CHAIN, model_name = model_name, temperature = temperature)
+
+
 def invoke_resume_chain(
     resume_input: ResumeInput
 ) -> ResumeSchema:
-    chain = initialize_resume_chain()
-    return chain.invoke(resume_input.model_dump())
+    """
+    Generates a resume, serving identical inputs (same prompt version and model) from the result cache and
+    near-identical ones from the similarity cache.
+    """
+    payload = resume_input.model_dump()
+    with track("generate_resume") as span:
+        span.payload_bytes = len(resume_input.model_dump_json().encode("utf-8"))
+        cache_key = _resume_cache_key(payload)
+        cached = _cached_resume(cache_key, payload)
+        if cached is not None:
+            return cached
+
+        chain = initialize_resume_chain()
+        resume_data = chain.invoke(payload)
+        _remember_resume(cache_key, payload, resume_data)
+        return resume_data
+
+
+async def ainvoke_resume_chain(
+    resume_input: ResumeInput
+) -> ResumeSchema:
+    """
+    Async counterpart to invoke_resume_chain for running many generations concurrently.
+    """
+    payload = resume_input.model_dump()
+    with track("generate_resume") as span:
+        span.payload_bytes = len(resume_input.model_dump_json().encode("utf-8"))
+        cache_key = _resume_cache_key(payload)
+        cached = _cached_resume(cache_key, payload)
+        if cached is not None:
+            return cached
+
+        chain = initialize_resume_chain()
+        resume_data = await chain.ainvoke(payload)
+        _remember_resume(cache_key, payload, resume_data)
+        return resume_data
+
+
+def stream_resume_chain(
+    resume_input: ResumeInput
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Generates a resume while streaming, yielding (section, value) pairs as soon as each top-level section of the JSON
+    output is complete. The last pair is (RESUME_COMPLETE, ResumeSchema) after validating the full output.
+    """
+    payload = resume_input.model_dump()
+    with track("generate_resume") as span:
+        span.payload_bytes = len(resume_input.model_dump_json().encode("utf-8"))
+        cache_key = _resume_cache_key(payload)
+        resume_data = _cached_resume(cache_key, payload)
+        if resume_data is not None:
+            for section, value in resume_data.model_dump().items():
+                yield section, value
+            yield RESUME_COMPLETE, resume_data
+            return
+
+        chain = chain_registry.get_chain(RESUME_STREAM_CHAIN)
+        emitted = set()
+        partial = {}
+        for partial in chain.stream(payload):
+            if not isinstance(partial, dict):
+                continue
+            # Keys stream in order, so every key before the last one is finished
+            for section in list(partial)[:-1]:
+                if section not in emitted:
+                    emitted.add(section)
+                    yield section, partial[section]
+
+        for section, value in partial.items():
+            if section not in emitted:
+                yield section, value
+
+        format_instructions = PydanticOutputParser(pydantic_object = ResumeSchema).get_format_instructions()
+        repairer = OutputRepairer(ResumeSchema, chain_registry.get_llm(DEFAULT_MODEL, 0, response_format = {"type": "json_object"}), RESUME_CHAIN)
+        resume_data = repairer.repair(
+            partial if isinstance(partial, dict) else {},
+            lambda: build_resume_prompt(payload, format_instructions, model_name = DEFAULT_MODEL).text,
+            resume_output_defaults(payload),
+            {"callbacks": [TokenUsageRecorder(RESUME_CHAIN)]}
+        )
+        _remember_resume(cache_key, payload, resume_data)
+        yield RESUME_COMPLETE, resume_data
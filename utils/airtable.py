@@ -1,15 +1,34 @@
+import atexit
+import json
+import os
+import queue
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
 from pyairtable import Api
-from requests import HTTPError
+from requests import HTTPError, RequestException
+from utils.metrics import track
+from utils.result_cache import PROJECT_ROOT
+
+
+DEFAULT_ENDPOINT_URL = "https://api.airtable.com"
+# Project-relative like the result cache, so records spooled by one entry point are replayed by any other
+DEFAULT_SPOOL_PATH = os.path.join(PROJECT_ROOT, ".cache", "airtable_spool.jsonl")
+MAX_BATCH_SIZE = 10
 
 
 def initialize_airtable_client(
-    api_key: str
+    api_key: str,
+    endpoint_url: str = None
 ) -> Api:
     """
-    Creates an Airtable client given an API key.
+    Creates an Airtable client given an API key. The endpoint defaults to AIRTABLE_ENDPOINT_URL (or the public API), which
+    lets a local stub of the Airtable API stand in during tests.
     """
     try:
-        return Api(api_key)
+        endpoint_url = endpoint_url or os.getenv("AIRTABLE_ENDPOINT_URL", DEFAULT_ENDPOINT_URL)
+        return Api(api_key, endpoint_url=endpoint_url)
     except HTTPError as e:
         print(f"Encountered an error while initializing Airtable client.")
         print(f"Error: {e}")
@@ -38,3 +57,232 @@ def create_airtable_record(
     except ValueError as e:
         print(f"No record created in Airtable table.")
         print(f"Error: {e}")
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, RequestException)
+
+
+class AirtableWriteQueue:
+    """
+    Write-behind queue for Airtable records. Records are enqueued without blocking and a background thread coalesces
+    them per table into batch_create calls of up to 10 records. Transient failures are retried with jittered exponential
+    backoff; records that still cannot be written are spooled to a local JSONL file and replayed on the next start.
+    """
+
+    def __init__(
+        self,
+        client: Api,
+        flush_interval: float = 0.5,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        spool_path: Optional[str] = DEFAULT_SPOOL_PATH
+    ):
+        self.client = client
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.spool_path = spool_path
+        self._queue: "queue.Queue[Tuple[str, str, dict]]" = queue.Queue()
+        self._spool_lock = threading.Lock()
+        self._closed = False
+        self.counters = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "retries": 0,
+            "spooled": 0,
+            "split_batches": 0,
+            "dropped": 0
+        }
+        self.replay_spool()
+        self._worker = threading.Thread(target=self._run, name="airtable-write-queue", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    def enqueue(self, table_id: str, data: dict, base_id: str) -> None:
+        """
+        Schedules a record to be created in the given table. Returns immediately.
+        """
+        if self._closed:
+            raise RuntimeError("Airtable write queue is closed.")
+        self.counters["enqueued"] += 1
+        self._queue.put((base_id, table_id, data))
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Blocks until every record enqueued so far has been written or spooled. Returns False on timeout.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float = 10.0) -> None:
+        """
+        Flushes pending records and stops the worker. Anything left unwritten is spooled to disk.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self.flush(timeout)
+        self._queue.put(None)
+        self._worker.join(timeout)
+
+        leftovers = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                leftovers.append(item)
+        for base_id, table_id, data in leftovers:
+            self._spool(base_id, table_id, [data])
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+
+            # Drain whatever else is pending (waiting briefly for stragglers) to build full batches
+            items = [item]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    extra = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if extra is None:
+                    stop = True
+                    break
+                items.append(extra)
+
+            grouped: Dict[Tuple[str, str], List[dict]] = {}
+            for base_id, table_id, data in items:
+                grouped.setdefault((base_id, table_id), []).append(data)
+            for (base_id, table_id), records in grouped.items():
+                for start in range(0, len(records), MAX_BATCH_SIZE):
+                    self._write_batch(base_id, table_id, records[start:start + MAX_BATCH_SIZE])
+
+            for _ in items:
+                self._queue.task_done()
+            if stop:
+                self._queue.task_done()
+                return
+
+    def _write_batch(self, base_id: str, table_id: str, records: List[dict]) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                with track("airtable_write") as span:
+                    span.payload_bytes = len(json.dumps(records, default=str).encode("utf-8"))
+                    self.client.table(base_id, table_id).batch_create(records)
+                self.counters["written"] += len(records)
+                self.counters["batches"] += 1
+                print(f"Created {len(records)} record(s) in Airtable table {table_id}.")
+                return
+            except Exception as e:
+                if not _is_retryable(e) and len(records) > 1:
+                    # One bad record (e.g. a 422 on a field) fails the whole batch; write them one by one so only
+                    # the bad record is lost
+                    print(f"Encountered an error while creating a batch of {len(records)} Airtable records. Writing them one by one.")
+                    print(f"Error: {e}")
+                    self.counters["split_batches"] += 1
+                    for record in records:
+                        self._write_batch(base_id, table_id, [record])
+                    return
+                if not _is_retryable(e):
+                    print(f"Encountered an error while creating Airtable records. Dropping {len(records)} record(s).")
+                    print(f"Error: {e}")
+                    self.counters["dropped"] += len(records)
+                    return
+                if attempt == self.max_retries:
+                    print(f"Airtable unavailable after {attempt + 1} attempts. Spooling {len(records)} record(s).")
+                    print(f"Error: {e}")
+                    self._spool(base_id, table_id, records)
+                    return
+                self.counters["retries"] += 1
+                time.sleep(self.backoff_base * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+    def _spool(self, base_id: str, table_id: str, records: List[dict]) -> None:
+        if not self.spool_path:
+            self.counters["dropped"] += len(records)
+            return
+        try:
+            with self._spool_lock:
+                directory = os.path.dirname(self.spool_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.spool_path, "a", encoding="utf-8") as spool:
+                    for data in records:
+                        spool.write(json.dumps({"base_id": base_id, "table_id": table_id, "fields": data}) + "\n")
+        except OSError as e:
+            # A full disk or read-only directory must not take the writer thread down with it
+            print(f"Encountered an error while spooling Airtable records to {self.spool_path}. Dropping {len(records)} record(s).")
+            print(f"Error: {e}")
+            self.counters["dropped"] += len(records)
+            return
+        self.counters["spooled"] += len(records)
+
+    def replay_spool(self) -> int:
+        """
+        Moves spooled records back onto the queue. Returns the number of records replayed.
+        """
+        if not self.spool_path:
+            return 0
+        with self._spool_lock:
+            if not os.path.exists(self.spool_path):
+                return 0
+            with open(self.spool_path, encoding="utf-8") as spool:
+                lines = [line for line in spool if line.strip()]
+            os.remove(self.spool_path)
+        for line in lines:
+            record = json.loads(line)
+            self.enqueue(record["table_id"], record["fields"], record["base_id"])
+        if lines:
+            print(f"Replaying {len(lines)} spooled Airtable record(s).")
+        return len(lines)
+
+    def stats(self) -> Dict[str, int]:
+        stats = dict(self.counters)
+        stats["pending"] = self._queue.unfinished_tasks
+        return stats
+
+
+_write_queues: Dict[int, AirtableWriteQueue] = {}
+_write_queues_lock = threading.Lock()
+
+
+def get_write_queue(client: Api) -> AirtableWriteQueue:
+    """
+    Returns the process-wide write-behind queue for a client, starting it on first use.
+    """
+    with _write_queues_lock:
+        write_queue = _write_queues.get(id(client))
+        if write_queue is None:
+            write_queue = AirtableWriteQueue(client, spool_path=os.getenv("AIRTABLE_SPOOL_PATH", DEFAULT_SPOOL_PATH))
+            _write_queues[id(client)] = write_queue
+        return write_queue
+
+
+def enqueue_airtable_record(
+    client: Api,
+    table_id: str,
+    data: dict,
+    base_id: str
+) -> None:
+    """
+    Non-blocking counterpart to create_airtable_record: the record is written in the background in batches.
+    """
+    get_write_queue(client).enqueue(table_id, data, base_id)
@@ -0,0 +1,139 @@
+"""
+Local stand-in for the Airtable records API, so the write-behind queue and load tests run without an Airtable base or
+key. Created records are kept in memory per table; an optional latency and failure rate exercise the retry path, and
+an invalid field name makes any request carrying that field fail with a 422, as Airtable does for a bad field value.
+
+    python -m utils.airtable_stub --port 8791 --latency 0.1
+    AIRTABLE_ENDPOINT_URL=http://127.0.0.1:8791 AIRTABLE_API_KEY=stub streamlit run main.py
+"""
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+
+class RecordStore:
+    """
+    Records created per (base id, table id), with request counters.
+    """
+
+    def __init__(self):
+        self.tables: Dict[str, List[dict]] = {}
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.counters = {"requests": 0, "records": 0, "failed": 0, "invalid": 0}
+
+    def create(self, table: str, fields_list: List[dict]) -> List[dict]:
+        created_time = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        with self.lock:
+            records = [
+                {"id": f"rec{next(self._ids):014d}", "createdTime": created_time, "fields": fields}
+                for fields in fields_list
+            ]
+            self.tables.setdefault(table, []).extend(records)
+            self.counters["requests"] += 1
+            self.counters["records"] += len(records)
+        return records
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {**self.counters, "tables": len(self.tables)}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    store: RecordStore = None
+    latency: float = 0.0
+    failure_rate: float = 0.0
+    invalid_field: Optional[str] = None
+
+    def _send_json(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        # /v0/{base id}/{table id}
+        parts = self.path.split("?")[0].strip("/").split("/")
+        if len(parts) != 3 or parts[0] != "v0":
+            self._send_json(404, {"error": "NOT_FOUND"})
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self.latency:
+            time.sleep(self.latency)
+        if self.failure_rate and random.random() < self.failure_rate:
+            with self.store.lock:
+                self.store.counters["failed"] += 1
+            self._send_json(503, {"error": {"type": "SERVICE_UNAVAILABLE", "message": "Unavailable (stub)."}})
+            return
+
+        table = f"{parts[1]}/{parts[2]}"
+        fields_list = [record.get("fields", {}) for record in body["records"]] if "records" in body else [body.get("fields", {})]
+        if self.invalid_field and any(self.invalid_field in fields for fields in fields_list):
+            # Like Airtable, one bad record rejects the whole request
+            with self.store.lock:
+                self.store.counters["invalid"] += 1
+            self._send_json(422, {"error": {"type": "INVALID_VALUE_FOR_COLUMN", "message": f"Field '{self.invalid_field}' is invalid (stub)."}})
+            return
+        if "records" in body:
+            records = self.store.create(table, fields_list)
+            self._send_json(200, {"records": records})
+        else:
+            self._send_json(200, self.store.create(table, fields_list)[0])
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_airtable_stub(
+    port: int = 0,
+    latency: float = 0.0,
+    failure_rate: float = 0.0,
+    host: str = "127.0.0.1",
+    invalid_field: Optional[str] = None
+) -> ThreadingHTTPServer:
+    """
+    Starts the stub on a daemon thread and returns the server; server.server_address gives the bound port and
+    server.store the created records. Latency, failure rate and invalid field can be changed on server.handler while it
+    runs.
+    """
+    handler = type("StubHandler", (_StubHandler,), {
+        "store": RecordStore(),
+        "latency": latency,
+        "failure_rate": failure_rate,
+        "invalid_field": invalid_field
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.store = handler.store
+    server.handler = handler
+    threading.Thread(target=server.serve_forever, name="airtable-stub", daemon=True).start()
+    return server
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Serve a local Airtable records API stub.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8791)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of requests answered with a 503")
+    parser.add_argument("--invalid-field", default=None, help="Answer requests carrying this field with a 422")
+    args = parser.parse_args(argv)
+
+    server = start_airtable_stub(args.port, args.latency, args.failure_rate, args.host, args.invalid_field)
+    print(f"Airtable stub on http://{args.host}:{server.server_address[1]}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
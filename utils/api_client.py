@@ -0,0 +1,107 @@
+import hashlib
+import os
+import threading
+from typing import Optional, Sequence, Tuple
+from urllib.parse import unquote
+import httpx
+from schemas import JobTarget, ResumeInput, ResumeSchema, TargetedResumes
+from utils.pdf_extract import PDFLimitError
+from utils.single_flight import SingleFlight
+
+
+def attachment_file_name(content_disposition: str, default: str = "Resume.pdf") -> str:
+    """
+    File name from a Content-Disposition header: the RFC 5987 filename* when present, otherwise the quoted filename.
+    """
+    params = {}
+    for part in content_disposition.split(";")[1:]:
+        key, _, value = part.strip().partition("=")
+        params[key.strip().lower()] = value.strip()
+    charset, _, encoded = params.get("filename*", "").partition("''")
+    if encoded:
+        try:
+            return unquote(encoded, encoding=charset or "utf-8", errors="strict")
+        except (LookupError, UnicodeDecodeError):
+            pass
+    return params.get("filename", "").strip('"') or default
+
+
+class ResumeAPIClient:
+    """
+    Client for the headless resume API (api/server.py). When RESUME_API_URL is set, the Streamlit screens use it for
+    parsing, generation and rendering so the UI process only handles presentation.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 120.0):
+        self.base_url = base_url.rstrip("/")
+        self._client = httpx.Client(base_url=self.base_url, timeout=timeout)
+        # Streamlit reruns resend the same upload and re-render the same resume; only the first goes over the network
+        self._parsed = SingleFlight(max_results=128)
+        self._rendered = SingleFlight(max_results=128)
+
+    def parse(self, file_bytes: bytes, file_name: str = "resume.pdf") -> ResumeInput:
+        digest = hashlib.sha256(file_bytes).hexdigest()
+        return self._parsed.do(digest, self._parse, file_bytes, file_name)
+
+    def _parse(self, file_bytes: bytes, file_name: str) -> ResumeInput:
+        response = self._client.post("/parse", files={"file": (file_name, file_bytes, "application/pdf")})
+        if response.status_code in (413, 422):
+            raise PDFLimitError(response.json().get("detail", response.text))
+        response.raise_for_status()
+        return ResumeInput.model_validate(response.json())
+
+    def generate(self, resume_input: ResumeInput, sectioned: bool = False) -> ResumeSchema:
+        response = self._client.post(
+            "/generate",
+            params={"mode": "sections" if sectioned else "single"},
+            content=resume_input.model_dump_json(exclude_none=True),
+            headers={"Content-Type": "application/json"}
+        )
+        response.raise_for_status()
+        return ResumeSchema.model_validate_json(response.content)
+
+    def generate_targets(self, resume_input: ResumeInput, targets: Sequence[JobTarget]) -> TargetedResumes:
+        body = {
+            "resume_input": resume_input.model_dump(exclude_none=True),
+            "targets": [target.model_dump() for target in targets]
+        }
+        response = self._client.post("/generate/targets", json=body)
+        response.raise_for_status()
+        return TargetedResumes.model_validate_json(response.content)
+
+    def render(self, resume_data: ResumeSchema, template_name: str = None) -> Tuple[bytes, str]:
+        body = resume_data.model_dump_json()
+        key = (template_name, hashlib.sha256(body.encode("utf-8")).hexdigest())
+        return self._rendered.do(key, self._render, body, template_name)
+
+    def _render(self, body: str, template_name: str) -> Tuple[bytes, str]:
+        response = self._client.post(
+            "/render",
+            params={"template": template_name} if template_name else None,
+            content=body,
+            headers={"Content-Type": "application/json"}
+        )
+        response.raise_for_status()
+        file_name = attachment_file_name(response.headers.get("Content-Disposition", ""))
+        return response.content, file_name
+
+    def close(self) -> None:
+        self._client.close()
+
+
+_client: Optional[ResumeAPIClient] = None
+_client_lock = threading.Lock()
+
+
+def get_api_client() -> Optional[ResumeAPIClient]:
+    """
+    Returns the shared API client if RESUME_API_URL is configured, otherwise None (work runs in-process).
+    """
+    global _client
+    base_url = os.getenv("RESUME_API_URL")
+    if not base_url:
+        return None
+    with _client_lock:
+        if _client is None or _client.base_url != base_url.rstrip("/"):
+            _client = ResumeAPIClient(base_url)
+        return _client
@@ -1,45 +1,28 @@
-BASE_PROMPT = """
+RESUME_PROMPT_INTRO = """
 You are a resume-writing expert, and your task is to create a professional, well-organized, and compelling resume for a {target_job_title} role based on the information provided below. The resume should emphasize relevant skills, experiences, education, and certifications while targeting the job description of a {target_job_title}.
 
-Here is the candidate's information. Consider the notes attached beneath each section.
-Contact Info:
-{name}
-{email}
-{phone_number}
-{linkedin_profile}
-{github_profile}
-NOTE: when presented links, return the URL, not markdown format
+Here is the candidate's information. Consider the notes attached beneath each section."""
 
-Experience:
-{experience}
-NOTE: Take each experience and utilize any quantifiable data to highlight the skills and experiences. When presented without any, do not make any assumptions.
+CONTACT_INFO_NOTE = "NOTE: when presented links, return the URL, not markdown format"
 
-Projects:
-{projects}
+EXPERIENCE_NOTE = "NOTE: Take each experience and utilize any quantifiable data to highlight the skills and experiences. When presented without any, do not make any assumptions."
 
-Education:
-{education}
+RESUME_PROMPT_OUTRO = """Please generate a polished resume. Ensure the resume is formatted professionally, includes sections for a summary, experience, projects, education, skills, and certifications, and presents the information in a concise and impactful way. Additionally, tailor the content to match the target job description."""
 
-Skills:
-{skills}
+# Upper bound on prompt tokens for a resume generation call, format instructions included
+RESUME_PROMPT_TOKEN_BUDGET = 6000
 
-Coursework:
-{coursework}
+# Multi-target generation puts everything shared by the targets first, so providers can reuse the cached prompt prefix
+MULTI_TARGET_PROMPT_INTRO = """
+You are a resume-writing expert, and your task is to create a professional, well-organized, and compelling resume tailored to the target job described at the end, based on the candidate information provided below. The resume should emphasize the skills, experiences, education, and certifications most relevant to that job.
 
-Certifications:
-{certifications}
+Here is the candidate's information. Consider the notes attached beneath each section."""
 
-Involvement:
-{involvement}
+MULTI_TARGET_PROMPT_OUTRO = """Please generate a polished resume. Ensure the resume is formatted professionally, includes sections for a summary, experience, projects, education, skills, and certifications, and presents the information in a concise and impactful way. Tailor the content to match the target job below."""
 
-Summary:
-{summary}
-
-Target Job:
+TARGET_JOB_BLOCK = """Target Job:
 {target_job_title}
-{target_job_description}
-
-Please generate a polished resume. Ensure the resume is formatted professionally, includes sections for a summary, experience, projects, education, skills, and certifications, and presents the information in a concise and impactful way. Additionally, tailor the content to match the target job description. 
+{target_job_description}"""
 
-{format_instrutions}
-"""
\ No newline at end of file
+# Prompt tokens held back from the candidate block for the per-target block at the end of the prompt
+TARGET_BLOCK_TOKEN_RESERVE = 600
@@ -0,0 +1,74 @@
+import re
+import threading
+from typing import Dict, Iterable, Optional
+
+
+CONTACT_FIELDS = ("email", "phone_number", "linkedin_profile", "github_profile")
+
+_EMAIL = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+_PHONE = re.compile(r"(?<![\d/])(?:\+?\d{1,2}[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}(?![\d/])")
+_LINKEDIN = re.compile(r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/in/[A-Za-z0-9_%-]+/?", re.IGNORECASE)
+# Profile URLs only (github.com/<user>), not links to individual repositories
+_GITHUB = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[A-Za-z0-9-]+(?![A-Za-z0-9-])(?!/[A-Za-z0-9])/?", re.IGNORECASE)
+
+_counters = {field: {"local": 0, "llm": 0} for field in CONTACT_FIELDS}
+_counters_lock = threading.Lock()
+
+
+def _as_url(match: str) -> str:
+    return match if match.lower().startswith("http") else f"https://{match}"
+
+
+def _first(pattern: re.Pattern, *sources: Iterable[str]) -> Optional[str]:
+    for source in sources:
+        for text in source:
+            match = pattern.search(text)
+            if match:
+                return match.group(0)
+    return None
+
+
+def extract_contact_fields(text: str, links: Iterable[str] = ()) -> Dict[str, str]:
+    """
+    Finds email, phone number, LinkedIn and GitHub profiles in resume text and PDF link targets with regular
+    expressions. Only fields that were found are returned; link annotations win over visible text because resumes often
+    label links "LinkedIn" or "GitHub" without printing the URL.
+    """
+    links = list(links)
+    mailto = [link[len("mailto:"):] for link in links if link.lower().startswith("mailto:")]
+    tel = [link[len("tel:"):] for link in links if link.lower().startswith("tel:")]
+    web = [link for link in links if not link.lower().startswith(("mailto:", "tel:"))]
+
+    fields = {}
+    email = _first(_EMAIL, mailto, [text])
+    if email:
+        fields["email"] = email
+    phone = _first(_PHONE, tel, [text])
+    if phone:
+        fields["phone_number"] = phone.strip()
+    linkedin = _first(_LINKEDIN, web, [text])
+    if linkedin:
+        fields["linkedin_profile"] = _as_url(linkedin)
+    github = _first(_GITHUB, web, [text])
+    if github:
+        fields["github_profile"] = _as_url(github)
+    return fields
+
+
+def record_contact_resolution(local_fields: Iterable[str]) -> None:
+    """
+    Counts, per contact field, whether the local pass resolved it or it was left to the LLM.
+    """
+    local_fields = set(local_fields)
+    with _counters_lock:
+        for field in CONTACT_FIELDS:
+            _counters[field]["local" if field in local_fields else "llm"] += 1
+
+
+def contact_extraction_stats() -> Dict[str, Dict[str, float]]:
+    with _counters_lock:
+        stats = {}
+        for field, counts in _counters.items():
+            total = counts["local"] + counts["llm"]
+            stats[field] = {**counts, "local_rate": counts["local"] / total if total else 0.0}
+        return stats
@@ -0,0 +1,155 @@
+import asyncio
+import hashlib
+import json
+import re
+import time
+from typing import Any, Dict, Iterator, List, Optional
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+_SCHEMA_BLOCK = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _prompt_text(messages: List[BaseMessage]) -> str:
+    return "\n".join(str(message.content) for message in messages)
+
+
+def _extract_schema(prompt: str) -> Optional[Dict[str, Any]]:
+    """
+    Finds the JSON schema embedded by PydanticOutputParser's format instructions, if any.
+    """
+    for block in reversed(_SCHEMA_BLOCK.findall(prompt)):
+        try:
+            schema = json.loads(block)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(schema, dict) and "properties" in schema:
+            return schema
+    return None
+
+
+class _SchemaFaker:
+    def __init__(self, defs: Dict[str, Any], seed: str, list_size: int):
+        self.defs = defs
+        self.seed = seed
+        self.list_size = list_size
+
+    def _resolve(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        ref = schema.get("$ref")
+        if ref:
+            return self.defs.get(ref.split("/")[-1], {})
+        return schema
+
+    def build(self, schema: Dict[str, Any], name: str) -> Any:
+        schema = self._resolve(schema)
+        for option in schema.get("anyOf", []):
+            if option.get("type") != "null":
+                return self.build(option, name)
+        if "properties" in schema:
+            return {key: self.build(value, key) for key, value in schema["properties"].items()}
+
+        kind = schema.get("type", "string")
+        if kind == "array":
+            return [self.build(schema.get("items", {}), f"{name} {i + 1}") for i in range(self.list_size)]
+        if kind in ("integer", "number"):
+            return int(self.seed[:4], 16) % 100
+        if kind == "boolean":
+            return True
+        label = name.replace("_", " ").strip().capitalize()
+        return f"{label} {self.seed[:6]}"
+
+
+class FakeResumeChatModel(BaseChatModel):
+    """
+    Deterministic, offline chat model for tests, benchmarks and batch runs. It reads the JSON schema out of the prompt's
+    format instructions and answers with a schema-shaped JSON object derived from a hash of the prompt, so the same
+    prompt always yields the same response. An optional latency simulates network time.
+    """
+
+    latency: float = 0.0
+    list_size: int = 2
+    chunk_size: int = 64
+    model_name: str = "fake-resume-model"
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-resume-chat-model"
+
+    def _respond(self, messages: List[BaseMessage]) -> AIMessage:
+        prompt = _prompt_text(messages)
+        seed = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        schema = _extract_schema(prompt)
+        data = _SchemaFaker(schema.get("$defs", {}), seed, self.list_size).build(schema, "value") if schema else {}
+        content = json.dumps(data)
+        input_tokens = _estimate_tokens(prompt)
+        output_tokens = _estimate_tokens(content)
+        return AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens
+            },
+            response_metadata={"model_name": self.model_name}
+        )
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        message = self._respond(messages)
+        content = message.content
+        chunks = [content[i:i + self.chunk_size] for i in range(0, len(content), self.chunk_size)] or [""]
+        delay = self.latency / len(chunks) if self.latency else 0
+        for i, text in enumerate(chunks):
+            if delay:
+                time.sleep(delay)
+            # Attach usage to the final chunk, as OpenAI does with stream_usage enabled
+            usage = message.usage_metadata if i == len(chunks) - 1 else None
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text, usage_metadata=usage))
+            if run_manager:
+                run_manager.on_llm_new_token(text, chunk=chunk)
+            yield chunk
+
+
+def fake_llm_factory(latency: float = 0.0, list_size: int = 2):
+    """
+    Returns an LLM factory for ChainRegistry.set_llm_factory that swaps every chat model for FakeResumeChatModel.
+    """
+    def factory(model_name: str, temperature: float, **model_kwargs) -> BaseChatModel:
+        return FakeResumeChatModel(latency=latency, list_size=list_size, model_name=f"fake-{model_name}")
+    # Keeps fake results apart from real ones in the result caches; latency does not change the output
+    factory.cache_scope = f"fake(list_size={list_size})"
+    return factory
@@ -0,0 +1,155 @@
+import hashlib
+from html import escape
+from typing import Callable, Dict, List
+from schemas import ResumeSchema
+from utils.metrics import track
+from utils.pdf_templates import DEFAULT_TEMPLATE, TemplateConfig, get_template
+from utils.single_flight import SingleFlight
+
+
+HtmlLayout = Callable[[ResumeSchema], List[str]]
+
+# Letter width and ReportLab's default body font, so the preview wraps close to the PDF
+PAGE_WIDTH_IN = 8.5
+FONT_FAMILY = "Helvetica, Arial, sans-serif"
+
+
+def _heading(text: str) -> str:
+    return f'<div class="h"><b>{escape(text)}</b></div>'
+
+
+def _line(text: str) -> str:
+    return f'<div class="p">{escape(text)}</div>'
+
+
+def _link(url: str, label: str) -> str:
+    return f'<a href="{escape(url, quote=True)}" target="_blank">{escape(label)}</a>'
+
+
+def _gap() -> str:
+    return '<div class="gap"></div>'
+
+
+def _header(resume_data: ResumeSchema) -> List[str]:
+    contact_info = resume_data.contact_info
+    contact = " | ".join([
+        escape(contact_info.location),
+        escape(contact_info.phone_number),
+        escape(contact_info.email),
+        _link(contact_info.linkedin_profile, "LinkedIn"),
+        _link(contact_info.github_profile, "GitHub")
+    ])
+    return [_heading(resume_data.name), f'<div class="p">{contact}</div>', _gap()]
+
+
+def _summary(resume_data: ResumeSchema) -> List[str]:
+    if not resume_data.summary:
+        return []
+    return [_heading("Summary"), _line(resume_data.summary), _gap()]
+
+
+def _experience(resume_data: ResumeSchema) -> List[str]:
+    parts = [_heading("Experience")]
+    for job in resume_data.experience:
+        parts.append(_line(f"{job.job_title} - {job.company} ({job.location})"))
+        parts.append(_line(f"{job.start_date} - {job.end_date or 'Present'}"))
+        parts.extend(_line(f"• {bullet}") for bullet in job.description)
+        parts.append(_gap())
+    return parts
+
+
+def _projects(resume_data: ResumeSchema) -> List[str]:
+    parts = [_heading("Projects")]
+    for project in resume_data.projects:
+        parts.append(_line(project.title))
+        parts.append(_line(project.description))
+        if project.technologies:
+            parts.append(_line(f"Technologies: {', '.join(project.technologies)}"))
+        if project.github_link:
+            parts.append(f'<div class="p">{_link(project.github_link, "GitHub Link")}</div>')
+        parts.append(_gap())
+    return parts
+
+
+def _education(resume_data: ResumeSchema) -> List[str]:
+    parts = [_heading("Education")]
+    for edu in resume_data.education:
+        parts.append(_line(f"{edu.degree} - {edu.school} ({edu.location})"))
+        parts.append(_line(f"Graduation: {edu.graduation_date}"))
+        parts.append(_gap())
+    return parts
+
+
+def _certificates(resume_data: ResumeSchema) -> List[str]:
+    parts = [_heading("Certificates")]
+    for cert in resume_data.certificates:
+        parts.append(_line(f"{cert.name} - {cert.date}"))
+        parts.append(_gap())
+    return parts
+
+
+def _involvement(resume_data: ResumeSchema) -> List[str]:
+    parts = [_heading("Involvement")]
+    for inv in resume_data.involvement:
+        parts.append(_line(f"{inv.role} - {inv.organization}"))
+        parts.append(_line(inv.description))
+        parts.append(_gap())
+    return parts
+
+
+def _skills(resume_data: ResumeSchema) -> List[str]:
+    return [_heading("Skills"), _line(", ".join(resume_data.skills.all_skills)), _gap()]
+
+
+# Mirrors utils.pdf_templates.SECTION_LAYOUTS; keep the two in step when a section changes
+HTML_SECTION_LAYOUTS: Dict[str, HtmlLayout] = {
+    "header": _header,
+    "summary": _summary,
+    "experience": _experience,
+    "projects": _projects,
+    "education": _education,
+    "certificates": _certificates,
+    "involvement": _involvement,
+    "skills": _skills
+}
+
+
+def _style(config: TemplateConfig) -> str:
+    left, right, top, bottom = config.margins_cm
+    return (
+        f".resume{{max-width:{PAGE_WIDTH_IN}in;box-sizing:border-box;padding:{top}cm {right}cm {bottom}cm {left}cm;"
+        f"background:#fff;color:{config.text_color};font-family:{FONT_FAMILY};}}"
+        f".resume .h{{font-size:{config.heading_size}pt;line-height:{config.heading_leading}pt;}}"
+        f".resume .p{{font-size:{config.body_size}pt;line-height:{config.body_leading}pt;}}"
+        f".resume .gap{{height:{config.section_gap}pt;}}"
+        f".resume a{{color:inherit;}}"
+    )
+
+
+def _render_html(config: TemplateConfig, resume_data: ResumeSchema) -> str:
+    with track("html_layout") as span:
+        parts = [f"<style>{_style(config)}</style>", '<div class="resume">']
+        for section in config.sections:
+            parts.extend(HTML_SECTION_LAYOUTS[section](resume_data))
+        parts.append("</div>")
+        html = "".join(parts)
+        span.payload_bytes = len(html)
+        return html
+
+
+# Rendered previews keyed by (template fingerprint, resume hash), like the rendered PDFs
+_rendered_html = SingleFlight(max_results=256)
+
+
+def render_resume_html(resume_data: ResumeSchema, template_name: str = DEFAULT_TEMPLATE) -> str:
+    """
+    Renders a resume as a self-contained HTML fragment laid out like the PDF template of the same name: same section
+    order, colors, font sizes, spacing and margins. Meant for the live preview, where building the PDF is not needed.
+    """
+    template = get_template(template_name)
+    resume_hash = hashlib.sha256(resume_data.model_dump_json().encode("utf-8")).hexdigest()
+    return _rendered_html.do((template.fingerprint, resume_hash), _render_html, template.config, resume_data)
+
+
+def clear_html_cache() -> None:
+    _rendered_html.clear()
@@ -0,0 +1,262 @@
+import hashlib
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+from utils.metrics import metrics
+
+
+class JobQueueFull(RuntimeError):
+    """
+    Raised when a job is submitted while the executor already has max_queued jobs waiting for a worker.
+    """
+
+
+class JobHandle:
+    """
+    A submitted job. The UI keeps the handle (or its id) and polls done()/events instead of blocking on the work; every
+    caller that submitted the same key shares the same handle.
+    """
+
+    def __init__(self, job_id: str, kind: str, key: Hashable):
+        self.id = job_id
+        self.kind = kind
+        self.key = key
+        self.future: Future = Future()
+        self.events: List[Any] = []
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.subscribers = 1
+
+    @property
+    def status(self) -> str:
+        if self.future.done():
+            return "failed" if self.future.exception() is not None else "done"
+        return "running" if self.started_at is not None else "queued"
+
+    def emit(self, event: Any) -> None:
+        """
+        Publishes a progress event (e.g. a completed resume section) for pollers.
+        """
+        self.events.append(event)
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout: float = None) -> Any:
+        return self.future.result(timeout)
+
+    def timings(self) -> Dict[str, Optional[float]]:
+        started = self.started_at or time.time()
+        return {
+            "queued_s": round(started - self.submitted_at, 4),
+            "run_s": round(self.finished_at - self.started_at, 4) if self.finished_at and self.started_at else None
+        }
+
+
+class JobExecutor:
+    """
+    Shared worker pool for LLM-bound jobs (resume parsing and generation). Jobs are keyed by their inputs: while a job
+    is queued or running, submitting the same key returns the existing handle instead of starting a second
+    computation, and finished jobs stay available by key and id for a while so reruns can pick up the result.
+    Failed jobs are not kept, so the next submit retries.
+    """
+
+    def __init__(self, max_workers: int = 8, max_queued: int = 256, max_finished: int = 256):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.max_finished = max_finished
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._active: Dict[Hashable, JobHandle] = {}
+        self._finished: "OrderedDict[Hashable, JobHandle]" = OrderedDict()
+        self._by_id: Dict[str, JobHandle] = {}
+        self.counters = {
+            "submitted": 0,
+            "deduplicated": 0,
+            "reused": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0
+        }
+
+    def submit(self, kind: str, key: Hashable, fn: Callable[..., Any], *args, with_handle: bool = False) -> JobHandle:
+        """
+        Queues fn(*args) unless an identical job (same kind and key) is in flight or recently finished. With
+        with_handle=True the job is called as fn(handle, *args) so it can emit progress events.
+        """
+        key = (kind, key)
+        with self._lock:
+            handle = self._active.get(key)
+            if handle is not None:
+                handle.subscribers += 1
+                self.counters["deduplicated"] += 1
+                return handle
+            handle = self._finished.get(key)
+            if handle is not None:
+                self._finished.move_to_end(key)
+                self.counters["reused"] += 1
+                return handle
+            if self._queued() >= self.max_queued:
+                self.counters["rejected"] += 1
+                raise JobQueueFull(f"{self._queued()} jobs are already waiting; try again shortly.")
+
+            handle = JobHandle(f"{kind}-{next(self._ids)}", kind, key)
+            self._active[key] = handle
+            self._by_id[handle.id] = handle
+            self.counters["submitted"] += 1
+
+        self._pool.submit(self._run, handle, fn, args, with_handle)
+        return handle
+
+    def _queued(self) -> int:
+        return sum(1 for handle in self._active.values() if handle.started_at is None)
+
+    def _run(self, handle: JobHandle, fn: Callable[..., Any], args: Tuple[Any, ...], with_handle: bool) -> None:
+        handle.started_at = time.time()
+        metrics.observe(f"job_wait:{handle.kind}", handle.started_at - handle.submitted_at)
+        try:
+            result = fn(handle, *args) if with_handle else fn(*args)
+        except BaseException as e:
+            self._finish(handle, error=True)
+            handle.future.set_exception(e)
+            return
+        self._finish(handle, error=False)
+        handle.future.set_result(result)
+
+    def _finish(self, handle: JobHandle, error: bool) -> None:
+        handle.finished_at = time.time()
+        metrics.observe(f"job:{handle.kind}", handle.finished_at - handle.started_at, error)
+        with self._lock:
+            self._active.pop(handle.key, None)
+            if error:
+                self.counters["failed"] += 1
+                self._by_id.pop(handle.id, None)
+                return
+            self.counters["completed"] += 1
+            self._finished[handle.key] = handle
+            while len(self._finished) > self.max_finished:
+                _, evicted = self._finished.popitem(last=False)
+                self._by_id.pop(evicted.id, None)
+
+    def get(self, job_id: str) -> Optional[JobHandle]:
+        with self._lock:
+            return self._by_id.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            active = list(self._active.values())
+            recent = list(self._finished.values())[-10:]
+            return {
+                **self.counters,
+                "max_workers": self.max_workers,
+                "max_queued": self.max_queued,
+                "queued": sum(1 for handle in active if handle.started_at is None),
+                "running": sum(1 for handle in active if handle.started_at is not None),
+                "recent": [{"id": handle.id, "status": handle.status, **handle.timings()} for handle in recent]
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+job_executor = JobExecutor(
+    max_workers=int(os.getenv("JOB_MAX_WORKERS", 8)),
+    max_queued=int(os.getenv("JOB_MAX_QUEUED", 256))
+)
+
+
+def iter_job_events(handle: JobHandle, poll_interval: float = 0.1, timeout: float = None) -> Iterator[Any]:
+    """
+    Yields a job's progress events as they are emitted, polling the handle, and returns once the job is done. Raises
+    the job's exception if it failed, or TimeoutError if it is not done within timeout seconds.
+    """
+    deadline = time.time() + timeout if timeout else None
+    shown = 0
+    while True:
+        finished = handle.done()
+        while shown < len(handle.events):
+            yield handle.events[shown]
+            shown += 1
+        if finished:
+            handle.result()
+            return
+        if deadline and time.time() > deadline:
+            raise FutureTimeoutError(f"Job {handle.id} did not finish within {timeout}s.")
+        time.sleep(poll_interval)
+
+
+def submit_parse_job(file_bytes: bytes) -> JobHandle:
+    """
+    Parses a resume PDF on the shared pool; identical uploads share one job.
+    """
+    from utils.resume_reader import parse_resume_pdf
+
+    digest = hashlib.sha256(file_bytes).hexdigest()
+    return job_executor.submit("parse", digest, parse_resume_pdf, file_bytes)
+
+
+def _generate_with_events(handle: JobHandle, resume_input, sectioned: bool):
+    from utils.ai import RESUME_COMPLETE, stream_resume_chain
+    from utils.section_chains import iter_resume_sections
+
+    events = iter_resume_sections(resume_input) if sectioned else stream_resume_chain(resume_input)
+    for section, value in events:
+        if section == RESUME_COMPLETE:
+            return value
+        handle.emit((section, value))
+
+
+def submit_generation_job(resume_input, sectioned: bool = False) -> JobHandle:
+    """
+    Generates a resume on the shared pool, emitting (section, value) events as sections complete. The job's result is
+    the validated ResumeSchema; identical inputs share one job.
+    """
+    digest = hashlib.sha256(resume_input.model_dump_json().encode("utf-8")).hexdigest()
+    return job_executor.submit("generate", (digest, sectioned), _generate_with_events, resume_input, sectioned, with_handle=True)
+
+
+def _generate_targets_with_events(handle: JobHandle, resume_input, targets):
+    from schemas import TargetedResumes
+    from utils.multi_target import iter_targeted_resumes
+
+    results = {}
+    for index, result in iter_targeted_resumes(resume_input, targets):
+        results[index] = result
+        handle.emit((index, result))
+    return TargetedResumes(resumes=[results[index] for index in range(len(targets))])
+
+
+def submit_multi_target_job(resume_input, targets) -> JobHandle:
+    """
+    Generates one tailored resume per target on the shared pool, emitting (target index, TargetedResume) events as
+    targets finish. The job's result is a TargetedResumes in target order.
+    """
+    body = resume_input.model_dump_json() + "".join(target.model_dump_json() for target in targets)
+    digest = hashlib.sha256(body.encode("utf-8")).hexdigest()
+    return job_executor.submit("multi_target", digest, _generate_targets_with_events, resume_input, list(targets), with_handle=True)
+
+
+def _render_pdf(resume_data, template_name: str) -> bytes:
+    from utils.api_client import get_api_client
+    from utils.pdf_templates import render_resume_pdf
+
+    api_client = get_api_client()
+    if api_client is not None:
+        return api_client.render(resume_data, template_name)[0]
+    return render_resume_pdf(resume_data, template_name)
+
+
+def submit_render_job(resume_data, template_name: str) -> JobHandle:
+    """
+    Builds a resume PDF on the shared pool (through the API when one is configured); the same resume and template
+    share one job.
+    """
+    digest = hashlib.sha256(resume_data.model_dump_json().encode("utf-8")).hexdigest()
+    return job_executor.submit("render_pdf", (digest, template_name), _render_pdf, resume_data, template_name)
@@ -0,0 +1,246 @@
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from utils.token_accounting import count_tokens
+
+
+# Bump when tokenization, weighting or the condensed format changes; it is part of the resume prompt fingerprint
+INDEX_VERSION = 1
+
+# Descriptions shorter than this are passed to the prompt as written
+CONDENSE_MIN_CHARS = 800
+REQUIREMENTS_TOKEN_BUDGET = 300
+MAX_KEYWORDS = 30
+
+STOPWORDS = frozenset("""
+    a about above after again all also am an and any are as at be because been being below between both but by can
+    could did do does doing down during each etc few for from further had has have having he her here hers him his how
+    i if in into is it its itself just me more most my no nor not of off on once only or other our ours out over own
+    per same she should so some such than that the their theirs them then there these they this those through to too
+    under until up very via was we were what when where which while who whom why will with within without would you
+    your yours
+    ability able across additional along applicant applicants apply based best candidate candidates including closely
+    company daily day demonstrated desired environment excellent experience experienced familiarity familiar good great
+    help highly ideal ideally include join knowledge level like looking make must new non one opportunity plus position
+    preferred prior proficiency proficient proven related required requirement requirements responsibilities
+    responsible role seeking skill skills solid strong successful team teams understanding using well work working
+    world year years
+""".split())
+
+# Phrases that mark posting boilerplate rather than job requirements
+BOILERPLATE_CUES = (
+    "equal opportunity", "equal employment", "without regard to", "benefits", "401k", "401(k)", "paid time off", "pto",
+    "salary", "compensation", "pay range", "health insurance", "dental", "vision insurance", "about us", "who we are",
+    "our mission", "we offer", "perks", "accommodation", "background check", "e-verify", "click apply", "to apply",
+    "privacy", "veteran status", "sexual orientation", "gender identity"
+)
+
+# Phrases that mark a line as a requirement
+REQUIREMENT_CUES = (
+    "experience with", "experience in", "knowledge of", "proficien", "familiar", "required", "requirement", "must",
+    "degree", "years of", "ability to", "skills", "expertise", "understanding of", "hands-on", "background in",
+    "you will", "you'll", "responsib", "qualification", "preferred", "bonus", "nice to have"
+)
+
+# Known skill terms weigh more than other keywords
+SKILL_VOCABULARY = frozenset("""
+    python java javascript typescript go golang rust c c++ c# ruby php scala kotlin swift sql nosql r matlab bash
+    react angular vue node.js django flask fastapi spring rails .net graphql rest grpc html css tailwind
+    aws azure gcp docker kubernetes terraform ansible jenkins ci/cd git linux unix kafka spark hadoop airflow dbt
+    snowflake redshift bigquery postgresql postgres mysql mongodb redis elasticsearch tableau looker excel
+    pandas numpy pytorch tensorflow scikit-learn langchain llm nlp etl microservices agile scrum jira figma
+    security networking devops mlops observability testing
+""".split())
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9]")
+# Bigrams never span these, so "Docker, Kubernetes" does not become a phrase
+_CLAUSE_SPLIT = re.compile(r"[,;:()!?|\n]|\.(?:\s|$)")
+_SENTENCE_SPLIT = re.compile(r"\n+|(?<=[.!?;])\s+(?=[A-Z0-9])")
+_BULLET = re.compile(r"^\s*(?:[-*•·▪>]+|\d+[.)])\s*")
+
+
+def _stem(token: str) -> str:
+    if len(token) <= 3 or token in SKILL_VOCABULARY:
+        return token
+    if token.endswith("ies"):
+        return f"{token[:-3]}y"
+    if token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+_STOPWORDS = STOPWORDS | {_stem(word) for word in STOPWORDS}
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercased word tokens, keeping technology names such as c++, c#, node.js and ci/cd intact.
+    """
+    return [_stem(token) for token in _TOKEN.findall((text or "").lower())]
+
+
+def extract_terms(text: str) -> List[str]:
+    """
+    Unigrams and bigrams of non-stopword tokens, in order of appearance.
+    """
+    terms = []
+    for clause in _CLAUSE_SPLIT.split(text or ""):
+        tokens = [None if token in _STOPWORDS or token.isdigit() else token for token in tokenize(clause)]
+        for i, token in enumerate(tokens):
+            if token is None:
+                continue
+            terms.append(token)
+            if i + 1 < len(tokens) and tokens[i + 1] is not None:
+                terms.append(f"{token} {tokens[i + 1]}")
+    return terms
+
+
+def split_sentences(text: str) -> List[str]:
+    # Postings often repeat themselves; each sentence is kept once
+    sentences = (_BULLET.sub("", part).strip() for part in _SENTENCE_SPLIT.split(text or ""))
+    return list(dict.fromkeys(sentence for sentence in sentences if len(sentence) > 2))
+
+
+def _is_boilerplate(sentence: str) -> bool:
+    lowered = sentence.lower()
+    return any(cue in lowered for cue in BOILERPLATE_CUES)
+
+
+def _has_requirement_cue(sentence: str) -> bool:
+    lowered = sentence.lower()
+    return any(cue in lowered for cue in REQUIREMENT_CUES)
+
+
+@dataclass(frozen=True)
+class JobDescriptionIndex:
+    """
+    TF-IDF keyword index of one job description. Each sentence counts as a document, so terms repeated throughout the
+    posting (the company name, boilerplate) score low and distinctive requirements score high; known skills get a
+    boost. keywords and weights are aligned, highest weight first.
+    """
+    keywords: Tuple[str, ...]
+    weights: np.ndarray
+    requirements: Tuple[str, ...]
+
+    def presence(self, text: str) -> np.ndarray:
+        terms = set(extract_terms(text))
+        return np.fromiter((keyword in terms for keyword in self.keywords), dtype=bool, count=len(self.keywords))
+
+    def match_score(self, text: str) -> float:
+        """
+        Weighted share of the job's keywords that appear in the text, from 0 to 1.
+        """
+        if not self.keywords:
+            return 0.0
+        return float(self.weights @ self.presence(text) / self.weights.sum())
+
+    def coverage(self, text: str) -> Dict[str, Any]:
+        present = self.presence(text)
+        return {
+            "score": round(self.match_score(text), 3),
+            "covered": [keyword for keyword, hit in zip(self.keywords, present) if hit],
+            "missing": [keyword for keyword, hit in zip(self.keywords, present) if not hit]
+        }
+
+    def condensed(self, max_keywords: int = 20) -> str:
+        lines = ["Key requirements:"]
+        lines.extend(f"- {requirement}" for requirement in self.requirements)
+        if self.keywords:
+            lines.append(f"Keywords: {', '.join(self.keywords[:max_keywords])}")
+        return "\n".join(lines)
+
+
+def _select_requirements(sentences: List[str], weights: Dict[str, float], token_budget: int) -> Tuple[str, ...]:
+    scored = []
+    for position, sentence in enumerate(sentences):
+        terms = extract_terms(sentence)
+        if not terms:
+            continue
+        score = sum(weights.get(term, 0.0) for term in set(terms)) / math.sqrt(len(terms))
+        if _has_requirement_cue(sentence):
+            score *= 1.5
+        scored.append((score, position, sentence))
+
+    # Highest-scoring sentences that fit the budget, restored to posting order
+    chosen, used = [], 0
+    for score, position, sentence in sorted(scored, reverse=True):
+        tokens = count_tokens(sentence) + 2
+        if used + tokens > token_budget:
+            continue
+        chosen.append((position, sentence))
+        used += tokens
+    return tuple(sentence for _, sentence in sorted(chosen))
+
+
+@lru_cache(maxsize=256)
+def job_description_index(
+    description: str,
+    max_keywords: int = MAX_KEYWORDS,
+    token_budget: int = REQUIREMENTS_TOKEN_BUDGET
+) -> JobDescriptionIndex:
+    """
+    Builds (once per distinct description) the keyword index and condensed requirement list of a job description.
+    """
+    sentences = [sentence for sentence in split_sentences(description) if not _is_boilerplate(sentence)]
+    documents = [set(extract_terms(sentence)) for sentence in sentences]
+    counts = Counter(term for sentence in sentences for term in extract_terms(sentence))
+    if not counts:
+        return JobDescriptionIndex((), np.zeros(0), ())
+
+    vocabulary = list(counts)
+    tf = np.array([counts[term] for term in vocabulary], dtype=float)
+    df = np.array([sum(term in document for document in documents) for term in vocabulary], dtype=float)
+    idf = np.log((1 + len(documents)) / (1 + df)) + 1
+    boost = np.array([2.0 if all(part in SKILL_VOCABULARY for part in term.split()) else 1.0 for term in vocabulary])
+    scores = np.log1p(tf) * idf * boost
+
+    order = np.argsort(-scores, kind="stable")[:max_keywords]
+    weights = {term: float(score) for term, score in zip(vocabulary, scores)}
+    return JobDescriptionIndex(
+        keywords=tuple(vocabulary[i] for i in order),
+        weights=scores[order],
+        requirements=_select_requirements(sentences, weights, token_budget)
+    )
+
+
+def condense_job_description(description: Optional[str], min_chars: int = CONDENSE_MIN_CHARS) -> str:
+    """
+    Replaces a long job description with its requirement sentences and top keywords; short ones are returned as is.
+    """
+    if not description or len(description) < min_chars:
+        return description or ""
+    index = job_description_index(description)
+    if not index.requirements:
+        return description
+    return index.condensed()
+
+
+def _text_values(value: Any) -> Iterable[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _text_values(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _text_values(item)
+
+
+def candidate_match_score(job_description: str, resume_input: Dict[str, Any]) -> float:
+    """
+    How well the candidate's stated skills and experience cover the job's keywords, from 0 to 1.
+    """
+    text = "\n".join(resume_input.get(name) or "" for name in ("skills", "experience", "projects", "certifications"))
+    return job_description_index(job_description).match_score(text)
+
+
+def resume_keyword_coverage(job_description: str, resume_data) -> Dict[str, Any]:
+    """
+    Which of the job description's keywords a generated ResumeSchema covers, computed locally from the same index.
+    """
+    content = resume_data.model_dump(exclude={"target_job_title", "target_job_description", "contact_info"})
+    return job_description_index(job_description).coverage("\n".join(_text_values(content)))
@@ -0,0 +1,223 @@
+"""
+Record/replay layer for chat model calls, for a deterministic, network-free dev loop and CI.
+
+In record mode every call whose fingerprint is not on the cassette goes to the real model and the response is appended
+to the cassette (a JSONL file); calls already on it are served from it. In replay mode only the cassette is used, no
+model is created (so no API key is needed) and a call that is not on it raises CassetteMiss. While a cassette is set,
+the result, similarity and section caches are bypassed, so every call reaches it whatever is cached locally.
+
+    LLM_CASSETTE_MODE=record streamlit run main.py
+    LLM_CASSETTE_MODE=replay LLM_CASSETTE_PATH=cassettes/dev.jsonl streamlit run main.py
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import ConfigDict
+
+
+DEFAULT_CASSETTE_PATH = os.path.join("cassettes", "llm_cassette.jsonl")
+RECORD = "record"
+REPLAY = "replay"
+# Replayed streams are cut into chunks of this many characters
+REPLAY_CHUNK_SIZE = 64
+
+
+class CassetteMiss(LookupError):
+    """
+    Raised in replay mode for a call that was never recorded: the prompt, model or parameters changed since recording.
+    """
+
+
+def request_fingerprint(
+    model_name: str,
+    temperature: float,
+    model_kwargs: Dict[str, Any],
+    messages: List[BaseMessage],
+    stop: Optional[List[str]] = None
+) -> str:
+    body = json.dumps(
+        {
+            "model": model_name,
+            "temperature": temperature,
+            "model_kwargs": model_kwargs,
+            "messages": [{"type": message.type, "content": message.content} for message in messages],
+            "stop": stop
+        },
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """
+    Recorded responses keyed by request fingerprint, loaded from and appended to a JSONL file.
+    """
+
+    def __init__(self, path: str = DEFAULT_CASSETTE_PATH, mode: str = REPLAY):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode '{mode}'; expected '{RECORD}' or '{REPLAY}'.")
+        self.path = path
+        self.mode = mode
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "recorded": 0}
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            if self.mode == REPLAY:
+                print(f"No LLM cassette at {self.path}; every call will miss. Record one with LLM_CASSETTE_MODE=record.")
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries[entry["key"]] = entry
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            self.counters["hits" if entry is not None else "misses"] += 1
+            return entry
+
+    def miss(self, key: str, model_name: str) -> CassetteMiss:
+        return CassetteMiss(
+            f"No recorded response for this {model_name} call (fingerprint {key[:12]}) in {self.path}. "
+            f"The prompt or parameters changed since recording; re-record with LLM_CASSETTE_MODE=record."
+        )
+
+    def record(self, key: str, model_name: str, message: AIMessage) -> None:
+        entry = {
+            "key": key,
+            "model": model_name,
+            "content": message.content,
+            "usage_metadata": message.usage_metadata,
+            "response_metadata": message.response_metadata
+        }
+        with self._lock:
+            self._entries[key] = entry
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, default=str) + "\n")
+            self.counters["recorded"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.counters, "mode": self.mode, "path": self.path, "entries": len(self._entries)}
+
+
+def _replayed_message(entry: Dict[str, Any]) -> AIMessage:
+    return AIMessage(
+        content=entry["content"],
+        usage_metadata=entry.get("usage_metadata"),
+        response_metadata=entry.get("response_metadata") or {}
+    )
+
+
+class CassetteChatModel(BaseChatModel):
+    """
+    Serves a chat model's calls from a cassette, calling (and recording) the wrapped model only in record mode.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    inner: Optional[BaseChatModel] = None
+    cassette: Any = None
+    model_name: str
+    temperature: float = 0
+    model_kwargs: Dict[str, Any] = {}
+
+    @property
+    def _llm_type(self) -> str:
+        return f"cassette-{self.inner._llm_type}" if self.inner is not None else "cassette"
+
+    def _lookup(self, messages: List[BaseMessage], stop: Optional[List[str]]):
+        key = request_fingerprint(self.model_name, self.temperature, self.model_kwargs, messages, stop)
+        entry = self.cassette.get(key)
+        if entry is None and (self.cassette.mode == REPLAY or self.inner is None):
+            raise self.cassette.miss(key, self.model_name)
+        return key, entry
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        key, entry = self._lookup(messages, stop)
+        if entry is not None:
+            return ChatResult(generations=[ChatGeneration(message=_replayed_message(entry))])
+        result = self.inner._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        self.cassette.record(key, self.model_name, result.generations[0].message)
+        return result
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        key, entry = self._lookup(messages, stop)
+        if entry is not None:
+            return ChatResult(generations=[ChatGeneration(message=_replayed_message(entry))])
+        result = await self.inner._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        self.cassette.record(key, self.model_name, result.generations[0].message)
+        return result
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        key, entry = self._lookup(messages, stop)
+        if entry is not None:
+            message = _replayed_message(entry)
+            content = message.content
+            pieces = [content[i:i + REPLAY_CHUNK_SIZE] for i in range(0, len(content), REPLAY_CHUNK_SIZE)] or [""]
+            for i, text in enumerate(pieces):
+                last = i == len(pieces) - 1
+                chunk = ChatGenerationChunk(message=AIMessageChunk(
+                    content=text,
+                    usage_metadata=message.usage_metadata if last else None,
+                    response_metadata=message.response_metadata if last else {}
+                ))
+                if run_manager:
+                    run_manager.on_llm_new_token(text, chunk=chunk)
+                yield chunk
+            return
+
+        combined = None
+        for chunk in self.inner._stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+            combined = chunk if combined is None else combined + chunk
+            yield chunk
+        # Only a stream read to the end is recorded
+        if combined is not None:
+            message = combined.message
+            self.cassette.record(key, self.model_name, AIMessage(
+                content=message.content,
+                usage_metadata=message.usage_metadata,
+                response_metadata=message.response_metadata
+            ))
+
+
+def cassette_from_env() -> Optional[Cassette]:
+    """
+    The cassette selected by LLM_CASSETTE_MODE (record or replay) and LLM_CASSETTE_PATH, or None when the mode is unset.
+    """
+    mode = os.getenv("LLM_CASSETTE_MODE", "").strip().lower()
+    if not mode:
+        return None
+    return Cassette(os.getenv("LLM_CASSETTE_PATH") or DEFAULT_CASSETTE_PATH, mode)
@@ -0,0 +1,212 @@
+import inspect
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+import httpx
+from langchain_openai import ChatOpenAI
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.runnables import RunnableSerializable
+from utils.llm_cassette import REPLAY, Cassette, CassetteChatModel, cassette_from_env
+from utils.rate_limiter import RateLimiter, rate_limited, rate_limiter
+
+
+ChainBuilder = Callable[..., RunnableSerializable]
+LLMFactory = Callable[..., BaseChatModel]
+
+
+def _make_key(*parts: Any) -> str:
+    return json.dumps(parts, sort_keys=True, default=str)
+
+
+class ChainRegistry:
+    """
+    Process-wide registry of chat models and chains. Each chain is built once per (name, model, params) and shared across
+    Streamlit sessions and threads. All OpenAI chat models share one pooled HTTP client so keep-alive connections are reused,
+    and, when a rate limiter is set, are wrapped so every call goes through its per-model quota. With a cassette, calls
+    are recorded to it or replayed from it (see utils.llm_cassette).
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        timeout: float = 60.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        cassette: Optional[Cassette] = None
+    ):
+        self._lock = threading.RLock()
+        self._builders: Dict[str, ChainBuilder] = {}
+        self._chains: Dict[str, RunnableSerializable] = {}
+        self._llms: Dict[str, BaseChatModel] = {}
+        self._llm_factory: Optional[LLMFactory] = None
+        self._rate_limiter = rate_limiter
+        self._rate_limit_custom = False
+        self._cassette = cassette
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        )
+        self._timeout = timeout
+        self._http_client: Optional[httpx.Client] = None
+        self.build_count = 0
+        self.reuse_count = 0
+
+    @property
+    def http_client(self) -> httpx.Client:
+        """
+        Lazily creates the shared, pooled HTTP client used by every OpenAI chat model.
+        """
+        with self._lock:
+            if self._http_client is None:
+                self._http_client = httpx.Client(limits=self._limits, timeout=self._timeout)
+            return self._http_client
+
+    def _default_llm_factory(self, model_name: str, temperature: float, **model_kwargs) -> BaseChatModel:
+        return ChatOpenAI(
+            model_name = model_name,
+            temperature = temperature,
+            model_kwargs = model_kwargs,
+            stream_usage = True,
+            http_client = self.http_client,
+            # The rate limiter owns retries, with backoff shared across every caller of the model
+            max_retries = 0 if self._rate_limiter is not None else 2
+        )
+
+    def set_llm_factory(self, factory: Optional[LLMFactory], rate_limited: bool = False) -> None:
+        """
+        Overrides how chat models are created (e.g. a fake model for offline runs). Passing None restores ChatOpenAI.
+        Models from a custom factory bypass the rate limiter unless rate_limited is True. Cached models and chains are
+        dropped so the next call rebuilds them with the new factory.
+        """
+        with self._lock:
+            self._llm_factory = factory
+            self._rate_limit_custom = rate_limited
+            self._llms.clear()
+            self._chains.clear()
+
+    def cache_scope(self, model_name: str) -> str:
+        """
+        Names who answers calls for model_name, for keying cached results: the model qualified by OpenAI or by the custom
+        factory (e.g. the fake model), so their results never share cache entries.
+        """
+        with self._lock:
+            factory = self._llm_factory
+        if factory is None:
+            return f"{model_name}@openai"
+        tag = getattr(factory, "cache_scope", None) or f"{factory.__module__}.{factory.__qualname__}"
+        return f"{model_name}@{tag}"
+
+    @property
+    def cassette(self) -> Optional[Cassette]:
+        return self._cassette
+
+    @property
+    def caches_results(self) -> bool:
+        """
+        False while a cassette is set: a result served from a cache never reaches the model, so it would be missing from
+        a recording and would hide misses on replay. The result, similarity and section caches are skipped then.
+        """
+        return self._cassette is None
+
+    def set_cassette(self, cassette: Optional[Cassette]) -> None:
+        """
+        Records calls to, or replays them from, a cassette; None turns record/replay off. Cached models and chains are
+        dropped so the next call picks it up.
+        """
+        with self._lock:
+            self._cassette = cassette
+            self._llms.clear()
+            self._chains.clear()
+
+    def register(self, name: str, builder: ChainBuilder) -> None:
+        """
+        Registers a chain builder. The builder is called as builder(registry, **params) and must return a runnable.
+        """
+        with self._lock:
+            self._builders[name] = builder
+
+    def get_llm(self, model_name: str, temperature: float = 0, **model_kwargs) -> BaseChatModel:
+        """
+        Returns the shared chat model for the given model name and parameters, creating it on first use.
+        """
+        key = _make_key(model_name, temperature, model_kwargs)
+        with self._lock:
+            llm = self._llms.get(key)
+            if llm is None:
+                # Replay never calls a model, so none is created (and no API key is needed)
+                if self._cassette is None or self._cassette.mode != REPLAY:
+                    factory = self._llm_factory or self._default_llm_factory
+                    llm = factory(model_name, temperature, **model_kwargs)
+                    if self._rate_limiter is not None and (self._llm_factory is None or self._rate_limit_custom):
+                        llm = rate_limited(llm, model_name, self._rate_limiter)
+                if self._cassette is not None:
+                    llm = CassetteChatModel(
+                        inner=llm,
+                        cassette=self._cassette,
+                        model_name=model_name,
+                        temperature=temperature,
+                        model_kwargs=model_kwargs
+                    )
+                self._llms[key] = llm
+            return llm
+
+    def get_chain(self, name: str, **params) -> RunnableSerializable:
+        """
+        Returns the shared chain for the given name and parameters, building it on first use.
+        """
+        with self._lock:
+            if name not in self._builders:
+                raise KeyError(f"No chain registered under '{name}'.")
+            builder = self._builders[name]
+            # Fill in the builder's defaults so explicit and implicit parameters share one cache entry
+            bound = inspect.signature(builder).bind(self, **params)
+            bound.apply_defaults()
+            params = dict(list(bound.arguments.items())[1:])
+            key = _make_key(name, params)
+
+            chain = self._chains.get(key)
+            if chain is not None:
+                self.reuse_count += 1
+                return chain
+            chain = builder(self, **params)
+            self._chains[key] = chain
+            self.build_count += 1
+            return chain
+
+    def warm_up(self, names: Iterable[str] = None) -> Dict[str, int]:
+        """
+        Builds the registered chains with their default parameters so the first request does not pay the setup cost.
+        """
+        with self._lock:
+            names = list(names) if names is not None else list(self._builders)
+        for name in names:
+            self.get_chain(name)
+        return self.stats()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "registered": len(self._builders),
+                "chains": len(self._chains),
+                "llms": len(self._llms),
+                "build_count": self.build_count,
+                "reuse_count": self.reuse_count
+            }
+
+    def clear(self) -> None:
+        """
+        Drops cached chains and models and closes the shared HTTP client. Registered builders are kept.
+        """
+        with self._lock:
+            self._chains.clear()
+            self._llms.clear()
+            if self._http_client is not None:
+                self._http_client.close()
+                self._http_client = None
+
+
+chain_registry = ChainRegistry(
+    rate_limiter=None if os.getenv("OPENAI_RATE_LIMIT") == "0" else rate_limiter,
+    cassette=cassette_from_env()
+)
@@ -0,0 +1,228 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram in the Prometheus style, plus a window of recent samples for percentiles.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DURATION_BUCKETS, window: int = 1000):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.recent: Deque[float] = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.recent.append(value)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class StageMetrics:
+    def __init__(self):
+        self.duration = Histogram()
+        self.errors = 0
+        self.payload_bytes = 0
+
+
+class MetricsRegistry:
+    """
+    In-process aggregation of per-stage latency, errors and payload sizes, and LLM token usage. Optionally appends
+    every observation to a JSONL file (METRICS_JSONL_PATH) for offline analysis.
+    """
+
+    def __init__(self, jsonl_path: Optional[str] = None):
+        self._lock = threading.Lock()
+        # File appends have their own lock so observers and readers of the aggregates never wait on disk I/O
+        self._jsonl_lock = threading.Lock()
+        self._stages: Dict[str, StageMetrics] = {}
+        self._tokens: Dict[Tuple[str, str], int] = {}
+        self.jsonl_path = jsonl_path
+
+    def _append_jsonl(self, event: Dict[str, Any]) -> None:
+        if not self.jsonl_path:
+            return
+        line = json.dumps(event) + "\n"
+        try:
+            with self._jsonl_lock, open(self.jsonl_path, "a", encoding="utf-8") as f:
+                f.write(line)
+        except OSError as e:
+            print(f"Encountered an error while writing metrics to {self.jsonl_path}.")
+            print(f"Error: {e}")
+
+    def observe(self, stage: str, duration: float, error: bool = False, payload_bytes: int = 0) -> None:
+        with self._lock:
+            metrics = self._stages.setdefault(stage, StageMetrics())
+            metrics.duration.observe(duration)
+            metrics.errors += int(error)
+            metrics.payload_bytes += payload_bytes
+        self._append_jsonl({
+            "ts": time.time(),
+            "stage": stage,
+            "duration": round(duration, 6),
+            "error": error,
+            "payload_bytes": payload_bytes
+        })
+
+    def observe_tokens(self, label: str, prompt_tokens: int, completion_tokens: int) -> None:
+        with self._lock:
+            for kind, value in (("prompt", prompt_tokens), ("completion", completion_tokens)):
+                self._tokens[(label, kind)] = self._tokens.get((label, kind), 0) + value
+        self._append_jsonl({
+            "ts": time.time(),
+            "tokens": label,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens
+        })
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        One row per stage with counts, error totals, mean/p50/p95 latency and payload bytes; used by the dev panel.
+        """
+        with self._lock:
+            rows = []
+            for stage, metrics in sorted(self._stages.items()):
+                histogram = metrics.duration
+                rows.append({
+                    "stage": stage,
+                    "count": histogram.count,
+                    "errors": metrics.errors,
+                    "mean_s": round(histogram.sum / histogram.count, 4) if histogram.count else None,
+                    "p50_s": histogram.percentile(0.5),
+                    "p95_s": histogram.percentile(0.95),
+                    "payload_bytes": metrics.payload_bytes
+                })
+            return rows
+
+    def token_totals(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            totals: Dict[str, Dict[str, int]] = {}
+            for (label, kind), value in self._tokens.items():
+                totals.setdefault(label, {})[kind] = value
+            return totals
+
+    def render_prometheus(self) -> str:
+        """
+        Renders all metrics in the Prometheus text exposition format.
+        """
+        lines = [
+            "# HELP resume_stage_duration_seconds Time spent in each pipeline stage.",
+            "# TYPE resume_stage_duration_seconds histogram"
+        ]
+        with self._lock:
+            for stage, metrics in sorted(self._stages.items()):
+                histogram = metrics.duration
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'resume_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'resume_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+                lines.append(f'resume_stage_duration_seconds_sum{{stage="{stage}"}} {histogram.sum}')
+                lines.append(f'resume_stage_duration_seconds_count{{stage="{stage}"}} {histogram.count}')
+
+            lines.append("# HELP resume_stage_errors_total Errors raised by each pipeline stage.")
+            lines.append("# TYPE resume_stage_errors_total counter")
+            for stage, metrics in sorted(self._stages.items()):
+                lines.append(f'resume_stage_errors_total{{stage="{stage}"}} {metrics.errors}')
+
+            lines.append("# HELP resume_stage_payload_bytes_total Bytes processed by each pipeline stage.")
+            lines.append("# TYPE resume_stage_payload_bytes_total counter")
+            for stage, metrics in sorted(self._stages.items()):
+                lines.append(f'resume_stage_payload_bytes_total{{stage="{stage}"}} {metrics.payload_bytes}')
+
+            lines.append("# HELP resume_llm_tokens_total LLM tokens used, by chain and kind.")
+            lines.append("# TYPE resume_llm_tokens_total counter")
+            for (label, kind), value in sorted(self._tokens.items()):
+                lines.append(f'resume_llm_tokens_total{{chain="{label}",kind="{kind}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._tokens.clear()
+
+
+metrics = MetricsRegistry(jsonl_path=os.getenv("METRICS_JSONL_PATH") or None)
+
+
+class Span:
+    """
+    Handle yielded by track() so the instrumented code can report the size of what it processed.
+    """
+
+    def __init__(self):
+        self.payload_bytes = 0
+
+
+@contextmanager
+def track(stage: str, registry: MetricsRegistry = None) -> Iterator[Span]:
+    """
+    Times the enclosed block as one observation of the given stage, counting it as an error if it raises.
+    """
+    registry = registry or metrics
+    span = Span()
+    start = time.perf_counter()
+    error = False
+    try:
+        yield span
+    except GeneratorExit:
+        # A consumer that stops iterating early is not a failure of the stage
+        raise
+    except BaseException:
+        error = True
+        raise
+    finally:
+        registry.observe(stage, time.perf_counter() - start, error, span.payload_bytes)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = metrics.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serves /metrics in Prometheus format from a daemon thread. Safe to call on every Streamlit rerun; only the first
+    call starts the server.
+    """
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server
@@ -0,0 +1,204 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.prompt_values import StringPromptValue
+from langchain_core.runnables import RunnableLambda, RunnableSerializable
+from langchain.output_parsers import PydanticOutputParser
+from utils.ai import DEFAULT_MODEL, resume_output_defaults
+from utils.llm_registry import ChainRegistry, chain_registry
+from utils.metrics import metrics, track
+from utils.output_repair import with_output_repair
+from utils.prompt_builder import build_multi_target_prompt, multi_target_prompt_fingerprint
+from utils.result_cache import make_cache_key, resume_cache
+from utils.token_accounting import TokenUsageRecorder, usage_from_result
+from schemas import JobTarget, ResumeInput, ResumeSchema, TargetedResume, TargetedResumes
+
+
+MULTI_TARGET_CHAIN = "resume_multi_target"
+MAX_TARGETS = int(os.getenv("MULTI_TARGET_MAX_TARGETS", 10))
+
+
+def _build_multi_target_chain(
+    registry: ChainRegistry,
+    model_name: str = DEFAULT_MODEL,
+    temperature: float = 0
+) -> RunnableSerializable:
+    format_instructions = PydanticOutputParser(pydantic_object = ResumeSchema).get_format_instructions()
+
+    def build(payload: dict) -> StringPromptValue:
+        return StringPromptValue(text = build_multi_target_prompt(payload, format_instructions, model_name = model_name).text)
+
+    llm = registry.get_llm(
+        model_name,
+        temperature,
+        response_format = {"type": "json_object"}
+    )
+    chain = with_output_repair(
+        RunnableLambda(build, name = "MultiTargetPrompt"),
+        llm,
+        ResumeSchema,
+        MULTI_TARGET_CHAIN,
+        resume_output_defaults
+    ).with_config({"run_name": "Resume Builder (Multi-Target)", "callbacks": [TokenUsageRecorder(MULTI_TARGET_CHAIN)]})
+    return chain
+
+
+chain_registry.register(MULTI_TARGET_CHAIN, _build_multi_target_chain)
+
+
+class _UsageCapture(BaseCallbackHandler):
+    """
+    Sums the token usage of the LLM calls made for one target, including a repair re-ask.
+    """
+
+    def __init__(self):
+        self.usage = {"prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0}
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        usage = usage_from_result(response)
+        for key in self.usage:
+            self.usage[key] += usage[key]
+
+
+def _target_payload(resume_input: ResumeInput, target: JobTarget) -> Dict[str, Any]:
+    return {
+        **resume_input.model_dump(),
+        "target_job_title": target.title,
+        "target_job_description": target.description
+    }
+
+
+def _cached_target(payload: Dict[str, Any], target: JobTarget) -> Tuple[str, Optional[TargetedResume]]:
+    cache_key = make_cache_key(payload, multi_target_prompt_fingerprint(), chain_registry.cache_scope(DEFAULT_MODEL))
+    cached = resume_cache.get(cache_key) if chain_registry.caches_results else None
+    if cached is None:
+        return cache_key, None
+    return cache_key, TargetedResume(target = target, resume = ResumeSchema.model_validate_json(cached), from_cache = True)
+
+
+def _finish_target(cache_key: str, target: JobTarget, resume: ResumeSchema, capture: _UsageCapture, latency: float) -> TargetedResume:
+    if chain_registry.caches_results:
+        resume_cache.set(cache_key, resume.model_dump_json())
+    metrics.observe("multi_target:target", latency)
+    return TargetedResume(target = target, resume = resume, latency_s = round(latency, 4), **capture.usage)
+
+
+def generate_for_target(resume_input: ResumeInput, target: JobTarget) -> TargetedResume:
+    """
+    Generates the resume for one target with the shared-prefix prompt, serving repeats from the result cache.
+    """
+    payload = _target_payload(resume_input, target)
+    cache_key, cached = _cached_target(payload, target)
+    if cached is not None:
+        return cached
+    start = time.perf_counter()
+    capture = _UsageCapture()
+    resume = chain_registry.get_chain(MULTI_TARGET_CHAIN).invoke(payload, {"callbacks": [capture]})
+    return _finish_target(cache_key, target, resume, capture, time.perf_counter() - start)
+
+
+async def agenerate_for_target(resume_input: ResumeInput, target: JobTarget) -> TargetedResume:
+    payload = _target_payload(resume_input, target)
+    cache_key, cached = _cached_target(payload, target)
+    if cached is not None:
+        return cached
+    start = time.perf_counter()
+    capture = _UsageCapture()
+    resume = await chain_registry.get_chain(MULTI_TARGET_CHAIN).ainvoke(payload, {"callbacks": [capture]})
+    return _finish_target(cache_key, target, resume, capture, time.perf_counter() - start)
+
+
+def _check_targets(targets: Sequence[JobTarget]) -> None:
+    if not targets:
+        raise ValueError("At least one target job is required.")
+    if len(targets) > MAX_TARGETS:
+        raise ValueError(f"At most {MAX_TARGETS} target jobs can be generated at once; got {len(targets)}.")
+
+
+def iter_targeted_resumes(
+    resume_input: ResumeInput,
+    targets: Sequence[JobTarget],
+    warm_prefix: bool = True
+) -> Iterator[Tuple[int, TargetedResume]]:
+    """
+    Generates one tailored resume per target, yielding (target index, TargetedResume) as each finishes. The targets run
+    concurrently; with warm_prefix the first target runs alone first, so the provider has cached the shared candidate
+    prefix by the time the others are sent (requests sent together would all miss the cache).
+    """
+    _check_targets(targets)
+    with track("generate_multi_target") as span:
+        span.payload_bytes = len(resume_input.model_dump_json().encode("utf-8"))
+        pending = list(enumerate(targets))
+        if warm_prefix and len(pending) > 1:
+            index, target = pending.pop(0)
+            yield index, generate_for_target(resume_input, target)
+
+        with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="resume-target") as executor:
+            futures = {
+                executor.submit(generate_for_target, resume_input, target): index
+                for index, target in pending
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+
+def generate_targeted_resumes(
+    resume_input: ResumeInput,
+    targets: Sequence[JobTarget],
+    warm_prefix: bool = True
+) -> TargetedResumes:
+    """
+    Runs iter_targeted_resumes to completion and returns the results in target order.
+    """
+    results = dict(iter_targeted_resumes(resume_input, targets, warm_prefix))
+    return TargetedResumes(resumes = [results[index] for index in range(len(targets))])
+
+
+async def agenerate_targeted_resumes(
+    resume_input: ResumeInput,
+    targets: Sequence[JobTarget],
+    warm_prefix: bool = True
+) -> TargetedResumes:
+    """
+    Async counterpart to generate_targeted_resumes.
+    """
+    _check_targets(targets)
+    with track("generate_multi_target") as span:
+        span.payload_bytes = len(resume_input.model_dump_json().encode("utf-8"))
+        results: List[TargetedResume] = []
+        remaining = list(targets)
+        if warm_prefix and len(remaining) > 1:
+            results.append(await agenerate_for_target(resume_input, remaining.pop(0)))
+        results.extend(await asyncio.gather(*(agenerate_for_target(resume_input, target) for target in remaining)))
+        return TargetedResumes(resumes = results)
+
+
+def multi_target_report(results: TargetedResumes) -> Dict[str, Any]:
+    """
+    Per-target latency and token figures plus totals, including the share of prompt tokens served from the provider's
+    prompt cache.
+    """
+    rows = [
+        {
+            "target": result.target.title,
+            "latency_s": result.latency_s,
+            "prompt_tokens": result.prompt_tokens,
+            "cached_tokens": result.cached_tokens,
+            "completion_tokens": result.completion_tokens,
+            "from_cache": result.from_cache
+        }
+        for result in results.resumes
+    ]
+    prompt_tokens = sum(row["prompt_tokens"] for row in rows)
+    cached_tokens = sum(row["cached_tokens"] for row in rows)
+    return {
+        "targets": rows,
+        "prompt_tokens": prompt_tokens,
+        "cached_tokens": cached_tokens,
+        "cached_share": round(cached_tokens / prompt_tokens, 3) if prompt_tokens else 0.0,
+        "slowest_s": max((row["latency_s"] for row in rows), default=0.0)
+    }
@@ -0,0 +1,194 @@
+"""
+Local stand-in for the OpenAI chat completions API that enforces per-minute request and token limits and reports
+cached prompt tokens, for exercising the rate limiter and prompt-prefix reuse without a real key or quota.
+
+    python -m utils.openai_stub --port 8790 --rpm 60 --tpm 20000 --latency 0.5
+    OPENAI_BASE_URL=http://127.0.0.1:8790/v1 OPENAI_API_KEY=stub streamlit run main.py
+"""
+import argparse
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Set, Tuple
+from langchain_core.messages import HumanMessage
+from utils.fake_llm import FakeResumeChatModel
+
+
+class QuotaWindow:
+    """
+    Sliding window of (timestamp, tokens) for admitted requests. The window is a minute by default; a shorter window
+    (with rpm/tpm meaning "per window") makes rate-limit behavior quick to reproduce.
+    """
+
+    def __init__(self, rpm: int, tpm: int, window_seconds: float = 60):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window_seconds = window_seconds
+        self.calls: Deque[Tuple[float, int]] = deque()
+        self.lock = threading.Lock()
+        self.counters = {"accepted": 0, "rejected": 0}
+
+    def admit(self, tokens: int) -> float:
+        """
+        Records the call and returns 0 if it fits the window, otherwise returns the seconds until it would.
+        """
+        with self.lock:
+            now = time.time()
+            while self.calls and now - self.calls[0][0] >= self.window_seconds:
+                self.calls.popleft()
+            used = sum(count for _, count in self.calls)
+            if len(self.calls) + 1 > self.rpm or used + tokens > self.tpm:
+                self.counters["rejected"] += 1
+                return max(0.05, self.window_seconds - (now - self.calls[0][0])) if self.calls else 1.0
+            self.calls.append((now, tokens))
+            self.counters["accepted"] += 1
+            return 0.0
+
+
+class PromptCache:
+    """
+    Mimics provider-side prompt caching: prompts of at least 1024 tokens are cached in 128-token blocks, and a later
+    prompt sharing a cached prefix reports those tokens as cached. Tokens are estimated at four characters each.
+    """
+
+    min_chars = 1024 * 4
+    block_chars = 128 * 4
+
+    def __init__(self):
+        self.prefixes: Set[int] = set()
+        self.lock = threading.Lock()
+
+    def lookup_and_store(self, prompt: str) -> int:
+        boundaries = range(self.min_chars, len(prompt) + 1, self.block_chars)
+        with self.lock:
+            cached = max((end for end in boundaries if hash(prompt[:end]) in self.prefixes), default=0)
+            self.prefixes.update(hash(prompt[:end]) for end in boundaries)
+        return cached // 4
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    model: FakeResumeChatModel = None
+    window: QuotaWindow = None
+    prompt_cache: PromptCache = None
+    latency: float = 0.0
+
+    def _send_json(self, status: int, body: dict, headers: dict = None) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "Not found"}})
+            return
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        messages = [HumanMessage(content=str(message.get("content", ""))) for message in request.get("messages", [])]
+        message = self.model._respond(messages)
+        usage = message.usage_metadata
+
+        retry_after = self.window.admit(usage["total_tokens"])
+        if retry_after:
+            self._send_json(
+                429,
+                {"error": {"message": "Rate limit reached (stub).", "type": "requests", "code": "rate_limit_exceeded"}},
+                {"retry-after-ms": str(int(retry_after * 1000)), "x-ratelimit-limit-requests": str(self.window.rpm)}
+            )
+            return
+
+        cached_tokens = min(self.prompt_cache.lookup_and_store("\n".join(str(m.content) for m in messages)), usage["input_tokens"])
+        if self.latency:
+            time.sleep(self.latency)
+        completion = {
+            "id": f"chatcmpl-stub-{time.time_ns()}",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "usage": {
+                "prompt_tokens": usage["input_tokens"],
+                "completion_tokens": usage["output_tokens"],
+                "total_tokens": usage["total_tokens"],
+                "prompt_tokens_details": {"cached_tokens": cached_tokens}
+            }
+        }
+        if not request.get("stream"):
+            self._send_json(200, {
+                **completion,
+                "object": "chat.completion",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": message.content}, "finish_reason": "stop"}]
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        content = message.content
+        pieces = [content[i:i + 64] for i in range(0, len(content), 64)] or [""]
+        for i, piece in enumerate(pieces):
+            chunk = {
+                "id": completion["id"],
+                "object": "chat.completion.chunk",
+                "created": completion["created"],
+                "model": completion["model"],
+                "choices": [{"index": 0, "delta": {"role": "assistant", "content": piece}, "finish_reason": "stop" if i == len(pieces) - 1 else None}]
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        if (request.get("stream_options") or {}).get("include_usage"):
+            chunk = {key: completion[key] for key in ("id", "created", "model", "usage")}
+            self.wfile.write(f"data: {json.dumps({**chunk, 'object': 'chat.completion.chunk', 'choices': []})}\n\n".encode("utf-8"))
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_openai_stub(
+    port: int = 0,
+    rpm: int = 60,
+    tpm: int = 20_000,
+    latency: float = 0.0,
+    host: str = "127.0.0.1",
+    window_seconds: float = 60
+) -> ThreadingHTTPServer:
+    """
+    Starts the stub on a daemon thread and returns the server; server.server_address gives the bound port and
+    server.window.counters the accepted/rejected counts.
+    """
+    handler = type("StubHandler", (_StubHandler,), {
+        "model": FakeResumeChatModel(),
+        "window": QuotaWindow(rpm, tpm, window_seconds),
+        "prompt_cache": PromptCache(),
+        "latency": latency
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.window = handler.window
+    threading.Thread(target=server.serve_forever, name="openai-stub", daemon=True).start()
+    return server
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Serve a rate-limited OpenAI chat completions stub.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--rpm", type=int, default=60)
+    parser.add_argument("--tpm", type=int, default=20_000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--window", type=float, default=60, help="Seconds over which --rpm/--tpm apply")
+    args = parser.parse_args(argv)
+
+    server = start_openai_stub(args.port, args.rpm, args.tpm, args.latency, args.host, args.window)
+    print(f"OpenAI stub on http://{args.host}:{server.server_address[1]}/v1 ({args.rpm} RPM, {args.tpm} TPM)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,449 @@
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union, get_args, get_origin
+from pydantic import BaseModel, ValidationError, create_model
+from langchain_core.exceptions import OutputParserException
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.prompt_values import PromptValue
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda, RunnableParallel, RunnablePassthrough
+from langchain_core.utils.json import parse_partial_json
+from langchain.output_parsers import PydanticOutputParser
+from utils.metrics import metrics
+
+
+REASK_INSTRUCTION = """
+    Your previous answer was missing, or had invalid values for, these fields: {fields}.
+    Using the information above, return a JSON object containing only these fields.
+
+    Format Instructions:
+    {format_instructions}
+    """
+
+_PYTHON_LITERALS = {"None": "null", "True": "true", "False": "false"}
+
+_counters: Dict[str, Dict[str, int]] = {}
+_counters_lock = threading.Lock()
+
+
+@dataclass
+class RepairResult:
+    """
+    Outcome of the local repair pass. data holds the coerced object; unresolved lists the top-level fields that could
+    not be repaired locally and need a re-ask.
+    """
+    data: Dict[str, Any]
+    fixes: List[str] = field(default_factory=list)
+    unresolved: List[str] = field(default_factory=list)
+
+
+def _strip_fences(text: str) -> str:
+    match = re.search(r"```(?:json)?\s*(.*?)(?:```|$)", text, re.DOTALL)
+    return match.group(1) if match else text
+
+
+def _fix_syntax(text: str) -> Tuple[str, List[str]]:
+    """
+    Drops trailing commas and swaps Python literals for JSON ones, leaving string contents untouched.
+    """
+    out, fixes = [], set()
+    i, in_string, escaped = 0, False, False
+    while i < len(text):
+        char = text[i]
+        if in_string:
+            out.append(char)
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            i += 1
+            continue
+        if char == '"':
+            in_string = True
+        elif char == ",":
+            rest = text[i + 1:].lstrip()
+            if not rest or rest[0] in "}]":
+                fixes.add("trailing_comma")
+                i += 1
+                continue
+        elif char.isalpha():
+            # \w rather than [A-Za-z_]: isalpha() is also true for non-ASCII letters
+            word = re.match(r"\w+", text[i:]).group(0)
+            out.append(_PYTHON_LITERALS.get(word, word))
+            if word in _PYTHON_LITERALS:
+                fixes.add("python_literal")
+            i += len(word)
+            continue
+        out.append(char)
+        i += 1
+    return "".join(out), sorted(fixes)
+
+
+def repair_json_text(text: str) -> Tuple[Any, List[str]]:
+    """
+    Parses LLM output as JSON, undoing common damage: markdown fences, leading prose, trailing commas, Python literals,
+    raw control characters inside strings and output truncated mid-object. Raises OutputParserException if nothing
+    parseable remains.
+    """
+    fixes = []
+    body = _strip_fences(text)
+    if body != text:
+        fixes.append("code_fence")
+    start = min((i for i in (body.find("{"), body.find("[")) if i >= 0), default=-1)
+    if start < 0:
+        raise OutputParserException(f"No JSON object found in output: {text[:200]!r}", llm_output=text)
+    if body[:start].strip():
+        fixes.append("leading_text")
+    body = body[start:].strip()
+
+    try:
+        return json.loads(body), fixes
+    except json.JSONDecodeError:
+        pass
+
+    body, syntax_fixes = _fix_syntax(body)
+    fixes.extend(syntax_fixes)
+    try:
+        return json.loads(body), fixes
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(body, strict=False), fixes + ["control_chars"]
+    except json.JSONDecodeError:
+        pass
+
+    # Closes unterminated strings, arrays and objects, e.g. when the completion hit max_tokens
+    try:
+        data = parse_partial_json(body, strict=False)
+    except json.JSONDecodeError:
+        data = None
+    if data is None:
+        raise OutputParserException(f"Could not repair JSON output: {text[:200]!r}", llm_output=text)
+    return data, fixes + ["truncated"]
+
+
+def _is_optional(annotation: Any) -> bool:
+    return get_origin(annotation) is Union and type(None) in get_args(annotation)
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    if _is_optional(annotation):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return args[0] if len(args) == 1 else Union[tuple(args)]
+    return annotation
+
+
+def _is_model(annotation: Any) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+def _empty(annotation: Any) -> Any:
+    """
+    The empty value for a field the LLM left out: None when optional, otherwise an empty string or list.
+    """
+    if _is_optional(annotation):
+        return None
+    if annotation is str:
+        return ""
+    if get_origin(annotation) in (list, List):
+        return []
+    raise ValueError(f"No empty value for {annotation}")
+
+
+def _normalize_key(key: str) -> str:
+    return re.sub(r"[\s\-]+", "_", key.strip()).lower()
+
+
+class _Coercer:
+    def __init__(self):
+        self.fixes: List[str] = []
+
+    def fix(self, kind: str, path: str) -> None:
+        self.fixes.append(f"{kind}:{path}")
+
+    def coerce(self, value: Any, annotation: Any, path: str) -> Any:
+        """
+        Coerces value to the annotation, recording each change. Raises ValueError when the value cannot be made to fit.
+        """
+        if _is_optional(annotation):
+            return None if value is None else self.coerce(value, _unwrap_optional(annotation), path)
+
+        if annotation is str:
+            if value is None:
+                self.fix("null", path)
+                return ""
+            if isinstance(value, (int, float, bool)):
+                self.fix("scalar", path)
+                return json.dumps(value) if isinstance(value, bool) else str(value)
+            if isinstance(value, list) and all(isinstance(item, (str, int, float)) for item in value):
+                self.fix("list_to_str", path)
+                return "\n".join(str(item) for item in value)
+            if isinstance(value, str):
+                return value
+            raise ValueError(f"{path}: expected a string, got {type(value).__name__}")
+
+        if get_origin(annotation) in (list, List):
+            item_type = (get_args(annotation) or (Any,))[0]
+            if value is None:
+                self.fix("null", path)
+                return []
+            if not isinstance(value, list):
+                self.fix("wrap_list", path)
+                value = value.splitlines() if isinstance(value, str) and item_type is str else [value]
+            return [self.coerce(item, item_type, f"{path}[{i}]") for i, item in enumerate(value)]
+
+        if _is_model(annotation):
+            if not isinstance(value, dict):
+                raise ValueError(f"{path}: expected an object, got {type(value).__name__}")
+            return self.coerce_object(value, annotation, path)
+
+        return value
+
+    def coerce_object(self, value: Dict[str, Any], model: Type[BaseModel], path: str) -> Dict[str, Any]:
+        # Nested objects: missing fields get their empty value rather than a re-ask
+        value = self.match_keys(value, model, path)
+        out = {}
+        for name, info in model.model_fields.items():
+            field_path = f"{path}.{name}"
+            if name not in value:
+                if not info.is_required():
+                    continue
+                self.fix("missing", field_path)
+                out[name] = _empty(info.annotation)
+                continue
+            out[name] = self.coerce(value[name], info.annotation, field_path)
+        return out
+
+    def match_keys(self, value: Dict[str, Any], model: Type[BaseModel], path: str) -> Dict[str, Any]:
+        """
+        Maps keys such as "Job Title" or "job-title" onto the model's field names.
+        """
+        fields = model.model_fields
+        if all(key in fields for key in value):
+            return value
+        matched = {}
+        for key, item in value.items():
+            name = key if key in fields else _normalize_key(key)
+            if name != key and name in fields:
+                self.fix("key", f"{path}.{name}")
+            matched.setdefault(name, item)
+        return matched
+
+
+def repair_structured_output(
+    raw: Union[str, Dict[str, Any]],
+    model: Type[BaseModel],
+    defaults: Dict[str, Any] = None
+) -> RepairResult:
+    """
+    Locally repairs LLM output for the given model: JSON syntax, null and scalar coercion, missing nested fields and
+    optional fields. Missing or unusable top-level fields fall back to defaults (e.g. values known from the input) and
+    are otherwise reported as unresolved.
+    """
+    fixes = []
+    data = raw
+    if isinstance(raw, str):
+        data, fixes = repair_json_text(raw)
+    if isinstance(data, list) and len(data) == 1 and isinstance(data[0], dict):
+        fixes.append("unwrap_list")
+        data = data[0]
+    if not isinstance(data, dict):
+        fixes.append("not_object")
+        data = {}
+
+    coercer = _Coercer()
+    data = coercer.match_keys(data, model, "")
+    result = RepairResult({}, fixes)
+    for name, info in model.model_fields.items():
+        annotation = info.annotation
+        value = data.get(name)
+        usable = name in data and (value is not None or _is_optional(annotation) or _unwrap_optional(annotation) is not str)
+        if usable:
+            try:
+                result.data[name] = coercer.coerce(value, annotation, name)
+                continue
+            except ValueError:
+                pass
+        if defaults and name in defaults:
+            result.fixes.append(f"default:{name}")
+            result.data[name] = defaults[name]
+        elif not info.is_required():
+            continue
+        elif _is_optional(annotation):
+            result.fixes.append(f"missing:{name}")
+            result.data[name] = None
+        else:
+            result.unresolved.append(name)
+    result.fixes.extend(coercer.fixes)
+    return result
+
+
+def _record(label: str, outcome: str, duration: float) -> None:
+    with _counters_lock:
+        counts = _counters.setdefault(label, {"parsed": 0, "repaired": 0, "reasked": 0, "failed": 0})
+        counts[outcome] += 1
+    metrics.observe(f"output_repair:{label}", duration, error=outcome == "failed")
+
+
+def output_repair_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Per-chain counts of outputs that parsed cleanly, were repaired locally, needed a re-ask, or failed, with the share
+    of outputs that needed any repair.
+    """
+    with _counters_lock:
+        stats = {}
+        for label, counts in _counters.items():
+            total = sum(counts.values())
+            stats[label] = {
+                **counts,
+                "repair_rate": round((total - counts["parsed"]) / total, 3) if total else 0.0,
+                "reask_rate": round(counts["reasked"] / total, 3) if total else 0.0
+            }
+        return stats
+
+
+def _text(completion: Union[str, BaseMessage]) -> str:
+    return completion if isinstance(completion, str) else str(completion.content)
+
+
+def _prompt_text(prompt: Union[str, PromptValue, Callable[[], str]]) -> str:
+    if callable(prompt):
+        prompt = prompt()
+    return prompt if isinstance(prompt, str) else prompt.to_string()
+
+
+class OutputRepairer:
+    """
+    Turns raw LLM output into a validated pydantic object. Valid output is parsed as is; otherwise the local repair
+    pass runs, and only the fields it cannot fix are re-asked from the LLM (once, with a schema holding just those
+    fields) before giving up with an OutputParserException. The prompt may be given as a zero-argument callable when it
+    is only worth rebuilding for a re-ask.
+    """
+
+    def __init__(self, model: Type[BaseModel], llm: Optional[BaseChatModel], label: str):
+        self.model = model
+        self.llm = llm
+        self.label = label
+
+    def _reask_model(self, fields: List[str]) -> Type[BaseModel]:
+        return create_model(
+            f"{self.model.__name__}Fields",
+            **{name: (self.model.model_fields[name].annotation, ...) for name in fields}
+        )
+
+    def _reask_prompt(self, prompt: Union[str, PromptValue], fields: List[str]) -> Tuple[str, Type[BaseModel]]:
+        model = self._reask_model(fields)
+        instruction = REASK_INSTRUCTION.format(
+            fields=", ".join(fields),
+            format_instructions=PydanticOutputParser(pydantic_object=model).get_format_instructions()
+        )
+        return f"{_prompt_text(prompt)}\n{instruction}", model
+
+    def _try_validate(self, raw: Union[str, Dict[str, Any]]) -> Optional[BaseModel]:
+        try:
+            if isinstance(raw, str):
+                return self.model.model_validate_json(raw)
+            return self.model.model_validate(raw)
+        except ValidationError:
+            return None
+
+    def _merge(self, repaired: RepairResult, answer: str, reask_model: Type[BaseModel]) -> BaseModel:
+        extra = repair_structured_output(answer, reask_model)
+        data = {**repaired.data, **extra.data}
+        missing = [name for name in repaired.unresolved if name not in extra.data]
+        if missing:
+            raise OutputParserException(f"Could not repair fields {missing} of {self.model.__name__}.", llm_output=answer)
+        return self.model.model_validate(data)
+
+    def _local(self, raw: Union[str, Dict[str, Any]], defaults: Dict[str, Any]) -> Tuple[Optional[BaseModel], Optional[RepairResult]]:
+        parsed = self._try_validate(raw)
+        if parsed is not None:
+            return parsed, None
+        repaired = repair_structured_output(raw, self.model, defaults)
+        if repaired.unresolved:
+            return None, repaired
+        try:
+            return self.model.model_validate(repaired.data), repaired
+        except ValidationError as e:
+            raise OutputParserException(f"Repaired output still fails validation: {e}", llm_output=str(raw))
+
+    def repair(
+        self,
+        raw: Union[str, Dict[str, Any]],
+        prompt: Union[str, PromptValue] = None,
+        defaults: Dict[str, Any] = None,
+        config: RunnableConfig = None
+    ) -> BaseModel:
+        start = time.perf_counter()
+        outcome = "failed"
+        try:
+            value, repaired = self._local(raw, defaults)
+            if value is not None:
+                outcome = "repaired" if repaired else "parsed"
+                return value
+            if self.llm is None or prompt is None:
+                raise OutputParserException(f"Could not repair fields {repaired.unresolved} of {self.model.__name__}.", llm_output=str(raw))
+            text, reask_model = self._reask_prompt(prompt, repaired.unresolved)
+            value = self._merge(repaired, _text(self.llm.invoke(text, config)), reask_model)
+            outcome = "reasked"
+            return value
+        finally:
+            _record(self.label, outcome, time.perf_counter() - start)
+
+    async def arepair(
+        self,
+        raw: Union[str, Dict[str, Any]],
+        prompt: Union[str, PromptValue] = None,
+        defaults: Dict[str, Any] = None,
+        config: RunnableConfig = None
+    ) -> BaseModel:
+        start = time.perf_counter()
+        outcome = "failed"
+        try:
+            value, repaired = self._local(raw, defaults)
+            if value is not None:
+                outcome = "repaired" if repaired else "parsed"
+                return value
+            if self.llm is None or prompt is None:
+                raise OutputParserException(f"Could not repair fields {repaired.unresolved} of {self.model.__name__}.", llm_output=str(raw))
+            text, reask_model = self._reask_prompt(prompt, repaired.unresolved)
+            value = self._merge(repaired, _text(await self.llm.ainvoke(text, config)), reask_model)
+            outcome = "reasked"
+            return value
+        finally:
+            _record(self.label, outcome, time.perf_counter() - start)
+
+
+def with_output_repair(
+    prompt: Runnable,
+    llm: BaseChatModel,
+    model: Type[BaseModel],
+    label: str,
+    defaults: Callable[[Dict[str, Any]], Dict[str, Any]] = None
+) -> Runnable:
+    """
+    Builds prompt | llm | repair as a runnable. The repair step sees the rendered prompt (for a targeted re-ask) and,
+    through defaults, values derived from the chain input that may stand in for fields the LLM left out.
+    """
+    repairer = OutputRepairer(model, llm, label)
+
+    def step(inputs: Dict[str, Any], config: RunnableConfig) -> BaseModel:
+        return repairer.repair(_text(inputs["completion"]), inputs["prompt"], inputs["defaults"], config)
+
+    async def astep(inputs: Dict[str, Any], config: RunnableConfig) -> BaseModel:
+        return await repairer.arepair(_text(inputs["completion"]), inputs["prompt"], inputs["defaults"], config)
+
+    return (
+        RunnableParallel(
+            prompt=prompt,
+            defaults=RunnableLambda(lambda payload: defaults(payload) if defaults else {}, name="RepairDefaults")
+        )
+        | RunnablePassthrough.assign(completion=itemgetter("prompt") | llm)
+        | RunnableLambda(step, afunc=astep, name="OutputRepair")
+    )
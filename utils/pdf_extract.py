@@ -0,0 +1,88 @@
+from io import BytesIO
+from typing import TYPE_CHECKING, Iterator, List, Tuple, Union
+from utils.metrics import track
+
+if TYPE_CHECKING:
+    from pypdf import PdfReader
+
+
+MAX_UPLOAD_BYTES = 5 * 1024 * 1024
+MAX_PAGES = 10
+
+
+class PDFLimitError(ValueError):
+    """
+    Raised when an upload is not a readable PDF or exceeds the configured size or page limits.
+    """
+
+
+def _open_reader(file_bytes: bytes) -> "PdfReader":
+    # pypdf is imported on the first upload so the ingest form renders without it
+    from pypdf import PdfReader
+    from pypdf.errors import PdfReadError
+
+    try:
+        return PdfReader(BytesIO(file_bytes))
+    except PdfReadError as e:
+        raise PDFLimitError(f"Could not read the uploaded file as a PDF: {e}") from e
+
+
+def open_pdf(file_bytes: bytes, max_pages: int = MAX_PAGES, max_bytes: int = MAX_UPLOAD_BYTES) -> "PdfReader":
+    """
+    Parses an upload once after checking the size and page limits; pass the reader to iter_pdf_pages and
+    extract_pdf_links so both work from the same parse.
+    """
+    if len(file_bytes) > max_bytes:
+        raise PDFLimitError(f"The uploaded PDF is {len(file_bytes) // 1024} KB; the limit is {max_bytes // 1024} KB.")
+
+    reader = _open_reader(file_bytes)
+    if len(reader.pages) > max_pages:
+        raise PDFLimitError(f"The uploaded PDF has {len(reader.pages)} pages; the limit is {max_pages}.")
+    return reader
+
+
+def _checked_reader(source: Union[bytes, "PdfReader"], max_pages: int, max_bytes: int) -> Tuple["PdfReader", int]:
+    # An open reader already passed the limits in open_pdf
+    if isinstance(source, bytes):
+        return open_pdf(source, max_pages, max_bytes), len(source)
+    return source, source.stream.getbuffer().nbytes
+
+
+def iter_pdf_pages(
+    source: Union[bytes, "PdfReader"],
+    max_pages: int = MAX_PAGES,
+    max_bytes: int = MAX_UPLOAD_BYTES
+) -> Iterator[str]:
+    """
+    Yields the text of each page of a PDF (the upload bytes or a reader from open_pdf), in order, straight from the
+    upload buffer. Limits are checked before any page is parsed.
+    """
+    with track("pdf_extract") as span:
+        reader, span.payload_bytes = _checked_reader(source, max_pages, max_bytes)
+        # Extraction is pure Python and holds the GIL, so threads would only add a reader per worker
+        for page in reader.pages:
+            yield page.extract_text() or ""
+
+
+def extract_pdf_links(
+    source: Union[bytes, "PdfReader"],
+    max_pages: int = MAX_PAGES,
+    max_bytes: int = MAX_UPLOAD_BYTES
+) -> List[str]:
+    """
+    Returns the URIs of every link annotation in the PDF, in page order. Resumes often show "LinkedIn" or "GitHub" as
+    link text, so the target URL only exists in the annotation.
+    """
+    with track("pdf_links") as span:
+        reader, span.payload_bytes = _checked_reader(source, max_pages, max_bytes)
+        links = []
+        for page in reader.pages:
+            annotations = page.get("/Annots")
+            for annotation in annotations.get_object() if annotations else []:
+                action = annotation.get_object().get("/A")
+                if action is None:
+                    continue
+                uri = action.get_object().get("/URI")
+                if uri:
+                    links.append(str(uri))
+        return links
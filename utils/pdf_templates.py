@@ -0,0 +1,241 @@
+import hashlib
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from io import BytesIO
+from typing import Callable, Dict, List, Tuple
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.platypus import Flowable, Paragraph, SimpleDocTemplate, Spacer
+from schemas import ResumeSchema
+from utils.metrics import track
+from utils.single_flight import SingleFlight
+
+
+DEFAULT_TEMPLATE = "classic"
+
+SectionLayout = Callable[[ResumeSchema, "CompiledStyles"], List[Flowable]]
+
+
+@dataclass(frozen=True)
+class TemplateConfig:
+    """
+    Declarative description of a resume template: page geometry, typography and the order of its sections.
+    """
+    name: str
+    sections: Tuple[str, ...]
+    text_color: str = "#303E48"
+    heading_size: int = 14
+    heading_leading: int = 18
+    body_size: int = 10
+    body_leading: int = 14
+    section_gap: int = 12
+    margins_cm: Tuple[float, float, float, float] = (1, 1, 0.5, 0.5)  # left, right, top, bottom
+
+
+@dataclass
+class CompiledStyles:
+    heading: ParagraphStyle
+    normal: ParagraphStyle
+    gap: int
+
+
+def _header(resume_data: ResumeSchema, styles: CompiledStyles) -> List[Flowable]:
+    contact_info = resume_data.contact_info
+    contact_text = f"{contact_info.location} | {contact_info.phone_number} | {contact_info.email} | <a href='{contact_info.linkedin_profile}'>LinkedIn</a> | <a href='{contact_info.github_profile}'>GitHub</a>"
+    return [
+        Paragraph(f"<b>{resume_data.name}</b>", styles.heading),
+        Paragraph(contact_text, styles.normal),
+        Spacer(1, styles.gap)
+    ]
+
+
+def _summary(resume_data: ResumeSchema, styles: CompiledStyles) -> List[Flowable]:
+    if not resume_data.summary:
+        return []
+    return [
+        Paragraph("<b>Summary</b>", styles.heading),
+        Paragraph(resume_data.summary, styles.normal),
+        Spacer(1, styles.gap)
+    ]
+
+
+def _experience(resume_data: ResumeSchema, styles: CompiledStyles) -> List[Flowable]:
+    story = [Paragraph("<b>Experience</b>", styles.heading)]
+    for job in resume_data.experience:
+        story.append(Paragraph(f"{job.job_title} - {job.company} ({job.location})", styles.normal))
+        story.append(Paragraph(f"{job.start_date} - {job.end_date or 'Present'}", styles.normal))
+        for bullet in job.description:
+            story.append(Paragraph(f"• {bullet}", styles.normal))
+        story.append(Spacer(1, styles.gap))
+    return story
+
+
+def _projects(resume_data: ResumeSchema, styles: CompiledStyles) -> List[Flowable]:
+    story = [Paragraph("<b>Projects</b>", styles.heading)]
+    for project in resume_data.projects:
+        story.append(Paragraph(f"{project.title}", styles.normal))
+        story.append(Paragraph(f"{project.description}", styles.normal))
+        if project.technologies:
+            story.append(Paragraph(f"Technologies: {', '.join(project.technologies)}", styles.normal))
+        if project.github_link:
+            story.append(Paragraph(f"<a href='{project.github_link}'>GitHub Link</a>", styles.normal))
+        story.append(Spacer(1, styles.gap))
+    return story
+
+
+def _education(resume_data: ResumeSchema, styles: CompiledStyles) -> List[Flowable]:
+    story = [Paragraph("<b>Education</b>", styles.heading)]
+    for edu in resume_data.education:
+        story.append(Paragraph(f"{edu.degree} - {edu.school} ({edu.location})", styles.normal))
+        story.append(Paragraph(f"Graduation: {edu.graduation_date}", styles.normal))
+        story.append(Spacer(1, styles.gap))
+    return story
+
+
+def _certificates(resume_data: ResumeSchema, styles: CompiledStyles) -> List[Flowable]:
+    story = [Paragraph("<b>Certificates</b>", styles.heading)]
+    for cert in resume_data.certificates:
+        story.append(Paragraph(f"{cert.name} - {cert.date}", styles.normal))
+        story.append(Spacer(1, styles.gap))
+    return story
+
+
+def _involvement(resume_data: ResumeSchema, styles: CompiledStyles) -> List[Flowable]:
+    story = [Paragraph("<b>Involvement</b>", styles.heading)]
+    for inv in resume_data.involvement:
+        story.append(Paragraph(f"{inv.role} - {inv.organization}", styles.normal))
+        story.append(Paragraph(f"{inv.description}", styles.normal))
+        story.append(Spacer(1, styles.gap))
+    return story
+
+
+def _skills(resume_data: ResumeSchema, styles: CompiledStyles) -> List[Flowable]:
+    return [
+        Paragraph("<b>Skills</b>", styles.heading),
+        Paragraph(", ".join(resume_data.skills.all_skills), styles.normal),
+        Spacer(1, styles.gap)
+    ]
+
+
+SECTION_LAYOUTS: Dict[str, SectionLayout] = {
+    "header": _header,
+    "summary": _summary,
+    "experience": _experience,
+    "projects": _projects,
+    "education": _education,
+    "certificates": _certificates,
+    "involvement": _involvement,
+    "skills": _skills
+}
+
+
+class ResumeTemplate:
+    """
+    A template compiled once from its config: ParagraphStyles are built and section layouts resolved up front, so
+    rendering only lays out the story for the given resume.
+    """
+
+    def __init__(self, config: TemplateConfig):
+        self.config = config
+        self.name = config.name
+        # Any change to the config yields a new fingerprint, so cached PDFs never outlive their template
+        self.fingerprint = hashlib.sha256(repr(config).encode("utf-8")).hexdigest()[:12]
+        text_color = colors.HexColor(config.text_color)
+        self.styles = CompiledStyles(
+            heading=ParagraphStyle(name=f"{config.name}Heading", fontSize=config.heading_size, textColor=text_color, leading=config.heading_leading),
+            normal=ParagraphStyle(name=f"{config.name}Normal", fontSize=config.body_size, textColor=text_color, leading=config.body_leading),
+            gap=config.section_gap
+        )
+        self.layouts = [SECTION_LAYOUTS[section] for section in config.sections]
+
+    def render(self, resume_data: ResumeSchema) -> bytes:
+        left, right, top, bottom = self.config.margins_cm
+        with track("pdf_layout") as span:
+            pdf_bytes = BytesIO()
+            doc = SimpleDocTemplate(pdf_bytes, pagesize=letter,
+                                    rightMargin=right*cm, leftMargin=left*cm,
+                                    topMargin=top*cm, bottomMargin=bottom*cm)
+            story = []
+            for layout in self.layouts:
+                story.extend(layout(resume_data, self.styles))
+            doc.build(story)
+            span.payload_bytes = pdf_bytes.tell()
+            return pdf_bytes.getvalue()
+
+
+_templates: Dict[str, ResumeTemplate] = {}
+_templates_lock = threading.Lock()
+# Rendered PDFs keyed by (template fingerprint, resume hash); shared across templates and sessions
+_rendered_pdfs = SingleFlight(max_results=128)
+
+
+def register_template(config: TemplateConfig) -> ResumeTemplate:
+    """
+    Compiles and registers a template under its name, replacing any previous template with that name.
+    """
+    template = ResumeTemplate(config)
+    with _templates_lock:
+        _templates[config.name] = template
+    return template
+
+
+def get_template(name: str = DEFAULT_TEMPLATE) -> ResumeTemplate:
+    with _templates_lock:
+        if name not in _templates:
+            raise KeyError(f"Unknown resume template '{name}'. Available: {', '.join(sorted(_templates))}")
+        return _templates[name]
+
+
+def list_templates() -> List[str]:
+    with _templates_lock:
+        return sorted(_templates)
+
+
+def render_resume_pdf(resume_data: ResumeSchema, template_name: str = DEFAULT_TEMPLATE) -> bytes:
+    """
+    Returns the PDF bytes for a resume, laying it out only the first time a given resume and template are seen.
+    """
+    with track("render_pdf") as span:
+        template = get_template(template_name)
+        resume_hash = hashlib.sha256(resume_data.model_dump_json().encode("utf-8")).hexdigest()
+        pdf = _rendered_pdfs.do((template.fingerprint, resume_hash), template.render, resume_data)
+        span.payload_bytes = len(pdf)
+        return pdf
+
+
+def resume_file_name(resume_data: ResumeSchema) -> str:
+    today_date = datetime.today().strftime('%Y-%m-%d')
+    return f"{resume_data.name}_Resume_{today_date}.pdf"
+
+
+def save_resume_to_pdf(resume_data: ResumeSchema, template_name: str = DEFAULT_TEMPLATE):
+    file_name = resume_file_name(resume_data)
+    pdf_bytes = BytesIO(render_resume_pdf(resume_data, template_name))
+    return pdf_bytes, file_name
+
+
+def pdf_cache_stats() -> Dict[str, int]:
+    return _rendered_pdfs.stats()
+
+
+def clear_pdf_cache() -> None:
+    _rendered_pdfs.clear()
+
+
+register_template(TemplateConfig(
+    name="classic",
+    sections=("header", "summary", "experience", "projects", "education", "certificates", "involvement", "skills")
+))
+register_template(TemplateConfig(
+    name="compact",
+    sections=("header", "summary", "skills", "experience", "projects", "education", "certificates", "involvement"),
+    heading_size=12,
+    heading_leading=15,
+    body_size=9,
+    body_leading=11,
+    section_gap=6,
+    margins_cm=(1.5, 1.5, 1, 1)
+))
@@ -0,0 +1,238 @@
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from utils.constants import (
+    CONTACT_INFO_NOTE,
+    EXPERIENCE_NOTE,
+    MULTI_TARGET_PROMPT_INTRO,
+    MULTI_TARGET_PROMPT_OUTRO,
+    RESUME_PROMPT_INTRO,
+    RESUME_PROMPT_OUTRO,
+    RESUME_PROMPT_TOKEN_BUDGET,
+    TARGET_BLOCK_TOKEN_RESERVE,
+    TARGET_JOB_BLOCK
+)
+from utils.job_keywords import CONDENSE_MIN_CHARS, INDEX_VERSION, condense_job_description
+from utils.token_accounting import count_tokens, truncate_to_tokens
+
+
+@dataclass(frozen=True)
+class PromptSection:
+    """
+    One section of the resume prompt. Sections with a truncate_field may be shortened (lowest priority first) down to
+    min_tokens when the prompt is over budget; priority 0 sections are never shortened.
+    """
+    title: str
+    fields: Tuple[str, ...]
+    note: str = ""
+    truncate_field: Optional[str] = None
+    priority: int = 0
+    min_tokens: int = 0
+
+
+RESUME_SECTIONS: Tuple[PromptSection, ...] = (
+    PromptSection("Contact Info", ("name", "email", "phone_number", "linkedin_profile", "github_profile"), CONTACT_INFO_NOTE),
+    PromptSection("Experience", ("experience",), EXPERIENCE_NOTE, "experience", priority=9, min_tokens=400),
+    PromptSection("Projects", ("projects",), truncate_field="projects", priority=6, min_tokens=200),
+    PromptSection("Education", ("education",), truncate_field="education", priority=8, min_tokens=100),
+    PromptSection("Skills", ("skills",), truncate_field="skills", priority=7, min_tokens=100),
+    PromptSection("Coursework", ("coursework",), truncate_field="coursework", priority=2),
+    PromptSection("Certifications", ("certifications",), truncate_field="certifications", priority=4, min_tokens=50),
+    PromptSection("Involvement", ("involvement",), truncate_field="involvement", priority=3),
+    PromptSection("Summary", ("summary",), truncate_field="summary", priority=5, min_tokens=50),
+    PromptSection("Target Job", ("target_job_title", "target_job_description"), truncate_field="target_job_description", priority=6, min_tokens=300)
+)
+
+# The multi-target prompt: every section but the target job forms the shared prefix
+CANDIDATE_SECTION_TITLES = tuple(section.title for section in RESUME_SECTIONS if section.title != "Target Job")
+
+
+@dataclass
+class PromptBuild:
+    text: str
+    prompt_tokens: int
+    omitted: List[str] = field(default_factory=list)
+    truncated: List[str] = field(default_factory=list)
+    prefix_tokens: int = 0
+
+
+_counters = {"builds": 0, "over_budget": 0, "truncated_sections": 0, "omitted_sections": 0, "condensed_job_descriptions": 0}
+_counters_lock = threading.Lock()
+
+
+def normalize_whitespace(text: Any) -> str:
+    """
+    Collapses runs of spaces and blank lines and strips each line. None and the literal "None" become "".
+    """
+    if text is None:
+        return ""
+    text = str(text)
+    if text.strip() == "None":
+        return ""
+    lines = [re.sub(r"[ \t\u00a0]+", " ", line).strip() for line in text.splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def _render(
+    intro: str,
+    sections: List[Tuple[PromptSection, Dict[str, str]]],
+    format_instructions: str,
+    outro: str
+) -> str:
+    parts = [intro.strip()]
+    for section, values in sections:
+        body = "\n".join(values[name] for name in section.fields if values[name])
+        if section.note:
+            body = f"{body}\n{section.note}"
+        parts.append(f"{section.title}:\n{body}")
+    parts.append(outro)
+    if format_instructions:
+        parts.append(format_instructions)
+    return "\n\n".join(parts)
+
+
+def select_sections(section_titles: Optional[Iterable[str]] = None) -> Tuple[PromptSection, ...]:
+    if section_titles is None:
+        return RESUME_SECTIONS
+    section_titles = set(section_titles)
+    return tuple(section for section in RESUME_SECTIONS if section.title in section_titles)
+
+
+def _budget() -> int:
+    return int(os.getenv("RESUME_PROMPT_TOKEN_BUDGET", RESUME_PROMPT_TOKEN_BUDGET))
+
+
+def resume_prompt_fingerprint() -> str:
+    """
+    Changes with the prompt text, section layout or effective token budget (RESUME_PROMPT_TOKEN_BUDGET included), so
+    results cached for a different prompt are never served.
+    """
+    return repr((
+        RESUME_PROMPT_INTRO,
+        RESUME_PROMPT_OUTRO,
+        RESUME_SECTIONS,
+        _budget(),
+        INDEX_VERSION,
+        CONDENSE_MIN_CHARS
+    ))
+
+
+def multi_target_prompt_fingerprint() -> str:
+    return repr((
+        resume_prompt_fingerprint(),
+        MULTI_TARGET_PROMPT_INTRO,
+        MULTI_TARGET_PROMPT_OUTRO,
+        TARGET_JOB_BLOCK,
+        TARGET_BLOCK_TOKEN_RESERVE
+    ))
+
+
+def build_resume_prompt(
+    resume_input: Dict[str, Any],
+    format_instructions: str = "",
+    token_budget: int = None,
+    model_name: str = "gpt-4o-mini",
+    section_titles: Optional[Iterable[str]] = None,
+    outro: str = RESUME_PROMPT_OUTRO,
+    intro: str = RESUME_PROMPT_INTRO
+) -> PromptBuild:
+    """
+    Renders the resume prompt from a ResumeInput dump. Empty sections are left out, whitespace is normalized, and when
+    the prompt exceeds the token budget the lowest-priority sections are shortened until it fits. Long job descriptions
+    are replaced by their condensed requirements and keywords (see utils.job_keywords). section_titles limits
+    the prompt to a subset of sections and intro/outro replace the opening and closing instructions (used by
+    per-section and multi-target generation).
+    """
+    token_budget = token_budget or _budget()
+    values = {name: normalize_whitespace(value) for name, value in resume_input.items()}
+    description = values.get("target_job_description", "")
+    if description:
+        values["target_job_description"] = condense_job_description(description)
+    condensed = values.get("target_job_description", "") != description
+    intro = intro.format(target_job_title=values.get("target_job_title") or "target")
+
+    sections, omitted = [], []
+    for section in select_sections(section_titles):
+        section_values = {name: values.get(name, "") for name in section.fields}
+        if any(section_values.values()):
+            sections.append((section, section_values))
+        else:
+            omitted.append(section.title)
+
+    text = _render(intro, sections, format_instructions, outro)
+    prompt_tokens = count_tokens(text, model_name)
+    truncated = []
+    over_budget = prompt_tokens > token_budget
+
+    for section, section_values in sorted(
+        (item for item in sections if item[0].truncate_field),
+        key=lambda item: item[0].priority
+    ):
+        overflow = prompt_tokens - token_budget
+        if overflow <= 0:
+            break
+        name = section.truncate_field
+        current = count_tokens(section_values[name], model_name)
+        allowed = max(section.min_tokens, current - overflow)
+        if allowed >= current:
+            continue
+        section_values[name] = truncate_to_tokens(section_values[name], allowed, model_name)
+        truncated.append(section.title)
+        text = _render(intro, sections, format_instructions, outro)
+        prompt_tokens = count_tokens(text, model_name)
+
+    with _counters_lock:
+        _counters["builds"] += 1
+        _counters["over_budget"] += int(over_budget)
+        _counters["truncated_sections"] += len(truncated)
+        _counters["omitted_sections"] += len(omitted)
+        _counters["condensed_job_descriptions"] += int(condensed)
+    if truncated:
+        print(f"Truncated {', '.join(truncated)} to fit the {token_budget}-token prompt budget ({prompt_tokens} tokens).")
+
+    return PromptBuild(text=text, prompt_tokens=prompt_tokens, omitted=omitted, truncated=truncated)
+
+
+def build_multi_target_prompt(
+    resume_input: Dict[str, Any],
+    format_instructions: str = "",
+    token_budget: int = None,
+    model_name: str = "gpt-4o-mini"
+) -> PromptBuild:
+    """
+    Renders a resume prompt whose candidate block, closing instruction and format instructions come first and the target
+    job last. For one candidate the prefix is byte-identical whatever the target, which lets provider-side prompt
+    caching serve it for every target after the first. The candidate block is budgeted without the target, so the
+    target never changes how it is truncated.
+    """
+    token_budget = token_budget or _budget()
+    candidate = {name: value for name, value in resume_input.items() if not name.startswith("target_job")}
+    prefix = build_resume_prompt(
+        candidate,
+        format_instructions,
+        token_budget=token_budget - TARGET_BLOCK_TOKEN_RESERVE,
+        model_name=model_name,
+        section_titles=CANDIDATE_SECTION_TITLES,
+        outro=MULTI_TARGET_PROMPT_OUTRO,
+        intro=MULTI_TARGET_PROMPT_INTRO
+    )
+    description = condense_job_description(normalize_whitespace(resume_input.get("target_job_description")))
+    target = TARGET_JOB_BLOCK.format(
+        target_job_title=normalize_whitespace(resume_input.get("target_job_title")) or "Not specified",
+        target_job_description=truncate_to_tokens(description, TARGET_BLOCK_TOKEN_RESERVE - 50, model_name)
+    )
+    text = f"{prefix.text}\n\n{target}"
+    return PromptBuild(
+        text=text,
+        prompt_tokens=count_tokens(text, model_name),
+        omitted=prefix.omitted,
+        truncated=prefix.truncated,
+        prefix_tokens=prefix.prompt_tokens
+    )
+
+
+def prompt_builder_stats() -> Dict[str, int]:
+    with _counters_lock:
+        return dict(_counters)
@@ -0,0 +1,434 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from pydantic import ConfigDict
+from utils.metrics import metrics
+from utils.token_accounting import count_tokens
+
+
+@dataclass(frozen=True)
+class ModelQuota:
+    """
+    Requests and tokens per minute allowed for a model, and the bounds for its adaptive concurrency limit.
+    """
+    rpm: int = 500
+    tpm: int = 200_000
+    initial_concurrency: int = 8
+    max_concurrency: int = 32
+    min_concurrency: int = 1
+
+
+# Account-wide defaults for the models this app uses; RATE_LIMIT_RPM / RATE_LIMIT_TPM override them for every model
+DEFAULT_QUOTAS: Dict[str, ModelQuota] = {
+    "gpt-4o-mini": ModelQuota(rpm=500, tpm=200_000),
+    "gpt-4o": ModelQuota(rpm=500, tpm=30_000)
+}
+
+# Completion tokens reserved up front when a call does not set max_tokens; reconciled with the real usage afterwards
+DEFAULT_COMPLETION_ESTIMATE = 1000
+
+
+class TokenBucket:
+    """
+    Refills continuously at rate units per second up to capacity. take() may drive the level negative (a debt) when a
+    reservation is reconciled with more usage than estimated; callers then wait for the debt to refill.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+    def drain(self, now: float) -> None:
+        self._refill(now)
+        self.level = min(self.level, 0.0)
+
+
+class ModelLimiter:
+    """
+    Process-wide limiter for one model: request and token buckets sized from the model's per-minute quota, plus an
+    AIMD concurrency limit that halves on 429s or latency spikes and grows by one slot per window of successes.
+    """
+
+    def __init__(self, model_name: str, quota: ModelQuota, latency_factor: float = 2.0):
+        self.model_name = model_name
+        self.quota = quota
+        # Ten seconds of burst keeps a cold start from spending the whole minute's quota at once
+        self.requests = TokenBucket(quota.rpm / 60, max(1, quota.rpm / 6))
+        self.tokens = TokenBucket(quota.tpm / 60, max(1, quota.tpm / 6))
+        self.limit = float(quota.initial_concurrency)
+        self.in_flight = 0
+        self.latency_factor = latency_factor
+        self.latency_ewma: Optional[float] = None
+        self.blocked_until = 0.0
+        self._cond = threading.Condition()
+        self.counters = {
+            "requests": 0,
+            "rate_limited": 0,
+            "retries": 0,
+            "failures": 0,
+            "wait_seconds": 0.0
+        }
+
+    def _admit(self, estimated_tokens: int) -> float:
+        """
+        Takes a slot and reserves capacity if possible and returns 0, otherwise returns how long to wait. Caller holds
+        the condition lock.
+        """
+        now = time.monotonic()
+        wait = max(
+            self.blocked_until - now,
+            self.requests.wait_time(1, now),
+            self.tokens.wait_time(estimated_tokens, now)
+        )
+        if wait > 0:
+            return wait
+        if self.in_flight >= int(self.limit):
+            return -1.0
+        self.requests.take(1)
+        self.tokens.take(min(estimated_tokens, self.tokens.capacity))
+        self.in_flight += 1
+        return 0.0
+
+    def acquire(self, estimated_tokens: int) -> float:
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                wait = self._admit(estimated_tokens)
+                if wait == 0:
+                    break
+                # -1 means waiting on a free slot, which release() signals
+                self._cond.wait(timeout=None if wait < 0 else min(wait, 1.0))
+        waited = time.monotonic() - start
+        self._record_wait(waited)
+        return waited
+
+    async def aacquire(self, estimated_tokens: int) -> float:
+        start = time.monotonic()
+        while True:
+            with self._cond:
+                wait = self._admit(estimated_tokens)
+            if wait == 0:
+                break
+            await asyncio.sleep(0.05 if wait < 0 else min(wait, 1.0))
+        waited = time.monotonic() - start
+        self._record_wait(waited)
+        return waited
+
+    def _record_wait(self, waited: float) -> None:
+        with self._cond:
+            self.counters["requests"] += 1
+            self.counters["wait_seconds"] += waited
+        if waited:
+            metrics.observe(f"rate_limit_wait:{self.model_name}", waited)
+
+    def release(
+        self,
+        estimated_tokens: int,
+        actual_tokens: Optional[int] = None,
+        latency: Optional[float] = None,
+        rate_limited: bool = False,
+        retry_after: Optional[float] = None,
+        failed: bool = False
+    ) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if actual_tokens is not None:
+                # Settle the reservation against what the call really used
+                self.tokens.take(actual_tokens - min(estimated_tokens, self.tokens.capacity))
+
+            if rate_limited:
+                self.counters["rate_limited"] += 1
+                self.limit = max(self.quota.min_concurrency, self.limit / 2)
+                self.blocked_until = max(self.blocked_until, now + (retry_after or 1.0))
+                self.requests.drain(now)
+            elif failed:
+                self.counters["failures"] += 1
+            elif latency is not None:
+                if self.latency_ewma is not None and latency > self.latency_factor * self.latency_ewma:
+                    self.limit = max(self.quota.min_concurrency, self.limit * 0.75)
+                else:
+                    self.limit = min(self.quota.max_concurrency, self.limit + 1 / self.limit)
+                self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            now = time.monotonic()
+            self.requests._refill(now)
+            self.tokens._refill(now)
+            return {
+                **{key: round(value, 3) for key, value in self.counters.items()},
+                "concurrency_limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "requests_available": round(self.requests.level, 1),
+                "tokens_available": round(self.tokens.level),
+                "latency_ewma": round(self.latency_ewma, 3) if self.latency_ewma is not None else None
+            }
+
+
+class RateLimiter:
+    """
+    Registry of per-model limiters shared by every chat model in the process. Buckets are per process, so when the
+    account quota is split across several processes (the API's uvicorn workers) each one gets quota / processes.
+    """
+
+    def __init__(
+        self,
+        quotas: Dict[str, ModelQuota] = None,
+        max_retries: int = 6,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        processes: int = 1
+    ):
+        self.quotas = dict(quotas or DEFAULT_QUOTAS)
+        self.processes = max(1, processes)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._limiters: Dict[str, ModelLimiter] = {}
+        self._lock = threading.Lock()
+
+    def quota_for(self, model_name: str) -> ModelQuota:
+        """
+        This process's share of the model's account-wide quota.
+        """
+        quota = self.quotas.get(model_name, ModelQuota())
+        rpm, tpm = os.getenv("RATE_LIMIT_RPM"), os.getenv("RATE_LIMIT_TPM")
+        return ModelQuota(
+            rpm=max(1, int(rpm or quota.rpm) // self.processes),
+            tpm=max(1, int(tpm or quota.tpm) // self.processes),
+            initial_concurrency=quota.initial_concurrency,
+            max_concurrency=quota.max_concurrency,
+            min_concurrency=quota.min_concurrency
+        )
+
+    def get(self, model_name: str) -> ModelLimiter:
+        with self._lock:
+            limiter = self._limiters.get(model_name)
+            if limiter is None:
+                limiter = self._limiters[model_name] = ModelLimiter(model_name, self.quota_for(model_name))
+            return limiter
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        # Full jitter, but never sooner than the server asked for
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        return max(delay, retry_after or 0.0)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {name: limiter.stats() for name, limiter in limiters.items()}
+
+
+# RESUME_API_WORKERS is set by `python -m api` for its workers; Streamlit and scripts run a single process
+rate_limiter = RateLimiter(
+    max_retries=int(os.getenv("RATE_LIMIT_MAX_RETRIES", 6)),
+    processes=int(os.getenv("RESUME_API_WORKERS", 1))
+)
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        response = getattr(error, "response", None)
+        status = getattr(response, "status_code", None)
+    return status
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    for header in ("retry-after-ms", "retry-after"):
+        value = headers.get(header)
+        if value is None:
+            continue
+        try:
+            seconds = float(value)
+        except ValueError:
+            continue
+        return seconds / 1000 if header.endswith("-ms") else seconds
+    return None
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    return _status_code(error) == 429 or type(error).__name__ == "RateLimitError"
+
+
+def is_retryable(error: BaseException) -> bool:
+    status = _status_code(error)
+    if status is not None:
+        return status == 429 or status >= 500
+    return type(error).__name__ in ("APIConnectionError", "APITimeoutError", "ConnectError", "ReadTimeout")
+
+
+def _usage_tokens(result: ChatResult) -> Optional[int]:
+    for generation in result.generations:
+        usage = getattr(generation.message, "usage_metadata", None)
+        if usage:
+            return usage.get("total_tokens") or usage.get("input_tokens", 0) + usage.get("output_tokens", 0)
+    return None
+
+
+class RateLimitedChatModel(BaseChatModel):
+    """
+    Wraps a chat model so every call goes through the shared per-model limiter: a pre-call token estimate reserves
+    request and token capacity, 429s shrink the concurrency limit and pause the model, and retryable failures are
+    retried with jittered backoff instead of surfacing to the user.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    inner: BaseChatModel
+    model_name: str
+    limiter: Any = None
+    policy: Any = None
+    completion_estimate: int = DEFAULT_COMPLETION_ESTIMATE
+
+    @property
+    def _llm_type(self) -> str:
+        return f"rate-limited-{self.inner._llm_type}"
+
+    def _estimate(self, messages: List[BaseMessage], kwargs: Dict[str, Any]) -> int:
+        prompt = "\n".join(str(message.content) for message in messages)
+        completion = kwargs.get("max_tokens") or getattr(self.inner, "max_tokens", None) or self.completion_estimate
+        return count_tokens(prompt, self.model_name) + completion
+
+    @contextmanager
+    def _slot(self, estimate: int) -> Iterator[Dict[str, Any]]:
+        self.limiter.acquire(estimate)
+        outcome: Dict[str, Any] = {"start": time.monotonic()}
+        try:
+            yield outcome
+        except BaseException as e:
+            self._release(estimate, outcome, e)
+            raise
+        self._release(estimate, outcome, None)
+
+    @asynccontextmanager
+    async def _aslot(self, estimate: int) -> AsyncIterator[Dict[str, Any]]:
+        await self.limiter.aacquire(estimate)
+        outcome: Dict[str, Any] = {"start": time.monotonic()}
+        try:
+            yield outcome
+        except BaseException as e:
+            self._release(estimate, outcome, e)
+            raise
+        self._release(estimate, outcome, None)
+
+    def _release(self, estimate: int, outcome: Dict[str, Any], error: Optional[BaseException]) -> None:
+        if isinstance(error, GeneratorExit):
+            # The consumer stopped reading a stream; free the slot without judging the model
+            self.limiter.release(estimate, outcome.get("tokens"))
+        elif error is None:
+            self.limiter.release(estimate, outcome.get("tokens"), time.monotonic() - outcome["start"])
+        elif is_rate_limited(error):
+            self.limiter.release(estimate, rate_limited=True, retry_after=_retry_after(error))
+        else:
+            self.limiter.release(estimate, failed=True)
+
+    def _should_retry(self, error: BaseException, attempt: int) -> float:
+        """
+        Returns the backoff before the next attempt, or raises if the error is not retryable or retries are exhausted.
+        """
+        if not is_retryable(error) or attempt >= self.policy.max_retries:
+            raise error
+        self.limiter.counters["retries"] += 1
+        delay = self.policy.backoff(attempt, _retry_after(error))
+        print(f"OpenAI call to {self.model_name} failed ({type(error).__name__}); retrying in {delay:.1f}s.")
+        return delay
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        estimate = self._estimate(messages, kwargs)
+        attempt = 0
+        while True:
+            try:
+                with self._slot(estimate) as outcome:
+                    result = self.inner._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+                    outcome["tokens"] = _usage_tokens(result)
+                return result
+            except Exception as e:
+                time.sleep(self._should_retry(e, attempt))
+                attempt += 1
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        estimate = self._estimate(messages, kwargs)
+        attempt = 0
+        while True:
+            try:
+                async with self._aslot(estimate) as outcome:
+                    result = await self.inner._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+                    outcome["tokens"] = _usage_tokens(result)
+                return result
+            except Exception as e:
+                await asyncio.sleep(self._should_retry(e, attempt))
+                attempt += 1
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        estimate = self._estimate(messages, kwargs)
+        attempt = 0
+        while True:
+            started = False
+            try:
+                with self._slot(estimate) as outcome:
+                    for chunk in self.inner._stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                        started = True
+                        usage = getattr(chunk.message, "usage_metadata", None)
+                        if usage:
+                            outcome["tokens"] = usage.get("total_tokens")
+                        yield chunk
+                return
+            except Exception as e:
+                # Once chunks have been yielded the caller has partial output, so only retry a stream that never started
+                if started:
+                    raise
+                time.sleep(self._should_retry(e, attempt))
+                attempt += 1
+
+
+def rate_limited(llm: BaseChatModel, model_name: str, limiter: RateLimiter = None) -> RateLimitedChatModel:
+    limiter = limiter or rate_limiter
+    return RateLimitedChatModel(inner=llm, model_name=model_name, limiter=limiter.get(model_name), policy=limiter)
@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Union
+
+
+# Anchored to the project, not the working directory, so every tool run from anywhere shares (and can clear) one store
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_PATH = os.path.join(PROJECT_ROOT, ".cache", "llm_cache.sqlite3")
+
+
+def default_cache_path() -> Optional[str]:
+    """
+    The on-disk store path from LLM_CACHE_PATH, falling back to DEFAULT_CACHE_PATH; an empty value means memory only.
+    """
+    return os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH) or None
+
+
+def prompt_version(template: str) -> str:
+    """
+    Returns a short, stable version tag for a prompt template so edits to the prompt invalidate old cache entries.
+    """
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()[:12]
+
+
+def make_cache_key(payload: Any, prompt: str, model_name: str) -> str:
+    """
+    Builds a content-addressed key from a JSON-serializable payload, the prompt template and the model name.
+    """
+    body = json.dumps(
+        {"payload": payload, "prompt_version": prompt_version(prompt), "model": model_name},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache for serialized LLM results: a bounded in-memory LRU in front of an on-disk SQLite store with TTL and
+    size-based eviction. Values are strings (e.g. a pydantic model's JSON); callers are responsible for (de)serializing.
+    The store is opened on first use; db_path may be a callable resolved then, so the environment at import time does
+    not decide where (or whether) it is created.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        max_entries: int = 256,
+        db_path: Union[str, Callable[[], Optional[str]], None] = default_cache_path,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_db_bytes: int = 50 * 1024 * 1024
+    ):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_db_bytes = max_db_bytes
+        self._memory: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_path = db_path
+        self._db_resolved = False
+        self.counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0
+        }
+
+    def _ensure_db(self) -> None:
+        # Called with the lock held
+        if self._db_resolved:
+            return
+        self._db_resolved = True
+        db_path = self._db_path() if callable(self._db_path) else self._db_path
+        if db_path:
+            self._open_db(db_path)
+
+    def _open_db(self, db_path: str) -> None:
+        try:
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+        except sqlite3.Error as e:
+            print(f"Encountered an error while opening the result cache at {db_path}. Using memory only.")
+            print(f"Error: {e}")
+            self._db = None
+
+    def _remember(self, key: str, created_at: float, value: str) -> None:
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            self._ensure_db()
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.counters["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT value, created_at FROM cache WHERE namespace = ? AND key = ?",
+                        (self.namespace, key)
+                    ).fetchone()
+                    if row is not None:
+                        value, created_at = row
+                        if now - created_at <= self.ttl_seconds:
+                            self._db.execute(
+                                "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                                (now, self.namespace, key)
+                            )
+                            self._remember(key, created_at, value)
+                            self.counters["disk_hits"] += 1
+                            return value
+                        self._db.execute(
+                            "DELETE FROM cache WHERE namespace = ? AND key = ?",
+                            (self.namespace, key)
+                        )
+                except sqlite3.Error as e:
+                    print(f"Encountered an error while reading the result cache.")
+                    print(f"Error: {e}")
+
+            self.counters["misses"] += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._ensure_db()
+            self._remember(key, now, value)
+            self.counters["writes"] += 1
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?)",
+                    (self.namespace, key, value, len(value), now, now)
+                )
+                self._evict_disk(now)
+            except sqlite3.Error as e:
+                print(f"Encountered an error while writing the result cache.")
+                print(f"Error: {e}")
+
+    def _evict_disk(self, now: float) -> None:
+        expired = self._db.execute(
+            "DELETE FROM cache WHERE created_at < ?",
+            (now - self.ttl_seconds,)
+        ).rowcount
+        self.counters["evictions"] += max(expired, 0)
+
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_db_bytes:
+            return
+        # Drop least recently used rows until the store fits its budget again
+        for namespace, key, size in self._db.execute(
+            "SELECT namespace, key, size FROM cache ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total <= self.max_db_bytes:
+                break
+            self._db.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key))
+            total -= size
+            self.counters["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ensure_db()
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self.counters)
+            stats["memory_entries"] = len(self._memory)
+            lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+            stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+            return stats
+
+
+resume_cache = ResultCache("resume_builder")
+reader_cache = ResultCache("resume_reader")
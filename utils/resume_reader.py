@@ -1,29 +1,39 @@
-import os
-from typing import List
-from langchain_openai import ChatOpenAI
+import hashlib
+from functools import lru_cache
+from typing import Iterable, Tuple, Type, Union
+from pydantic import create_model
 from langchain.prompts import PromptTemplate
 from langchain_core.documents import Document
 from langchain.output_parsers import PydanticOutputParser
-from langchain_core.runnables import Runnable
-from schemas import ResumeInput
+from langchain_core.runnables import RunnableSerializable
+from utils.llm_registry import ChainRegistry, chain_registry
+from utils.metrics import track
+from utils.output_repair import with_output_repair
+from utils.pdf_extract import extract_pdf_links, iter_pdf_pages, open_pdf
+from utils.single_flight import SingleFlight
+from utils.contact_extract import CONTACT_FIELDS, extract_contact_fields, record_contact_resolution
+from utils.result_cache import make_cache_key, reader_cache
+from utils.token_accounting import TokenUsageRecorder
+from schemas import ResumeInput, ResumeSections
 
 
-def analyze_resume_content(pdf_docs: List[Document]):
-    """Uses OpenAI to extract structured information from the resume text."""
-    prompt_template = """
+RESUME_READER_CHAIN = "resume_reader"
+RESUME_READER_MODEL = "gpt-4o-mini"
+
+RESUME_READER_PROMPT = """
     You are a professional resume reader. Analyze the following resume content and extract the following information:
-    
+
     Special Instructions:
     - When presented with a link, return the URL, not markdown format.
     - When given a list of items, return each item on a separate line.
     - When given experience, respond as a string where each experience is separated by a new line and each experience includes accomplishments.
-        - Example: Data Analyst at Azure Capital (2023-2024): Analyzed financial data to identify trends and make recommendations. 
+        - Example: Data Analyst at Azure Capital (2023-2024): Analyzed financial data to identify trends and make recommendations.
         - Example: Software Engineer Intern at Tech Solutions Inc. (2022-2023): Developed web applications using React and Node.js.
     - When given education, list out the degree and the school. Do not make up dates.
     - When given skills, list out the skills and the proficiency. Do not make up numbers.
-    
+
     Any fields without relevant information should be an empty string
-    
+
     Format Instructions:
     {format_instructions}
 
@@ -34,30 +44,103 @@ def analyze_resume_content(pdf_docs: List[Document]):
     Return the extracted information in a structured format.
     """
 
-    response_schema = PydanticOutputParser(pydantic_object=ResumeInput)
-    
+
+@lru_cache(maxsize=None)
+def _sections_model(extra_fields: Tuple[str, ...]) -> Type[ResumeSections]:
+    """
+    Returns the LLM output schema: the free-text sections plus any contact fields the local pass left unresolved.
+    """
+    if not extra_fields:
+        return ResumeSections
+    return create_model("ResumeSections", __base__=ResumeSections, **{field: (str, "") for field in extra_fields})
+
+
+def _build_resume_reader_chain(
+    registry: ChainRegistry,
+    model_name: str = RESUME_READER_MODEL,
+    temperature: float = 0,
+    unresolved_fields: Tuple[str, ...] = CONTACT_FIELDS
+) -> RunnableSerializable:
+    response_schema = PydanticOutputParser(pydantic_object=_sections_model(tuple(unresolved_fields)))
+
     prompt = PromptTemplate(
-        template=prompt_template,
+        template=RESUME_READER_PROMPT,
         input_variables=["content"],
         partial_variables={"format_instructions": response_schema.get_format_instructions()}
     )
 
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0,
-        model_kwargs={
-            "response_format": {"type": "json_object"}
-        }
+    llm = registry.get_llm(
+        model_name,
+        temperature,
+        response_format={"type": "json_object"}
     )
 
-    chain = (
-        prompt 
-        | llm 
-        | response_schema
-    ).with_config({"run_name": "Resume Parser"})
+    chain = with_output_repair(
+        prompt,
+        llm,
+        response_schema.pydantic_object,
+        RESUME_READER_CHAIN
+    ).with_config({"run_name": "Resume Parser", "callbacks": [TokenUsageRecorder(RESUME_READER_CHAIN)]})
+    return chain
+
 
-    content = "\n".join([doc.page_content for doc in pdf_docs])
-    
-    resume_info = chain.invoke({"content": content})
+chain_registry.register(RESUME_READER_CHAIN, _build_resume_reader_chain)
 
-    return resume_info
+# Parsed PDFs keyed by file digest, shared by every session (and API request) in the process
+_parsed_uploads = SingleFlight(max_results=128)
+
+
+def analyze_resume_content(pages: Iterable[Union[str, Document]], links: Iterable[str] = ()):
+    """
+    Extracts structured information from the resume text. Contact fields are resolved locally from the text and the
+    PDF's link targets first; the LLM is only asked for the free-text sections and whatever contact fields remain.
+    Pages may be plain strings or Documents.
+    """
+    content = "\n".join(page.page_content if isinstance(page, Document) else page for page in pages)
+    links = list(links)
+
+    with track("analyze_resume_content") as span:
+        span.payload_bytes = len(content.encode("utf-8"))
+        cache_key = make_cache_key(
+            {"content": content, "links": links},
+            RESUME_READER_PROMPT,
+            chain_registry.cache_scope(RESUME_READER_MODEL)
+        )
+        cached = reader_cache.get(cache_key) if chain_registry.caches_results else None
+        if cached is not None:
+            return ResumeInput.model_validate_json(cached)
+
+        local_fields = extract_contact_fields(content, links)
+        record_contact_resolution(local_fields)
+        unresolved = tuple(field for field in CONTACT_FIELDS if field not in local_fields)
+
+        chain = chain_registry.get_chain(RESUME_READER_CHAIN, unresolved_fields=unresolved)
+        sections = chain.invoke({"content": content})
+        resume_info = ResumeInput(**{**sections.model_dump(), **local_fields})
+        if chain_registry.caches_results:
+            reader_cache.set(cache_key, resume_info.model_dump_json(exclude_none=True))
+
+        return resume_info
+
+
+def _parse_resume_bytes(file_bytes: bytes) -> ResumeInput:
+    # One parse serves both the link annotations and the page text, which streams straight into the analyzer
+    reader = open_pdf(file_bytes)
+    links = extract_pdf_links(reader)
+    pages = iter_pdf_pages(reader)
+
+    # Call LLM to Analyze
+    result = analyze_resume_content(pages, links)
+    print("Successfully analyzed resume content.")
+
+    return result
+
+
+def parse_resume_pdf(file_bytes: bytes) -> ResumeInput:
+    """
+    Extracts and analyzes a resume PDF once per distinct file. Reruns and concurrent uploads of the same bytes reuse the
+    memoized (or in-flight) result keyed by the file's SHA-256 digest. Raises PDFLimitError for unreadable or oversized
+    files.
+    """
+    digest = hashlib.sha256(file_bytes).hexdigest()
+    return _parsed_uploads.do(digest, _parse_resume_bytes, file_bytes)
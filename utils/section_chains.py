@@ -0,0 +1,281 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Tuple, Type
+from pydantic import BaseModel
+from langchain_core.prompt_values import StringPromptValue
+from langchain_core.runnables import RunnableLambda, RunnableSerializable
+from langchain.output_parsers import PydanticOutputParser
+from utils.ai import DEFAULT_MODEL, RESUME_COMPLETE
+from utils.llm_registry import ChainRegistry, chain_registry
+from utils.metrics import track
+from utils.output_repair import with_output_repair
+from utils.prompt_builder import build_resume_prompt, resume_prompt_fingerprint, select_sections
+from utils.result_cache import ResultCache, make_cache_key
+from utils.token_accounting import TokenUsageRecorder
+from schemas import (
+    CertificatesSection,
+    ContactInfo,
+    EducationSection,
+    ExperienceSection,
+    InvolvementSection,
+    ProjectsSection,
+    ResumeInput,
+    ResumeSchema,
+    SkillsSection,
+    SummarySection
+)
+
+
+SECTION_CHAIN = "resume_section"
+
+
+@dataclass(frozen=True)
+class SectionSpec:
+    """
+    One independently generated part of the resume: its output model, the prompt sections it reads, and the
+    instruction closing its prompt. If none of its prompt sections has input, the section is left empty without an LLM
+    call. Output fields named in fallback_fields fall back to their empty value when the LLM leaves them out.
+    """
+    model: Type[BaseModel]
+    prompt_sections: Tuple[str, ...]
+    instruction: str
+    required_sections: Tuple[str, ...] = ()
+    fallback_fields: Tuple[str, ...] = ()
+
+
+SECTION_SPECS: Dict[str, SectionSpec] = {
+    "summary": SectionSpec(
+        SummarySection,
+        ("Summary", "Experience", "Skills", "Education", "Target Job"),
+        "Write a concise, two to three sentence professional summary tailored to the target job. Also return the candidate's location (city, state) if it is stated anywhere above, otherwise an empty string.",
+        fallback_fields=("location",)
+    ),
+    "experience": SectionSpec(
+        ExperienceSection,
+        ("Experience", "Target Job"),
+        "Write the experience section of the resume. Give each role concise, impactful bullet points tailored to the target job, using any quantifiable data provided. Do not invent numbers or dates.",
+        ("Experience",)
+    ),
+    "projects": SectionSpec(
+        ProjectsSection,
+        ("Projects", "Target Job"),
+        "Write the projects section of the resume, emphasizing what is most relevant to the target job. When presented links, return the URL, not markdown format.",
+        ("Projects",)
+    ),
+    "education": SectionSpec(
+        EducationSection,
+        ("Education", "Coursework"),
+        "Write the education section of the resume. Do not make up dates or locations; use an empty string when unknown.",
+        ("Education",)
+    ),
+    "certificates": SectionSpec(
+        CertificatesSection,
+        ("Certifications",),
+        "List the candidate's certifications. Do not make up dates; use an empty string when unknown.",
+        ("Certifications",)
+    ),
+    "involvement": SectionSpec(
+        InvolvementSection,
+        ("Involvement",),
+        "Write the involvement section of the resume (extracurricular activities, volunteer work, memberships).",
+        ("Involvement",)
+    ),
+    "skills": SectionSpec(
+        SkillsSection,
+        ("Skills", "Experience", "Target Job"),
+        "List the candidate's skills as short items, most relevant to the target job first. Only include skills supported by the information above."
+    )
+}
+
+_EMPTY_SECTIONS = {
+    "summary": {"summary": "", "location": ""},
+    "experience": {"experience": []},
+    "projects": {"projects": []},
+    "education": {"education": []},
+    "certificates": {"certificates": []},
+    "involvement": {"involvement": []},
+    "skills": {"skills": {"all_skills": []}}
+}
+
+section_cache = ResultCache("resume_section", max_entries=1024)
+
+
+def _build_section_chain(
+    registry: ChainRegistry,
+    section: str = "summary",
+    model_name: str = DEFAULT_MODEL,
+    temperature: float = 0
+) -> RunnableSerializable:
+    spec = SECTION_SPECS[section]
+    response_schema = PydanticOutputParser(pydantic_object = spec.model)
+    format_instructions = response_schema.get_format_instructions()
+
+    def build(resume_input: dict) -> StringPromptValue:
+        prompt = build_resume_prompt(
+            resume_input,
+            format_instructions,
+            model_name = model_name,
+            section_titles = spec.prompt_sections,
+            outro = spec.instruction
+        )
+        return StringPromptValue(text = prompt.text)
+
+    llm = registry.get_llm(
+        model_name,
+        temperature,
+        response_format = {"type": "json_object"}
+    )
+    fallbacks = {name: _EMPTY_SECTIONS[section][name] for name in spec.fallback_fields}
+    chain = with_output_repair(
+        RunnableLambda(build, name = "ResumeSectionPrompt"),
+        llm,
+        spec.model,
+        f"{SECTION_CHAIN}:{section}",
+        lambda payload: fallbacks
+    ).with_config({"run_name": f"Resume Section ({section})", "callbacks": [TokenUsageRecorder(f"{SECTION_CHAIN}:{section}")]})
+    return chain
+
+
+chain_registry.register(SECTION_CHAIN, _build_section_chain)
+
+
+def _section_inputs(section: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The subset of the ResumeInput a section depends on; it is both the section's cache key and its prompt input.
+    """
+    fields = {"target_job_title"}
+    for prompt_section in select_sections(SECTION_SPECS[section].prompt_sections):
+        fields.update(prompt_section.fields)
+    return {name: payload.get(name) for name in sorted(fields)}
+
+
+def _has_input(section: str, inputs: Dict[str, Any]) -> bool:
+    required = SECTION_SPECS[section].required_sections
+    if not required:
+        return True
+    return any(inputs.get(name) for prompt_section in select_sections(required) for name in prompt_section.fields)
+
+
+def _cache_key(section: str, inputs: Dict[str, Any]) -> str:
+    spec = SECTION_SPECS[section]
+    version = repr((resume_prompt_fingerprint(), spec, spec.model.model_json_schema()))
+    return make_cache_key({"section": section, "inputs": inputs}, version, chain_registry.cache_scope(DEFAULT_MODEL))
+
+
+def _cached_section(section: str, inputs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if not _has_input(section, inputs):
+        return _EMPTY_SECTIONS[section]
+    if not chain_registry.caches_results:
+        return None
+    cached = section_cache.get(_cache_key(section, inputs))
+    if cached is not None:
+        return SECTION_SPECS[section].model.model_validate_json(cached).model_dump()
+    return None
+
+
+def _section_value(section: str, data: Dict[str, Any]) -> Any:
+    # Every section model wraps the ResumeSchema field of the same name
+    return data[section]
+
+
+def _store_section(section: str, inputs: Dict[str, Any], result: BaseModel) -> Dict[str, Any]:
+    if chain_registry.caches_results:
+        section_cache.set(_cache_key(section, inputs), result.model_dump_json())
+    return result.model_dump()
+
+
+def merge_sections(resume_input: ResumeInput, sections: Dict[str, Dict[str, Any]]) -> ResumeSchema:
+    """
+    Assembles a ResumeSchema from generated sections and the contact details already known from the input.
+    """
+    return ResumeSchema(
+        name = resume_input.name,
+        contact_info = ContactInfo(
+            location = sections["summary"]["location"],
+            phone_number = resume_input.phone_number or "",
+            email = resume_input.email or "",
+            linkedin_profile = resume_input.linkedin_profile or "",
+            github_profile = resume_input.github_profile or ""
+        ),
+        experience = sections["experience"]["experience"],
+        projects = sections["projects"]["projects"],
+        education = sections["education"]["education"],
+        certificates = sections["certificates"]["certificates"],
+        involvement = sections["involvement"]["involvement"],
+        skills = sections["skills"]["skills"],
+        summary = sections["summary"]["summary"] or None,
+        target_job_title = resume_input.target_job_title or "",
+        target_job_description = resume_input.target_job_description or ""
+    )
+
+
+def iter_resume_sections(resume_input: ResumeInput) -> Iterator[Tuple[str, Any]]:
+    """
+    Generates the resume section by section. Cached sections are yielded first, the remaining sub-chains run
+    concurrently and are yielded as each finishes, and the last pair is (RESUME_COMPLETE, ResumeSchema). Follows the
+    same protocol as utils.ai.stream_resume_chain so the preview can render either.
+    """
+    payload = resume_input.model_dump()
+    with track("generate_resume_sections") as span:
+        span.payload_bytes = len(resume_input.model_dump_json().encode("utf-8"))
+        sections: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, Dict[str, Any]] = {}
+        for section in SECTION_SPECS:
+            inputs = _section_inputs(section, payload)
+            cached = _cached_section(section, inputs)
+            if cached is not None:
+                sections[section] = cached
+                yield section, _section_value(section, cached)
+            else:
+                pending[section] = inputs
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="resume-section") as executor:
+                futures = {
+                    executor.submit(chain_registry.get_chain(SECTION_CHAIN, section = section).invoke, inputs): section
+                    for section, inputs in pending.items()
+                }
+                for future in as_completed(futures):
+                    section = futures[future]
+                    sections[section] = _store_section(section, pending[section], future.result())
+                    yield section, _section_value(section, sections[section])
+
+        yield RESUME_COMPLETE, merge_sections(resume_input, sections)
+
+
+def generate_resume_by_section(resume_input: ResumeInput) -> ResumeSchema:
+    """
+    Runs the per-section sub-chains concurrently and merges them into one ResumeSchema.
+    """
+    resume_data = None
+    for section, value in iter_resume_sections(resume_input):
+        if section == RESUME_COMPLETE:
+            resume_data = value
+    return resume_data
+
+
+async def agenerate_resume_by_section(resume_input: ResumeInput) -> ResumeSchema:
+    """
+    Async counterpart to generate_resume_by_section, for callers already running an event loop.
+    """
+    payload = resume_input.model_dump()
+    with track("generate_resume_sections") as span:
+        span.payload_bytes = len(resume_input.model_dump_json().encode("utf-8"))
+        sections: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, Dict[str, Any]] = {}
+        for section in SECTION_SPECS:
+            inputs = _section_inputs(section, payload)
+            cached = _cached_section(section, inputs)
+            if cached is not None:
+                sections[section] = cached
+            else:
+                pending[section] = inputs
+
+        results = await asyncio.gather(*(
+            chain_registry.get_chain(SECTION_CHAIN, section = section).ainvoke(inputs)
+            for section, inputs in pending.items()
+        ))
+        for (section, inputs), result in zip(pending.items(), results):
+            sections[section] = _store_section(section, inputs, result)
+        return merge_sections(resume_input, sections)
@@ -0,0 +1,267 @@
+import hashlib
+import os
+import shutil
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Type, TypeVar
+from pydantic import BaseModel
+from utils.result_cache import PROJECT_ROOT
+
+
+# Under the project .cache like the result cache, not wherever the app happens to be launched from
+DEFAULT_SPILL_DIR = os.path.join(PROJECT_ROOT, ".cache", "sessions")
+
+Model = TypeVar("Model", bound=BaseModel)
+
+
+@dataclass
+class _Blob:
+    size: int
+    data: Optional[bytes] = None
+    path: Optional[str] = None
+
+
+class _Session:
+    def __init__(self):
+        self.blobs: Dict[str, _Blob] = {}
+        self.last_access = time.time()
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(blob.size for blob in self.blobs.values() if blob.data is not None)
+
+    @property
+    def spilled_bytes(self) -> int:
+        return sum(blob.size for blob in self.blobs.values() if blob.data is None)
+
+
+class SessionStore:
+    """
+    Process-wide store for per-session state, kept as zlib-compressed JSON instead of live Pydantic objects. Each
+    session has a memory budget; when it is exceeded the largest values are spilled to disk. Sessions idle longer than
+    idle_seconds are spilled entirely, and sessions idle longer than expire_seconds are deleted. Spilled values are
+    read back (and re-admitted to memory) transparently on the next access.
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int = 64 * 1024,
+        idle_seconds: float = 300,
+        expire_seconds: float = 24 * 60 * 60,
+        spill_dir: Optional[str] = DEFAULT_SPILL_DIR,
+        sweep_interval: float = 30
+    ):
+        self.budget_bytes = budget_bytes
+        self.idle_seconds = idle_seconds
+        self.expire_seconds = expire_seconds
+        self.spill_dir = spill_dir
+        self.sweep_interval = sweep_interval
+        self._sessions: Dict[str, _Session] = {}
+        self._lock = threading.RLock()
+        self._last_sweep = time.time()
+        self.counters = {
+            "spilled": 0,
+            "reloaded": 0,
+            "expired": 0
+        }
+
+    @staticmethod
+    def encode(value: BaseModel) -> bytes:
+        # Fields left at their defaults (e.g. unset ResumeInput fields) are omitted; validation restores them
+        return zlib.compress(value.model_dump_json(exclude_defaults=True).encode("utf-8"))
+
+    @staticmethod
+    def decode(data: bytes, model: Type[Model]) -> Model:
+        return model.model_validate_json(zlib.decompress(data))
+
+    def _session_dir(self, session_id: str) -> str:
+        return os.path.join(self.spill_dir, hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:16])
+
+    def _spill(self, session_id: str, key: str, blob: _Blob) -> bool:
+        if blob.data is None or not self.spill_dir:
+            return False
+        directory = self._session_dir(session_id)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]}.json.z")
+            with open(f"{path}.tmp", "wb") as f:
+                f.write(blob.data)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            print(f"Encountered an error while spilling session state to {directory}.")
+            print(f"Error: {e}")
+            return False
+        blob.path, blob.data = path, None
+        self.counters["spilled"] += 1
+        return True
+
+    def _read(self, blob: _Blob) -> bytes:
+        if blob.data is not None:
+            return blob.data
+        with open(blob.path, "rb") as f:
+            data = f.read()
+        blob.data = data
+        self.counters["reloaded"] += 1
+        return data
+
+    def _enforce_budget(self, session_id: str, session: _Session, keep: str = None) -> None:
+        # Spill the largest values first, keeping the one just touched in memory when possible
+        candidates = sorted(
+            (item for item in session.blobs.items() if item[1].data is not None),
+            key=lambda item: (item[0] == keep, -item[1].size)
+        )
+        for key, blob in candidates:
+            if session.memory_bytes <= self.budget_bytes:
+                break
+            self._spill(session_id, key, blob)
+
+    def _touch(self, session_id: str) -> _Session:
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = _Session()
+        session.last_access = time.time()
+        return session
+
+    def put(self, session_id: str, key: str, value: BaseModel) -> None:
+        data = self.encode(value)
+        with self._lock:
+            session = self._touch(session_id)
+            old = session.blobs.get(key)
+            if old is not None and old.path:
+                _remove(old.path)
+            session.blobs[key] = _Blob(size=len(data), data=data)
+            self._enforce_budget(session_id, session, keep=key)
+        self.maybe_sweep()
+
+    def get(self, session_id: str, key: str, model: Type[Model]) -> Optional[Model]:
+        with self._lock:
+            session = self._touch(session_id)
+            blob = session.blobs.get(key)
+            if blob is None:
+                return None
+            try:
+                data = self._read(blob)
+            except OSError as e:
+                print(f"Encountered an error while reading spilled session state {key}.")
+                print(f"Error: {e}")
+                del session.blobs[key]
+                return None
+            self._enforce_budget(session_id, session, keep=key)
+        self.maybe_sweep()
+        return self.decode(data, model)
+
+    def has(self, session_id: str, key: str) -> bool:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return session is not None and key in session.blobs
+
+    def delete(self, session_id: str, key: str) -> None:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            blob = session.blobs.pop(key, None) if session else None
+            if blob is not None and blob.path:
+                _remove(blob.path)
+
+    def drop_session(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            if self.spill_dir:
+                shutil.rmtree(self._session_dir(session_id), ignore_errors=True)
+
+    def maybe_sweep(self) -> None:
+        if time.time() - self._last_sweep >= self.sweep_interval:
+            self.sweep()
+
+    def sweep(self, now: float = None) -> Dict[str, int]:
+        """
+        Spills every idle session to disk and deletes expired ones. Runs opportunistically from put/get, so no
+        background thread is needed.
+        """
+        now = now or time.time()
+        spilled, expired = 0, []
+        with self._lock:
+            self._last_sweep = now
+            for session_id, session in self._sessions.items():
+                idle = now - session.last_access
+                if idle >= self.expire_seconds:
+                    expired.append(session_id)
+                elif idle >= self.idle_seconds:
+                    spilled += sum(self._spill(session_id, key, blob) for key, blob in session.blobs.items())
+            for session_id in expired:
+                self.drop_session(session_id)
+            self.counters["expired"] += len(expired)
+        return {"spilled": spilled, "expired": len(expired)}
+
+    def footprint(self) -> Dict[str, Any]:
+        """
+        Per-session and total bytes held in memory and on disk, for sizing instances.
+        """
+        now = time.time()
+        with self._lock:
+            sessions = [
+                {
+                    "session": hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:8],
+                    "keys": sorted(session.blobs),
+                    "memory_bytes": session.memory_bytes,
+                    "spilled_bytes": session.spilled_bytes,
+                    "idle_s": round(now - session.last_access, 1)
+                }
+                for session_id, session in self._sessions.items()
+            ]
+            memory = [row["memory_bytes"] for row in sessions]
+            return {
+                "sessions": len(sessions),
+                "memory_bytes": sum(memory),
+                "spilled_bytes": sum(row["spilled_bytes"] for row in sessions),
+                "mean_session_bytes": round(sum(memory) / len(memory)) if memory else 0,
+                "max_session_bytes": max(memory, default=0),
+                "budget_bytes": self.budget_bytes,
+                "counters": dict(self.counters),
+                "per_session": sorted(sessions, key=lambda row: row["memory_bytes"], reverse=True)
+            }
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+session_store = SessionStore(
+    budget_bytes=int(os.getenv("SESSION_MEMORY_BUDGET_BYTES", 64 * 1024)),
+    idle_seconds=float(os.getenv("SESSION_IDLE_SECONDS", 300)),
+    spill_dir=os.getenv("SESSION_SPILL_DIR", DEFAULT_SPILL_DIR) or None
+)
+
+
+def current_session_id() -> str:
+    """
+    The Streamlit session id of the running script, or "default" outside a Streamlit run (e.g. scripts and tests).
+    """
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else "default"
+
+
+def save_state(key: str, value: BaseModel) -> None:
+    session_store.put(current_session_id(), key, value)
+
+
+def load_state(key: str, model: Type[Model]) -> Optional[Model]:
+    return session_store.get(current_session_id(), key, model)
+
+
+def has_state(key: str) -> bool:
+    return session_store.has(current_session_id(), key)
+
+
+def delete_state(key: str) -> None:
+    session_store.delete(current_session_id(), key)
+
+
+def clear_state() -> None:
+    session_store.drop_session(current_session_id())
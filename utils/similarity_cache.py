@@ -0,0 +1,200 @@
+import hashlib
+import itertools
+import json
+import os
+import re
+import threading
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import numpy as np
+
+
+EMBEDDING_DIM = 1024
+# Fields that describe the posting; every other ResumeInput field describes the candidate
+JOB_FIELDS = ("target_job_title", "target_job_description")
+# Misses for the same candidate this close to the job threshold are counted, to show whether it is too strict
+NEAR_MISS_MARGIN = 0.05
+
+_WORD = re.compile(r"[a-z0-9+#]+")
+
+
+def _features(text: str) -> Counter:
+    # Words plus character trigrams, so rewording and small edits move the vector only a little
+    words = _WORD.findall(text.lower())
+    features = Counter(words)
+    joined = f" {' '.join(words)} "
+    features.update(joined[i:i + 3] for i in range(len(joined) - 2))
+    return features
+
+
+def embed_text(text: str, dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """
+    Unit-length hashed feature vector of a text. Each feature is hashed to a bucket and a sign, so unrelated features
+    colliding in a bucket tend to cancel out rather than add up.
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    features = _features(text)
+    if not features:
+        return vector
+    digests = [int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little") for feature in features]
+    hashes = np.array(digests, dtype=np.uint64)
+    buckets = (hashes % np.uint64(dim)).astype(np.intp)
+    signs = np.where((hashes >> np.uint64(63)) == 1, -1.0, 1.0)
+    # Sublinear term frequency, so one repeated word does not dominate
+    np.add.at(vector, buckets, signs * (1 + np.log(np.fromiter(features.values(), dtype=np.float32))))
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def embed_job(payload: Dict[str, Any], dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """
+    Vector of the target job fields of a ResumeInput dump.
+    """
+    return embed_text("\n".join(str(payload.get(key) or "") for key in JOB_FIELDS), dim)
+
+
+def candidate_key(payload: Dict[str, Any]) -> str:
+    """
+    Hash of every candidate field with whitespace collapsed. Any edit to the candidate's own data (a date, a number, a
+    new skill) changes it, so a corrected input is never answered with the resume generated before the correction.
+    """
+    fields = {key: " ".join(str(value).split()) for key, value in payload.items() if value and key not in JOB_FIELDS}
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class SimilarMatch:
+    value: str
+    job_similarity: float
+
+
+class SimilarityCache:
+    """
+    Bounded in-memory index of generated results, for near-duplicate requests that the exact result cache misses: the
+    same candidate resubmitting with a reworded job description, say. A lookup hits only for an entry with exactly the
+    same candidate fields (see candidate_key) and the same scope, so results of one model (e.g. the offline fake) never
+    answer for another; only the target job is matched by similarity. When full, the least recently used entry is
+    replaced. Entries live for the process, so they always come from the current prompt.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        job_threshold: float = 0.85,
+        dim: int = EMBEDDING_DIM
+    ):
+        self.max_entries = max_entries
+        self.job_threshold = job_threshold
+        self.dim = dim
+        self._jobs = np.zeros((max_entries, dim), dtype=np.float32)
+        self._values: List[Optional[str]] = [None] * max_entries
+        self._candidates: List[Optional[str]] = [None] * max_entries
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._size = 0
+        self._ticks = itertools.count(1)
+        self._lock = threading.Lock()
+        self._hit_scores: Deque[float] = deque(maxlen=1000)
+        self.counters = {
+            "lookups": 0,
+            "hits": 0,
+            "misses": 0,
+            "near_misses": 0,
+            "inserts": 0,
+            "replacements": 0,
+            "evictions": 0
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def _closest(self, candidate: str, job: np.ndarray) -> Tuple[int, float]:
+        """
+        The entry for the same candidate with the closest posting and its job similarity, or (-1, 0.0) if there is none.
+        """
+        same_candidate = np.fromiter((key == candidate for key in self._candidates[:self._size]), dtype=bool, count=self._size)
+        if not same_candidate.any():
+            return -1, 0.0
+        scores = np.where(same_candidate, self._jobs[:self._size] @ job, -np.inf)
+        best = int(np.argmax(scores))
+        return best, float(scores[best])
+
+    def get(self, payload: Dict[str, Any], scope: str = "") -> Optional[SimilarMatch]:
+        """
+        The value stored under the same scope (e.g. the model that produced it) for the same candidate and the most
+        similar posting that passes the job threshold, or None.
+        """
+        if not self.enabled:
+            return None
+        candidate = f"{scope}|{candidate_key(payload)}"
+        job = embed_job(payload, self.dim)
+        with self._lock:
+            self.counters["lookups"] += 1
+            best, job_similarity = self._closest(candidate, job)
+            if best >= 0 and job_similarity >= self.job_threshold:
+                self._last_used[best] = next(self._ticks)
+                self.counters["hits"] += 1
+                self._hit_scores.append(job_similarity)
+                return SimilarMatch(self._values[best], round(job_similarity, 4))
+            if best >= 0 and job_similarity >= self.job_threshold - NEAR_MISS_MARGIN:
+                self.counters["near_misses"] += 1
+            self.counters["misses"] += 1
+            return None
+
+    def set(self, payload: Dict[str, Any], value: str, scope: str = "") -> None:
+        if not self.enabled:
+            return
+        candidate = f"{scope}|{candidate_key(payload)}"
+        job = embed_job(payload, self.dim)
+        with self._lock:
+            best, job_similarity = self._closest(candidate, job)
+            # The same input again replaces its entry rather than taking a second slot
+            if best >= 0 and job_similarity >= 0.999:
+                slot = best
+                self.counters["replacements"] += 1
+            elif self._size < self.max_entries:
+                slot = self._size
+                self._size += 1
+            else:
+                slot = int(np.argmin(self._last_used))
+                self.counters["evictions"] += 1
+            self._jobs[slot] = job
+            self._values[slot] = value
+            self._candidates[slot] = candidate
+            self._last_used[slot] = next(self._ticks)
+            self.counters["inserts"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._jobs[:] = 0
+            self._values = [None] * self.max_entries
+            self._candidates = [None] * self.max_entries
+            self._last_used[:] = 0
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counters, fill level and the job similarity of recent hits; hits close to the threshold or many near misses
+        suggest it needs tuning.
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self.counters)
+            stats["entries"] = self._size
+            stats["max_entries"] = self.max_entries
+            stats["hit_rate"] = round(stats["hits"] / stats["lookups"], 4) if stats["lookups"] else 0.0
+            stats["job_threshold"] = self.job_threshold
+            if self._hit_scores:
+                scores = np.array(self._hit_scores)
+                stats["recent_hits"] = {
+                    "job_similarity_mean": round(float(scores.mean()), 4),
+                    "job_similarity_min": round(float(scores.min()), 4)
+                }
+            return stats
+
+
+# SIMILARITY_CACHE_MAX_ENTRIES=0 turns near-duplicate reuse off
+resume_similarity_cache = SimilarityCache(
+    max_entries=int(os.getenv("SIMILARITY_CACHE_MAX_ENTRIES", 512)),
+    job_threshold=float(os.getenv("SIMILARITY_CACHE_JOB_THRESHOLD", 0.85))
+)
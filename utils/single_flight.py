@@ -0,0 +1,72 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Memoizes a computation by key for the life of the process. Concurrent callers with the same key share one in-flight
+    computation instead of each running it. Failures are not memoized, so the next caller retries.
+    """
+
+    def __init__(self, max_results: int = 128):
+        self.max_results = max_results
+        self._results: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.counters = {
+            "hits": 0,
+            "shared": 0,
+            "computed": 0
+        }
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.counters["hits"] += 1
+                return self._results[key]
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.counters["shared"] += 1
+                owner = False
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                self.counters["computed"] += 1
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._in_flight[key]
+            self._results[key] = result
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+        future.set_result(result)
+        return result
+
+    def forget(self, key: Hashable) -> None:
+        with self._lock:
+            self._results.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self.counters)
+            stats["results"] = len(self._results)
+            stats["in_flight"] = len(self._in_flight)
+            return stats
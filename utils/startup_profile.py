@@ -0,0 +1,90 @@
+import builtins
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class StartupProfiler:
+    """
+    Records how long each first-time import takes and how long each screen takes to render the first time in this
+    process. Import timing wraps builtins.__import__ and is only installed in profile mode (STARTUP_PROFILE=1); nested
+    imports are attributed to the outermost module that triggered them.
+    """
+
+    def __init__(self):
+        self.process_start = time.perf_counter()
+        self.enabled = False
+        self.imports: Dict[str, float] = {}
+        self.import_order: List[str] = []
+        self.first_renders: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._original_import = None
+
+    def install(self) -> None:
+        with self._lock:
+            if self.enabled:
+                return
+            self.enabled = True
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._timed_import
+
+    def install_if_enabled(self) -> None:
+        if os.getenv("STARTUP_PROFILE") == "1":
+            self.install()
+
+    def _timed_import(self, name: str, globals=None, locals=None, fromlist=(), level: int = 0) -> Any:
+        depth = getattr(self._local, "depth", 0)
+        # Only time absolute imports of modules that have not been loaded yet, and only at the outermost level
+        if level or depth or not name or name in sys.modules:
+            self._local.depth = depth + 1
+            try:
+                return self._original_import(name, globals, locals, fromlist, level)
+            finally:
+                self._local.depth = depth
+
+        self._local.depth = 1
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            self._local.depth = 0
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                if name not in self.imports:
+                    self.import_order.append(name)
+                self.imports[name] = self.imports.get(name, 0.0) + elapsed
+
+    def record_render(self, screen: str, seconds: float) -> bool:
+        """
+        Records a screen's render time if it is the first render of that screen in this process. Returns True if it was.
+        """
+        with self._lock:
+            if screen in self.first_renders:
+                return False
+            self.first_renders[screen] = seconds
+            return True
+
+    def report(self, top: Optional[int] = 15) -> Dict[str, Any]:
+        with self._lock:
+            imports = sorted(self.imports.items(), key=lambda item: item[1], reverse=True)
+            return {
+                "enabled": self.enabled,
+                "uptime_s": round(time.perf_counter() - self.process_start, 3),
+                "import_total_s": round(sum(self.imports.values()), 3),
+                "imports": [{"module": name, "seconds": round(seconds, 4)} for name, seconds in imports[:top]],
+                "first_renders": {screen: round(seconds, 4) for screen, seconds in self.first_renders.items()}
+            }
+
+    def print_report(self) -> None:
+        report = self.report()
+        print(f"Startup profile: {report['import_total_s']}s in imports, uptime {report['uptime_s']}s.")
+        for entry in report["imports"]:
+            print(f"  import {entry['module']:<28} {entry['seconds'] * 1000:>9.1f} ms")
+        for screen, seconds in report["first_renders"].items():
+            print(f"  first render {screen:<22} {seconds * 1000:>9.1f} ms")
+
+
+startup_profiler = StartupProfiler()
@@ -0,0 +1,129 @@
+import random
+from dataclasses import dataclass
+from typing import Dict, List
+from schemas import (
+    Certificate,
+    ContactInfo,
+    Education,
+    Experience,
+    Involvement,
+    Project,
+    ResumeInput,
+    ResumeSchema,
+    Skills
+)
+
+
+@dataclass(frozen=True)
+class ResumeScale:
+    """
+    How large a synthetic resume is: the number of experiences and projects, and the bullets per experience.
+    """
+    name: str
+    experiences: int
+    projects: int
+    bullets: int
+
+
+SCALES: Dict[str, ResumeScale] = {
+    "small": ResumeScale("small", experiences=1, projects=1, bullets=3),
+    "medium": ResumeScale("medium", experiences=4, projects=3, bullets=5),
+    "large": ResumeScale("large", experiences=10, projects=8, bullets=8)
+}
+
+_TITLES = ["Software Engineer", "Data Analyst", "Backend Developer", "Product Engineer", "ML Engineer", "Site Reliability Engineer"]
+_COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries", "Wayne Enterprises"]
+_CITIES = ["San Jose, CA", "Austin, TX", "Seattle, WA", "New York, NY", "Denver, CO"]
+_VERBS = ["Built", "Designed", "Led", "Optimized", "Migrated", "Automated", "Shipped", "Reduced"]
+_OBJECTS = ["a REST API", "the billing pipeline", "an ETL job", "the search service", "CI/CD workflows", "a React dashboard"]
+_RESULTS = ["cutting latency by {n}%", "serving {n}k daily users", "saving {n} hours per week", "raising test coverage to {n}%"]
+_SKILLS = ["Python", "SQL", "React", "Node.js", "Docker", "Kubernetes", "AWS", "PostgreSQL", "Go", "TypeScript", "Airflow", "Spark"]
+
+
+class _Generator:
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+
+    def bullet(self) -> str:
+        result = self.rng.choice(_RESULTS).format(n=self.rng.randint(10, 90))
+        return f"{self.rng.choice(_VERBS)} {self.rng.choice(_OBJECTS)}, {result}."
+
+    def experience(self, bullets: int) -> Experience:
+        start = self.rng.randint(2012, 2022)
+        return Experience(
+            job_title=self.rng.choice(_TITLES),
+            company=self.rng.choice(_COMPANIES),
+            location=self.rng.choice(_CITIES),
+            start_date=str(start),
+            end_date=str(start + self.rng.randint(1, 3)),
+            description=[self.bullet() for _ in range(bullets)]
+        )
+
+    def project(self, index: int) -> Project:
+        return Project(
+            title=f"Project {index + 1}",
+            description=self.bullet(),
+            github_link=f"https://github.com/jdoe/project-{index + 1}",
+            technologies=self.rng.sample(_SKILLS, 3)
+        )
+
+
+def synthetic_resume(scale: ResumeScale, seed: int = 0) -> ResumeSchema:
+    """
+    Builds a deterministic ResumeSchema of the given scale; the same scale and seed always give the same resume.
+    """
+    gen = _Generator(seed)
+    return ResumeSchema(
+        name="Jordan Doe",
+        contact_info=ContactInfo(
+            location=gen.rng.choice(_CITIES),
+            phone_number="(555) 010-0199",
+            email="jordan.doe@example.com",
+            linkedin_profile="https://www.linkedin.com/in/jordan-doe",
+            github_profile="https://github.com/jdoe"
+        ),
+        experience=[gen.experience(scale.bullets) for _ in range(scale.experiences)],
+        projects=[gen.project(i) for i in range(scale.projects)],
+        education=[Education(degree="B.S. Computer Science", school="San Jose State University", location="San Jose, CA", graduation_date="2012")],
+        certificates=[Certificate(name="AWS Certified Solutions Architect", date="2021")],
+        involvement=[Involvement(role="Mentor", organization="Code for Good", description=gen.bullet())],
+        skills=Skills(all_skills=gen.rng.sample(_SKILLS, min(len(_SKILLS), 4 + scale.experiences))),
+        summary="Engineer with a track record of shipping reliable, well-tested services.",
+        target_job_title="Senior Software Engineer",
+        target_job_description="Design and build backend services in Python; own reliability and performance."
+    )
+
+
+def _lines(items: List[str]) -> str:
+    return "\n".join(items)
+
+
+def synthetic_resume_fields(scale: ResumeScale, seed: int = 0) -> Dict[str, str]:
+    """
+    The free-text ResumeInput fields a candidate would type (or the resume reader would extract) for the same resume
+    as synthetic_resume.
+    """
+    resume = synthetic_resume(scale, seed)
+    return {
+        "name": resume.name,
+        "email": resume.contact_info.email,
+        "phone_number": resume.contact_info.phone_number,
+        "linkedin_profile": resume.contact_info.linkedin_profile,
+        "github_profile": resume.contact_info.github_profile,
+        "experience": _lines(
+            f"{exp.job_title} at {exp.company}, {exp.location} ({exp.start_date} - {exp.end_date})\n" + _lines(exp.description)
+            for exp in resume.experience
+        ),
+        "projects": _lines(f"{proj.title}: {proj.description} ({', '.join(proj.technologies)})" for proj in resume.projects),
+        "education": _lines(f"{edu.degree}, {edu.school}, {edu.graduation_date}" for edu in resume.education),
+        "skills": ", ".join(resume.skills.all_skills),
+        "certifications": _lines(f"{cert.name} ({cert.date})" for cert in resume.certificates),
+        "involvement": _lines(f"{inv.role}, {inv.organization}: {inv.description}" for inv in resume.involvement),
+        "summary": resume.summary,
+        "target_job_title": resume.target_job_title,
+        "target_job_description": resume.target_job_description
+    }
+
+
+def synthetic_resume_input(scale: ResumeScale, seed: int = 0) -> ResumeInput:
+    return ResumeInput(**synthetic_resume_fields(scale, seed))
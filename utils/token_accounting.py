@@ -0,0 +1,166 @@
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from utils.metrics import metrics
+
+
+# Rough characters-per-token for English text; used when tiktoken's encoding files are unavailable (e.g. offline)
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def _encoding(model_name: str):
+    try:
+        import tiktoken
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str, model_name: str = "gpt-4o-mini") -> int:
+    """
+    Counts tokens with tiktoken when available, otherwise estimates from the character count.
+    """
+    if not text:
+        return 0
+    encoding = _encoding(model_name)
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model_name: str = "gpt-4o-mini") -> str:
+    """
+    Cuts text to at most max_tokens, preferring to end on a whitespace boundary.
+    """
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text, model_name) <= max_tokens:
+        return text
+    encoding = _encoding(model_name)
+    if encoding is None:
+        cut = text[:max_tokens * CHARS_PER_TOKEN]
+    else:
+        cut = encoding.decode(encoding.encode(text)[:max_tokens])
+    boundary = cut.rfind(" ")
+    if boundary > len(cut) // 2:
+        cut = cut[:boundary]
+    return cut.rstrip() + " …"
+
+
+class TokenLedger:
+    """
+    Thread-safe record of LLM calls: per-call prompt/completion tokens and latency (most recent calls only) plus
+    running totals per label.
+    """
+
+    def __init__(self, max_calls: int = 500):
+        self._calls: Deque[Dict[str, Any]] = deque(maxlen=max_calls)
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, label: str, model_name: str, prompt_tokens: int, completion_tokens: int, latency: float, **extra) -> None:
+        call = {
+            "label": label,
+            "model": model_name,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "latency": round(latency, 4),
+            "timestamp": time.time(),
+            **extra
+        }
+        with self._lock:
+            self._calls.append(call)
+            totals = self._totals.setdefault(
+                label,
+                {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0, "latency": 0.0}
+            )
+            totals["calls"] += 1
+            totals["prompt_tokens"] += prompt_tokens
+            totals["cached_tokens"] += extra.get("cached_tokens", 0)
+            totals["completion_tokens"] += completion_tokens
+            totals["latency"] += latency
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._calls)[-limit:]
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {label: dict(values) for label, values in self._totals.items()}
+
+
+token_ledger = TokenLedger()
+
+
+def usage_from_result(response: LLMResult) -> Dict[str, Any]:
+    """
+    Provider-reported prompt, cached-prompt and completion tokens of one LLM call, plus the model name.
+    """
+    prompt_tokens, completion_tokens, model_name, cached_tokens = 0, 0, "", 0
+    for generations in response.generations:
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            usage: Optional[Dict[str, Any]] = getattr(message, "usage_metadata", None)
+            if usage:
+                prompt_tokens += usage.get("input_tokens", 0)
+                completion_tokens += usage.get("output_tokens", 0)
+                cached_tokens += (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+            if message is not None:
+                model_name = model_name or message.response_metadata.get("model_name", "")
+    if not prompt_tokens and response.llm_output:
+        token_usage = response.llm_output.get("token_usage") or {}
+        prompt_tokens = token_usage.get("prompt_tokens", 0)
+        completion_tokens = token_usage.get("completion_tokens", 0)
+        cached_tokens = (token_usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0) or 0
+    return {
+        "prompt_tokens": prompt_tokens,
+        "cached_tokens": cached_tokens,
+        "completion_tokens": completion_tokens,
+        "model_name": model_name
+    }
+
+
+class TokenUsageRecorder(BaseCallbackHandler):
+    """
+    LangChain callback that writes the provider-reported token usage and latency of every LLM call in a chain to the
+    token ledger under the given label.
+    """
+
+    def __init__(self, label: str, ledger: TokenLedger = token_ledger):
+        self.label = label
+        self.ledger = ledger
+        self._started: Dict[UUID, float] = {}
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[Any], *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        started = self._started.pop(run_id, None)
+        latency = time.perf_counter() - started if started is not None else 0.0
+        usage = usage_from_result(response)
+        self.ledger.record(
+            self.label,
+            usage["model_name"],
+            usage["prompt_tokens"],
+            usage["completion_tokens"],
+            latency,
+            cached_tokens=usage["cached_tokens"]
+        )
+        metrics.observe(f"llm:{self.label}", latency)
+        metrics.observe_tokens(self.label, usage["prompt_tokens"], usage["completion_tokens"])
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        started = self._started.pop(run_id, None)
+        metrics.observe(f"llm:{self.label}", time.perf_counter() - started if started is not None else 0.0, error=True)
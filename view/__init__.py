@@ -1,2 +1,16 @@
-from .ingest_screen import ingest_screen
-from .preview_screen import preview_screen
\ No newline at end of file
+import importlib
+
+# Screens are imported on first access so importing the package does not pull in langchain, reportlab or pyairtable
+_SCREENS = {
+    "ingest_screen": ".ingest_screen",
+    "preview_screen": ".preview_screen",
+    "metrics_panel": ".metrics_panel"
+}
+
+__all__ = list(_SCREENS)
+
+
+def __getattr__(name):
+    if name in _SCREENS:
+        return getattr(importlib.import_module(_SCREENS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
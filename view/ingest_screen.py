@@ -1,11 +1,16 @@
+import hashlib
+import time
 import streamlit as st
-import tempfile
 from streamlit import session_state as ss
 from pydantic import ValidationError
-from schemas import ResumeInput
-from langchain_community.document_loaders import PyPDFLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from utils.resume_reader import analyze_resume_content
+from schemas import JobTarget, JobTargets, ResumeInput
+from utils.job_executor import JobQueueFull
+from utils.pdf_extract import PDFLimitError
+from utils.session_store import delete_state, has_state, load_state, save_state
+
+
+# Extra postings a user can tailor the same resume to in one run
+EXTRA_TARGET_SLOTS = 3
 
 
 def create_sample_resume_input():
@@ -34,27 +39,38 @@ def create_sample_resume_input():
 
 
 def parse_resume_content(file_upload):
-    # Create a temporary file
-    with tempfile.NamedTemporaryFile(suffix=".pdf") as tmp_file:
-        # Save the uploaded file to the temporary file
-        tmp_file.write(file_upload.getvalue())
-        tmp_file.flush()
-        
-        # Pass the temporary file path to the PyPDFLoader
-        loader = PyPDFLoader(tmp_file.name)
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=2000)
-        pages = loader.load_and_split(text_splitter)
-        
-        # Call LLM to Analyze
-        result = analyze_resume_content(pages)
-        print("Successfully analyzed resume content.")
-        
-        return result
+    """
+    Extracts and analyzes an uploaded resume, through the resume API when RESUME_API_URL is set and in-process
+    otherwise. Either way the result is memoized per distinct file, so Streamlit reruns do not parse it again.
+    """
+    # Imported here so rendering the form loads neither httpx nor langchain until a resume is uploaded
+    from utils.api_client import get_api_client
+
+    file_bytes = file_upload.getvalue()
+    api_client = get_api_client()
+    if api_client is not None:
+        return api_client.parse(file_bytes, file_upload.name)
+
+    from utils.job_executor import submit_parse_job
+    return wait_for_job(submit_parse_job(file_bytes), "Reading your resume")
 
 
-def get_prefill_value(key, default=""):
-    if "prefill_data" in ss:
-        return getattr(ss["prefill_data"], key, default)
+def wait_for_job(handle, message: str, poll_interval: float = 0.2):
+    """
+    Polls a background job, showing its status until it finishes. A rerun while waiting abandons only the poll; the job
+    keeps running and the next run picks up the same handle.
+    """
+    placeholder = st.empty()
+    while not handle.done():
+        placeholder.caption(f"{message}... ({handle.status}, {time.time() - handle.submitted_at:.0f}s)")
+        time.sleep(poll_interval)
+    placeholder.empty()
+    return handle.result()
+
+
+def get_prefill_value(prefill, key, default=""):
+    if prefill is not None:
+        return getattr(prefill, key, default)
     return default
 
 
@@ -66,7 +82,21 @@ def ingest_screen(app_env: str = None):
     file_upload = st.file_uploader("Upload your resume", type=["pdf"])
     
     if file_upload:
-        ss['prefill_data'] = parse_resume_content(file_upload)
+        # Reruns keep the same upload, so it is parsed and stored only when a different file arrives
+        digest = hashlib.sha256(file_upload.getvalue()).hexdigest()
+        if ss.get("prefill_digest") != digest:
+            try:
+                save_state("prefill_data", parse_resume_content(file_upload))
+                ss["prefill_digest"] = digest
+            except PDFLimitError as e:
+                st.error(f"{e}")
+            except JobQueueFull as e:
+                # The digest is only stored on success, so the retry's rerun submits the upload again
+                st.warning(f"Too many resumes are being read right now. {e}")
+                st.button("Try again", key="retry_parse")
+
+    # Loaded once per run rather than once per field
+    prefill = load_state("prefill_data", ResumeInput) if has_state("prefill_data") else None
         
         
     with st.form("resume_form"):
@@ -75,41 +105,50 @@ def ingest_screen(app_env: str = None):
         
         with col1:
             with st.expander("**Contact Info**"):
-                name = st.text_input("Name", value=get_prefill_value("name"))
-                email = st.text_input("Email", value = get_prefill_value("email"))
-                phone_number = st.text_input("Phone Number", value = get_prefill_value("phone_number"))
-                linkedin_profile = st.text_input("LinkedIn Profile", value = get_prefill_value("linkedin_profile"))
-                github_profile = st.text_input("GitHub Profile", value = get_prefill_value("github_profile"))
+                name = st.text_input("Name", value=get_prefill_value(prefill, "name"))
+                email = st.text_input("Email", value = get_prefill_value(prefill, "email"))
+                phone_number = st.text_input("Phone Number", value = get_prefill_value(prefill, "phone_number"))
+                linkedin_profile = st.text_input("LinkedIn Profile", value = get_prefill_value(prefill, "linkedin_profile"))
+                github_profile = st.text_input("GitHub Profile", value = get_prefill_value(prefill, "github_profile"))
             
             with st.expander("**Experience**"):
-                experience = st.text_area("Experience (e.g. work experience, internships)", value=get_prefill_value("experience"))
+                experience = st.text_area("Experience (e.g. work experience, internships)", value=get_prefill_value(prefill, "experience"))
             
             with st.expander("**Projects**"):
-                projects = st.text_area("Projects (e.g. personal projects, group projects)", value=get_prefill_value("projects"))
+                projects = st.text_area("Projects (e.g. personal projects, group projects)", value=get_prefill_value(prefill, "projects"))
             
             with st.expander("**Education**"):
-                education = st.text_area("Education (e.g. degrees, certifications)", value=get_prefill_value("education"))
+                education = st.text_area("Education (e.g. degrees, certifications)", value=get_prefill_value(prefill, "education"))
             
             with st.expander("**Skills**"):
-                skills = st.text_area("Skills (e.g. programming languages, software proficiency)", value=get_prefill_value("skills"))
+                skills = st.text_area("Skills (e.g. programming languages, software proficiency)", value=get_prefill_value(prefill, "skills"))
             
             with st.expander("**Coursework**"):
-                coursework = st.text_area("Coursework (e.g. relevant courses, academic achievements)", value=get_prefill_value("coursework"))
+                coursework = st.text_area("Coursework (e.g. relevant courses, academic achievements)", value=get_prefill_value(prefill, "coursework"))
             
             with st.expander("**Certifications**"):
-                certifications = st.text_area("Certifications (e.g. professional certifications, licenses)", value=get_prefill_value("certifications"))
+                certifications = st.text_area("Certifications (e.g. professional certifications, licenses)", value=get_prefill_value(prefill, "certifications"))
             
             with st.expander("**Involvement**"):
-                involvement = st.text_area("Involvement (e.g. extracurricular activities, volunteer work)", value=get_prefill_value("involvement"))
+                involvement = st.text_area("Involvement (e.g. extracurricular activities, volunteer work)", value=get_prefill_value(prefill, "involvement"))
             
             with st.expander("**Summary**"):
-                summary = st.text_area("Summary (e.g. professional summary, career goals)", value=get_prefill_value("summary"))
+                summary = st.text_area("Summary (e.g. professional summary, career goals)", value=get_prefill_value(prefill, "summary"))
         
         with col2:
             with st.expander("**Target Job**", expanded=True):
                 st.caption(f"Please enter the job title and job description for which you would like to build a resume. You can paste the job description from a job posting.")
                 job_title = st.text_input("Job Title")
                 job_description = st.text_area("Job Description", max_chars=5000)
+
+            with st.expander("**More Target Jobs**"):
+                st.caption("Optionally add other postings; a tailored resume is generated for each of them at once.")
+                extra_targets = []
+                for slot in range(EXTRA_TARGET_SLOTS):
+                    extra_targets.append((
+                        st.text_input(f"Job Title {slot + 2}", key=f"extra_job_title_{slot}"),
+                        st.text_area(f"Job Description {slot + 2}", max_chars=5000, key=f"extra_job_description_{slot}")
+                    ))
         
         submit = st.form_submit_button("Generate Resume")
     
@@ -136,8 +175,14 @@ def ingest_screen(app_env: str = None):
                         target_job_title = job_title,
                         target_job_description = job_description
                 )
-                # Package and store resume input in session state
-                ss["resume_input"] = resume_input
+                # Package and store resume input in the session store
+                save_state("resume_input", resume_input)
+                extra = [JobTarget(title=title, description=description) for title, description in extra_targets if title.strip()]
+                if extra:
+                    primary = JobTarget(title=resume_input.target_job_title or "", description=resume_input.target_job_description or "")
+                    save_state("job_targets", JobTargets(targets=[primary, *extra]))
+                else:
+                    delete_state("job_targets")
                 st.success("Resume generated!")
                 # Call rerun to update the app view
                 st.rerun()
@@ -0,0 +1,43 @@
+import streamlit as st
+from utils.job_executor import job_executor
+from utils.llm_registry import chain_registry
+from utils.metrics import metrics
+from utils.output_repair import output_repair_stats
+from utils.rate_limiter import rate_limiter
+from utils.session_store import session_store
+from utils.similarity_cache import resume_similarity_cache
+from utils.token_accounting import token_ledger
+
+
+def metrics_panel():
+    """
+    Dev-only sidebar panel with per-stage latency, error and payload figures, and LLM token usage for this process.
+    """
+    with st.sidebar.expander("Pipeline metrics", expanded=False):
+        stages = metrics.summary()
+        if stages:
+            st.dataframe(stages, hide_index=True)
+        else:
+            st.caption("No stages recorded yet.")
+
+        st.markdown("**Tokens by chain**")
+        st.json(metrics.token_totals(), expanded=False)
+        st.markdown("**Token ledger totals**")
+        st.json(token_ledger.totals(), expanded=False)
+        st.markdown("**Structured output repair**")
+        st.json(output_repair_stats(), expanded=False)
+        st.markdown("**Near-duplicate resume cache**")
+        st.json(resume_similarity_cache.stats(), expanded=False)
+        st.markdown("**Background jobs**")
+        st.json(job_executor.stats(), expanded=False)
+        if chain_registry.cassette is not None:
+            st.markdown("**LLM cassette**")
+            st.json(chain_registry.cassette.stats(), expanded=False)
+        st.markdown("**OpenAI rate limiter**")
+        st.json(rate_limiter.stats(), expanded=False)
+        st.markdown("**Session store footprint**")
+        st.json(session_store.footprint(), expanded=False)
+
+        if st.button("Reset metrics"):
+            metrics.reset()
+            st.rerun()
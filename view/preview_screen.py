@@ -2,113 +2,186 @@ import os
 import streamlit as st
 import base64
 from streamlit import session_state as ss
-from io import BytesIO
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import ParagraphStyle
-from reportlab.lib.units import cm
-from reportlab.lib import colors
 from datetime import datetime
+from io import BytesIO
+from typing import Any, Optional
+from pydantic import TypeAdapter, ValidationError
 from pyairtable import Api
-from schemas import ResumeSchema
-from utils.ai import invoke_resume_chain
-from utils.airtable import create_airtable_record
+from schemas import JobTargets, ResumeInput, ResumeSchema, TargetedResumes
+from utils.ai import RESUME_COMPLETE
+from utils.airtable import enqueue_airtable_record
+from utils.api_client import ResumeAPIClient, get_api_client
+from utils.html_templates import render_resume_html
+from utils.job_executor import JobQueueFull, iter_job_events, submit_generation_job, submit_multi_target_job, submit_render_job
+from utils.job_keywords import candidate_match_score, resume_keyword_coverage
+from utils.pdf_templates import DEFAULT_TEMPLATE, list_templates, resume_file_name
+from utils.metrics import track
+from utils.multi_target import multi_target_report
+from utils.session_store import clear_state, has_state, load_state, save_state
 
 
-def save_resume_to_pdf(resume_data: ResumeSchema):
-    today_date = datetime.today().strftime('%Y-%m-%d')
-    file_name = f"{resume_data.name}_Resume_{today_date}.pdf"
-    
-    pdf_bytes = BytesIO()
-    doc = SimpleDocTemplate(pdf_bytes, pagesize=letter,
-                            rightMargin=1*cm, leftMargin=1*cm,
-                            topMargin=0.5*cm, bottomMargin=0.5*cm)
-
-    # Styles
-    text_color = colors.HexColor("#303E48")
-    custom_heading_style = ParagraphStyle(name='CustomHeading', fontSize=14, textColor=text_color, leading=18)
-    custom_normal_style = ParagraphStyle(name='CustomNormal', fontSize=10, textColor=text_color, leading=14)
-
-    story = []
-
-    # Add Name and Contact Info
-    story.append(Paragraph(f"<b>{resume_data.name}</b>", custom_heading_style))
-    contact_info = resume_data.contact_info
-    contact_text = f"{contact_info.location} | {contact_info.phone_number} | {contact_info.email} | <a href='{contact_info.linkedin_profile}'>LinkedIn</a> | <a href='{contact_info.github_profile}'>GitHub</a>"
-    story.append(Paragraph(contact_text, custom_normal_style))
-    story.append(Spacer(1, 12))
-
-    # Add Summary
-    story.append(Paragraph("<b>Summary</b>", custom_heading_style))
-    story.append(Paragraph(resume_data.summary, custom_normal_style))
-    story.append(Spacer(1, 12))
-
-    # Add Experience Section
-    story.append(Paragraph("<b>Experience</b>", custom_heading_style))
-    for job in resume_data.experience:
-        story.append(Paragraph(f"{job.job_title} - {job.company} ({job.location})", custom_normal_style))
-        story.append(Paragraph(f"{job.start_date} - {job.end_date or 'Present'}", custom_normal_style))
-        for bullet in job.description:
-            story.append(Paragraph(f"• {bullet}", custom_normal_style))
-        story.append(Spacer(1, 12))
-
-    # Add Projects Section
-    story.append(Paragraph("<b>Projects</b>", custom_heading_style))
-    for project in resume_data.projects:
-        story.append(Paragraph(f"{project.title}", custom_normal_style))
-        story.append(Paragraph(f"{project.description}", custom_normal_style))
-        story.append(Paragraph(f"Technologies: {', '.join(project.technologies)}", custom_normal_style))
-        story.append(Paragraph(f"<a href='{project.github_link}'>GitHub Link</a>", custom_normal_style))
-        story.append(Spacer(1, 12))
-
-    # Add Education Section
-    story.append(Paragraph("<b>Education</b>", custom_heading_style))
-    for edu in resume_data.education:
-        story.append(Paragraph(f"{edu.degree} - {edu.school} ({edu.location})", custom_normal_style))
-        story.append(Paragraph(f"Graduation: {edu.graduation_date}", custom_normal_style))
-        story.append(Spacer(1, 12))
-
-    # Add Certificates Section
-    story.append(Paragraph("<b>Certificates</b>", custom_heading_style))
-    for cert in resume_data.certificates:
-        story.append(Paragraph(f"{cert.name} - {cert.date}", custom_normal_style))
-        story.append(Spacer(1, 12))
-
-    # Add Involvement Section
-    story.append(Paragraph("<b>Involvement</b>", custom_heading_style))
-    for inv in resume_data.involvement:
-        story.append(Paragraph(f"{inv.role} - {inv.organization}", custom_normal_style))
-        story.append(Paragraph(f"{inv.description}", custom_normal_style))
-        story.append(Spacer(1, 12))
-
-    # Add Skills Section
-    story.append(Paragraph("<b>Skills</b>", custom_heading_style))
-    story.append(Paragraph(", ".join(resume_data.skills.all_skills), custom_normal_style))
-    story.append(Spacer(1, 12))
-
-    doc.build(story)
-    pdf_bytes.seek(0)
-
-    return pdf_bytes, file_name
+def display_pdf(pdf_bytes, height: int):
+    with track("display_pdf") as span:
+        # Get PDF bytes from BytesIO and encode in B64
+        base64_pdf = base64.b64encode(pdf_bytes.read()).decode("utf-8")
 
+        # Embedding PDF in HTML
+        pdf_display = f"""
+        <iframe src="data:application/pdf;base64,{base64_pdf}#toolbar=0" width="100%" height="{height * 0.8}"></iframe>
+        """
+        span.payload_bytes = len(pdf_display)
+
+        # Displaying File
+        st.markdown(pdf_display, unsafe_allow_html=True)
 
-def display_pdf(pdf_bytes, height: int):
-    # Get PDF bytes from BytesIO and encode in B64
-    base64_pdf = base64.b64encode(pdf_bytes.read()).decode("utf-8")
 
-    # Embedding PDF in HTML
-    pdf_display = f"""
-    <iframe src="data:application/pdf;base64,{base64_pdf}#toolbar=0" width="100%" height="{height * 0.8}"></iframe>
+def display_html(resume_data: ResumeSchema, template_name: str):
+    with track("display_html") as span:
+        html = render_resume_html(resume_data, template_name)
+        span.payload_bytes = len(html)
+        st.html(html)
+
+
+def pdf_download_data(resume_data: ResumeSchema, template_name: str):
+    """
+    Starts building the PDF in the background and returns a callable for st.download_button, so the page renders
+    without waiting on the PDF and the click usually finds it ready.
     """
+    handle = submit_render_job(resume_data, template_name)
 
-    # Displaying File
-    st.markdown(pdf_display, unsafe_allow_html=True)
+    def data() -> bytes:
+        return handle.result()
+
+    return data
+
+
+def format_resume_section(section: str, value: Any) -> Optional[str]:
+    """
+    Formats one completed section of a streamed resume as markdown. Returns None for sections that are not shown in the
+    preview or that do not validate yet; the final ResumeSchema validation still happens once streaming ends.
+    """
+    if section not in ResumeSchema.model_fields or section.startswith("target_job"):
+        return None
+    try:
+        data = TypeAdapter(ResumeSchema.model_fields[section].annotation).validate_python(value)
+    except ValidationError:
+        return None
+
+    if section == "name":
+        return f"### {data}"
+    if section == "contact_info":
+        return f"{data.location} | {data.phone_number} | {data.email} | [LinkedIn]({data.linkedin_profile}) | [GitHub]({data.github_profile})"
+    if section == "summary":
+        return f"**Summary**\n\n{data}" if data else None
+    if section == "experience":
+        lines = ["**Experience**"]
+        for job in data:
+            lines.append(f"\n{job.job_title} - {job.company} ({job.location}), {job.start_date} - {job.end_date or 'Present'}")
+            lines.extend(f"- {bullet}" for bullet in job.description)
+        return "\n".join(lines)
+    if section == "projects":
+        lines = ["**Projects**"]
+        for project in data:
+            lines.append(f"- {project.title}: {project.description}")
+        return "\n".join(lines)
+    if section == "education":
+        lines = ["**Education**"]
+        lines.extend(f"- {edu.degree} - {edu.school} ({edu.location}), {edu.graduation_date}" for edu in data)
+        return "\n".join(lines)
+    if section == "certificates":
+        lines = ["**Certificates**"]
+        lines.extend(f"- {cert.name} - {cert.date}" for cert in data)
+        return "\n".join(lines)
+    if section == "involvement":
+        lines = ["**Involvement**"]
+        lines.extend(f"- {inv.role} - {inv.organization}: {inv.description}" for inv in data)
+        return "\n".join(lines)
+    if section == "skills":
+        return f"**Skills**\n\n{', '.join(data.all_skills)}"
+    return None
+
+
+def _api_resume_events(api_client: ResumeAPIClient, resume_input: ResumeInput):
+    # The API returns the whole resume at once; replay it through the same (section, value) protocol
+    resume_data = api_client.generate(resume_input, sectioned=os.getenv("RESUME_GENERATION_MODE") == "sections")
+    for section in ResumeSchema.model_fields:
+        yield section, getattr(resume_data, section)
+    yield RESUME_COMPLETE, resume_data
+
+
+def _job_resume_events(handle):
+    yield from iter_job_events(handle)
+    yield RESUME_COMPLETE, handle.result()
+
+
+def stream_resume_preview(resume_input: ResumeInput, placeholder) -> ResumeSchema:
+    """
+    Streams resume generation into the given placeholder, rendering each section as soon as it is complete. The
+    placeholder is cleared once the validated ResumeSchema is available.
+    """
+    # Generation runs in the resume API when one is configured, otherwise on this process's job pool
+    api_client = get_api_client()
+    if api_client is not None:
+        events = _api_resume_events(api_client, resume_input)
+    else:
+        # A double submit or rerun attaches to the job already in flight. "sections" generates each section with its
+        # own concurrent sub-chain; the default streams one monolithic call. Submitted before anything is drawn, so a
+        # full queue leaves the placeholder empty
+        handle = submit_generation_job(resume_input, sectioned=os.getenv("RESUME_GENERATION_MODE") == "sections")
+        events = _job_resume_events(handle)
+
+    resume_data = None
+    with placeholder.container():
+        st.caption("Writing your resume...")
+        for section, value in events:
+            if section == RESUME_COMPLETE:
+                resume_data = value
+                continue
+            markdown = format_resume_section(section, value)
+            if markdown:
+                st.markdown(markdown)
+    placeholder.empty()
+    return resume_data
+
+
+def generate_targeted_preview(resume_input: ResumeInput, job_targets: JobTargets, placeholder) -> TargetedResumes:
+    """
+    Generates a tailored resume for every target job, listing each target in the placeholder as it finishes.
+    """
+    api_client = get_api_client()
+    if api_client is not None:
+        return api_client.generate_targets(resume_input, job_targets.targets)
+
+    handle = submit_multi_target_job(resume_input, job_targets.targets)
+    with placeholder.container():
+        st.caption(f"Tailoring your resume for {len(job_targets.targets)} jobs...")
+        for _, result in iter_job_events(handle):
+            st.markdown(f"- **{result.target.title}** ready in {result.latency_s:.1f}s")
+    placeholder.empty()
+    return handle.result()
+
+
+def keyword_coverage(resume_input: ResumeInput, resume_data: ResumeSchema):
+    """
+    Shows how well the input and the generated resume cover the target job description's keywords.
+    """
+    if not resume_input or not resume_input.target_job_description:
+        return
+    coverage = resume_keyword_coverage(resume_input.target_job_description, resume_data)
+    match = candidate_match_score(resume_input.target_job_description, resume_input.model_dump())
+    with st.expander(f"Job keyword coverage: {coverage['score']:.0%}"):
+        st.caption(f"Your input matched {match:.0%} of the job description's weighted keywords.")
+        if coverage["covered"]:
+            st.markdown(f"**Covered:** {', '.join(coverage['covered'])}")
+        if coverage["missing"]:
+            st.markdown(f"**Missing:** {', '.join(coverage['missing'])}")
 
 
 def reset_data():
-    prefill_data = ss["resume_input"]
+    prefill_data = load_state("resume_input", ResumeInput)
     ss.clear()
-    ss["prefill_data"] = prefill_data
+    clear_state()
+    save_state("prefill_data", prefill_data)
 
 
 def preview_screen(app_env: str = None, airtable_client: Api = None):
@@ -118,44 +191,92 @@ def preview_screen(app_env: str = None, airtable_client: Api = None):
     
     col1, col2 = st.columns([0.7, 0.3])
     
-    with st.spinner("Generating Resume..."):
-        # Check if cache exists
-        if "resume_data" not in ss:
-            # Invoke LLM chain to generate resume data
-            resume_data = invoke_resume_chain(ss["resume_input"])
+    try:
+        with st.spinner("Generating Resume..."):
+            job_targets = load_state("job_targets", JobTargets)
+            if job_targets is not None and not has_state("targeted_resumes"):
+                with col1:
+                    stream_placeholder = st.empty()
+                targeted = generate_targeted_preview(load_state("resume_input", ResumeInput), job_targets, stream_placeholder)
+                for result in targeted.resumes:
+                    enqueue_airtable_record(
+                        airtable_client,
+                        os.getenv("AIRTABLE_RESUME_TABLE_ID"),
+                        result.resume.flatten(),
+                        os.getenv("AIRTABLE_BASE_ID")
+                    )
+                save_state("targeted_resumes", targeted)
+
+            targeted = load_state("targeted_resumes", TargetedResumes) if job_targets is not None else None
+            if targeted is not None:
+                selected = targeted.resumes[min(ss.get("target_index", 0), len(targeted.resumes) - 1)]
+                resume_data = selected.resume
+            # Check if cache exists
+            elif not has_state("resume_data"):
+                # Stream the LLM chain, rendering sections in the preview column as they complete
+                with col1:
+                    stream_placeholder = st.empty()
+                resume_data = stream_resume_preview(load_state("resume_input", ResumeInput), stream_placeholder)
             
-            # Create record in Airtable
-            create_airtable_record(
-                airtable_client, 
-                os.getenv("AIRTABLE_RESUME_TABLE_ID"), 
-                resume_data.flatten(),
-                os.getenv("AIRTABLE_BASE_ID")
-            )
+                # Queue record for Airtable (written in the background)
+                enqueue_airtable_record(
+                    airtable_client, 
+                    os.getenv("AIRTABLE_RESUME_TABLE_ID"), 
+                    resume_data.flatten(),
+                    os.getenv("AIRTABLE_BASE_ID")
+                )
             
-            # Cache resume data in ss for future use
-            ss["resume_data"] = resume_data
-        else:
-            print(f"Found resume data in session state as cache.")
-            resume_data = ss["resume_data"]
+                # Cache resume data in the session store for future use
+                save_state("resume_data", resume_data)
+            else:
+                print(f"Found resume data in session state as cache.")
+                resume_data = load_state("resume_data", ResumeSchema)
         
-        pdf_bytes, file_name = save_resume_to_pdf(resume_data)
-    
-    
+            template_name = ss.get("template_name", DEFAULT_TEMPLATE)
+            pdf_data = pdf_download_data(resume_data, template_name)
+    except JobQueueFull as e:
+        # Finished results are already in the session store, so the retry only submits what is still missing
+        st.warning(f"Too many resumes are being generated right now. {e}")
+        st.button("Try again")
+        return
+
+
     container_height = 500
     with col1:
         with st.container(height=container_height):
             st.header("Resume Preview")
-            c1, c2 = st.columns([1,3])
+            c1, c2, c3 = st.columns([1,1,2])
             with c1:
                 st.download_button(
                     label="Download",
-                    data=pdf_bytes,
-                    file_name=file_name,
+                    data=pdf_data,
+                    file_name=resume_file_name(resume_data),
                     mime="application/pdf"
                 )
             with c2:
                 st.button("Restart Builder", on_click=reset_data)
-            display_pdf(pdf_bytes, container_height)
+            with c3:
+                st.selectbox("Template", list_templates(), key="template_name", label_visibility="collapsed")
+            if targeted is not None:
+                st.selectbox(
+                    "Tailored for",
+                    range(len(targeted.resumes)),
+                    format_func=lambda index: targeted.resumes[index].target.title or f"Target {index + 1}",
+                    key="target_index"
+                )
+            if st.toggle("Show as PDF", key="pdf_view"):
+                display_pdf(BytesIO(pdf_data()), container_height)
+            else:
+                display_html(resume_data, template_name)
+        resume_input = load_state("resume_input", ResumeInput)
+        if targeted is not None:
+            resume_input = resume_input.model_copy(update={
+                "target_job_title": selected.target.title,
+                "target_job_description": selected.target.description
+            })
+            with st.expander("Tailoring details"):
+                st.dataframe(multi_target_report(targeted)["targets"], hide_index=True)
+        keyword_coverage(resume_input, resume_data)
     
     with col2:
         with st.container(height=container_height):
@@ -169,8 +290,9 @@ def preview_screen(app_env: str = None, airtable_client: Api = None):
                     feedback = st.text_area("(Optional) Please provide feedback on how the resume builder can be improved.")
                     submit = st.form_submit_button("Submit")
                     
-                    # Remove 0-index
-                    rating = rating + 1 
+                    # Remove 0-index (None until a star is picked)
+                    if rating is not None:
+                        rating = rating + 1
                 if submit:
                     
                     if rating is not None:
@@ -180,7 +302,7 @@ def preview_screen(app_env: str = None, airtable_client: Api = None):
                                 "Feedback": feedback,
                                 "Date": datetime.today().date().isoformat()
                             }
-                            create_airtable_record(
+                            enqueue_airtable_record(
                                 airtable_client, 
                                 os.getenv("AIRTABLE_FEEDBACK_TABLE_ID"), 
                                 data,